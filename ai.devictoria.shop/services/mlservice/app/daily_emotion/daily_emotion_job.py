@@ -0,0 +1,349 @@
+"""
+일기 감정 분류기 학습/평가 작업(Job) 관리
+sklearn 학습은 별도 워커 프로세스에서 실행하고, 학습이 끝까지 성공한 모델만 한 번에 교체(publish)
+"""
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.daily_emotion.daily_emotion_method import DailyEmotionMethod, MODEL_PATH
+from app.daily_emotion.daily_emotion_streaming import STREAMING_STATE_PATH
+from app.daily_emotion.daily_emotion_watcher import file_signature
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 작업 종류
+JOB_KINDS = ("train", "update", "evaluate")
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+# 학습 중인 모델 저장 디렉토리 (publish 시 MODEL_PATH로 교체)
+STAGING_DIR = os.path.join(os.path.dirname(MODEL_PATH), "staging")
+
+
+def job_stages(kind: str, params: Dict[str, Any]) -> List[str]:
+    """작업 종류별 실행 단계"""
+    if kind == "evaluate":
+        return ["preprocess", "evaluate"]
+    if kind == "update" or params.get("mode") == "streaming":
+        return ["learning", "publish"]
+    return ["preprocess", "modeling", "learning", "publish"]
+
+
+def staging_path(job_id: str) -> str:
+    return os.path.join(STAGING_DIR, f"{job_id}.joblib")
+
+
+def streaming_staging_path(job_id: str) -> str:
+    """스트리밍 학습 상태(모델 + 읽은 위치) staging 경로 (publish 시 STREAMING_STATE_PATH로 교체)"""
+    return os.path.join(STAGING_DIR, f"{job_id}.streaming.joblib")
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스 측
+# ---------------------------------------------------------------------------
+
+# 워커 프로세스 -> 부모 프로세스 진행 단계 전달 큐 (워커 초기화 시 설정)
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _report(job_id: str, stage: str):
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, stage))
+
+
+def _run_job(job_id: str, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    워커 프로세스에서 학습/평가 실행
+
+    학습 결과는 공용 모델 경로가 아니라 staging/<job_id>.joblib에 저장하고 경로만 반환합니다.
+    스트리밍 학습 상태도 staging/<job_id>.streaming.joblib에 저장하고 모델과 함께 publish합니다.
+    """
+    method = DailyEmotionMethod()
+
+    if kind == "evaluate":
+        if not method.load_model():
+            raise ValueError("모델이 학습되지 않았습니다. 먼저 /api/daily-emotion/train 엔드포인트를 호출하세요.")
+        _report(job_id, "preprocess")
+        method.preprocess()
+        _report(job_id, "evaluate")
+        return {"evaluation": method.evaluate(), "trained_at": method.trained_at}
+
+    method.model_path = staging_path(job_id)
+    if kind == "update" or params.get("mode") == "streaming":
+        _report(job_id, "learning")
+        state_path = streaming_staging_path(job_id)
+        accuracy = method.learning_streaming(incremental=(kind == "update"), state_save_path=state_path)
+        return {"accuracy": accuracy, "model_path": method.model_path, "state_path": state_path}
+    else:
+        _report(job_id, "preprocess")
+        method.preprocess()
+        _report(job_id, "modeling")
+        method.modeling(mode=params.get("mode", "tfidf"))
+        _report(job_id, "learning")
+        accuracy = method.learning()
+    return {"accuracy": accuracy, "model_path": method.model_path}
+
+
+# ---------------------------------------------------------------------------
+# 부모(API) 프로세스 측
+# ---------------------------------------------------------------------------
+
+class TrainingConflictError(RuntimeError):
+    """다른 설정의 학습 작업이 이미 대기/실행 중"""
+
+
+class DailyEmotionJob:
+    """학습/평가 작업 1건의 상태"""
+
+    def __init__(self, kind: str, dedup_key: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.dedup_key = dedup_key
+        self.status = STATUS_QUEUED
+        self.stages = job_stages(kind, self.params)
+        self.stage: Optional[str] = None
+        self.completed_stages: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (STATUS_QUEUED, STATUS_RUNNING)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리 변환"""
+        total = len(self.stages)
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "completed_stages": list(self.completed_stages),
+            "progress": round(len(self.completed_stages) / total * 100, 1) if total else 0.0,
+            "result": self.result,
+            "error": self.error,
+            "status_url": f"/api/daily-emotion/jobs/{self.id}",
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class DailyEmotionJobManager:
+    """
+    일기 감정 분류기 작업 관리자
+
+    - 학습/평가는 워커 프로세스 1개에서 순서대로 실행되어 API 프로세스의 이벤트 루프와 GIL을 점유하지 않습니다.
+      (spawn 방식이라 API 프로세스의 스레드 상태를 물려받지 않음)
+    - 같은 종류 + 같은 파라미터 + 같은 입력 데이터의 작업이 대기/실행 중이면 기존 작업을 반환합니다.
+    - 설정이 다른 학습 작업이 대기/실행 중이면 TrainingConflictError로 거절합니다.
+    - 학습이 성공하면 staging 파일을 로드해 완성된 DailyEmotionMethod를 만든 뒤
+      MODEL_PATH로 파일을 교체하고 on_publish로 넘깁니다. 실패한 학습은 아무것도 바꾸지 않습니다.
+      (스트리밍 학습 상태도 모델을 교체한 뒤 STREAMING_STATE_PATH로 교체하므로,
+       publish되지 않은 학습은 저장된 읽은 위치를 옮기지 않습니다)
+    """
+
+    def __init__(
+        self,
+        data_path: str,
+        on_publish: Callable[[DailyEmotionMethod], None],
+        max_history: int = 50
+    ):
+        self.data_path = data_path
+        self._on_publish = on_publish
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._listener: Optional[threading.Thread] = None
+        self._jobs: Dict[str, DailyEmotionJob] = {}
+        self._active: Dict[str, str] = {}  # dedup_key -> job_id
+        self._lock = threading.Lock()
+        self._max_history = max_history
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        """워커 프로세스 풀은 첫 작업 등록 시 생성 (lock 안에서 호출)"""
+        if self._progress is None:
+            self._progress = self._context.Queue()
+            self._listener = threading.Thread(
+                target=self._listen, name="daily-emotion-job-progress", daemon=True
+            )
+            self._listener.start()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._progress,)
+            )
+        return self._executor
+
+    def _dedup_key(self, kind: str, params: Dict[str, Any]) -> str:
+        """작업 종류, 파라미터, 입력 CSV(크기, 수정 시각)로 중복 판별 키 생성 (평가는 현재 모델 파일도 포함)"""
+        parts = [kind, json.dumps(params, sort_keys=True), f"data:{file_signature(self.data_path)}"]
+        if kind == "evaluate":
+            parts.append(f"model:{file_signature(MODEL_PATH)}")
+        return "|".join(parts)
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Tuple[DailyEmotionJob, bool]:
+        """
+        작업 등록
+
+        Args:
+            kind: 작업 종류 ("train", "update", "evaluate")
+            params: 작업 파라미터 (train: mode)
+
+        Returns:
+            (작업, 새로 생성되었는지 여부) 튜플
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {kind}")
+
+        params = params or {}
+        dedup_key = self._dedup_key(kind, params)
+        with self._lock:
+            active_id = self._active.get(dedup_key)
+            if active_id is not None:
+                logger.info(f"[DailyEmotionJobManager] 동일한 {kind} 작업이 진행 중입니다. 기존 작업 재사용: {active_id}")
+                return self._jobs[active_id], False
+
+            if kind != "evaluate":
+                running = [job for job in self._jobs.values() if job.is_active and job.kind != "evaluate"]
+                if running:
+                    raise TrainingConflictError(
+                        f"다른 학습 작업이 진행 중입니다: {running[0].id} ({running[0].kind}, {running[0].params})"
+                    )
+
+            job = DailyEmotionJob(kind, dedup_key, params)
+            self._jobs[job.id] = job
+            self._active[dedup_key] = job.id
+            self._prune()
+            future = self._ensure_executor().submit(_run_job, job.id, kind, params)
+
+        future.add_done_callback(lambda f: self._finish(job, f))
+        logger.info(f"[DailyEmotionJobManager] {kind} 작업 등록: {job.id}")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[DailyEmotionJob]:
+        """작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[DailyEmotionJob]:
+        """전체 작업 목록 (최신순)"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def active_jobs(self) -> List[DailyEmotionJob]:
+        """대기/실행 중인 작업 목록 (등록순)"""
+        with self._lock:
+            return sorted((j for j in self._jobs.values() if j.is_active), key=lambda j: j.created_at)
+
+    def shutdown(self):
+        """워커 프로세스 종료 (대기 중인 작업은 취소)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._progress is not None:
+                self._progress.put(None)
+
+    def _prune(self):
+        """오래된 종료 작업 정리 (lock 안에서 호출)"""
+        finished = [j for j in self._jobs.values() if not j.is_active]
+        overflow = len(self._jobs) - self._max_history
+        if overflow <= 0:
+            return
+        for job in sorted(finished, key=lambda j: j.created_at)[:overflow]:
+            del self._jobs[job.id]
+
+    def _advance(self, job: DailyEmotionJob, stage: str):
+        """작업 단계 진행 (lock 안에서 호출, 이미 지난 단계 보고는 무시)"""
+        if not job.is_active:
+            return
+        if job.status == STATUS_QUEUED:
+            job.status = STATUS_RUNNING
+            job.started_at = datetime.now()
+        if job.stage is not None:
+            if job.stages.index(stage) <= job.stages.index(job.stage):
+                return
+            job.completed_stages.append(job.stage)
+        job.stage = stage
+
+    def _listen(self):
+        """워커 프로세스가 보낸 진행 단계 반영"""
+        while True:
+            item = self._progress.get()
+            if item is None:
+                break
+            job_id, stage = item
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    self._advance(job, stage)
+
+    def _finish(self, job: DailyEmotionJob, future: Future):
+        """작업 종료 처리 (학습 성공 시 모델 publish)"""
+        model_path: Optional[str] = None
+        try:
+            result = future.result()
+            model_path = result.get("model_path")
+            if model_path is not None:
+                with self._lock:
+                    self._advance(job, "publish")
+                method = DailyEmotionMethod()
+                method.load_model(model_path)
+                os.replace(model_path, MODEL_PATH)
+                if result.get("state_path") is not None:
+                    os.replace(result["state_path"], STREAMING_STATE_PATH)
+                method.model_path = MODEL_PATH
+                self._on_publish(method)
+                result = {"accuracy": result["accuracy"], "trained_at": method.trained_at}
+
+            with self._lock:
+                if job.stage is not None:
+                    job.completed_stages.append(job.stage)
+                job.stage = None
+                job.result = result
+                job.status = STATUS_SUCCEEDED
+            logger.info(f"[DailyEmotionJobManager] [{job.id}] {job.kind} 작업 완료")
+        except Exception as e:
+            import traceback
+            logger.error(f"[DailyEmotionJobManager] [{job.id}] {job.kind} 작업 실패: {type(e).__name__}: {str(e)}")
+            logger.error(traceback.format_exc())
+            with self._lock:
+                job.error = f"{type(e).__name__}: {str(e)}"
+                job.status = STATUS_FAILED
+                if isinstance(e, BrokenProcessPool):
+                    # 워커 프로세스가 비정상 종료됨 (메모리 부족 등) - 다음 작업 등록 시 새로 생성
+                    self._executor = None
+            for path in (model_path, streaming_staging_path(job.id)):
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
+        finally:
+            with self._lock:
+                job.finished_at = datetime.now()
+                if self._active.get(job.dedup_key) == job.id:
+                    del self._active[job.dedup_key]
@@ -0,0 +1,260 @@
+import hashlib
+import io
+import logging
+import os
+import uuid
+from typing import Iterator, List, Optional, Tuple
+import pandas as pd
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 파싱/정제 로직이 바뀌면 올려서 기존 Parquet 캐시를 무효화
+LOADER_VERSION = "2"
+
+# 캐시 디렉토리 (효진이.csv 해시 -> 정제된 테이블 Parquet)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache")
+
+# C 엔진으로 한 번에 파싱할 세그먼트 크기 (형식이 깨진 행이 있는 세그먼트만 python 엔진으로 재파싱)
+SEGMENT_BYTES = 8 * 1024 * 1024
+
+# 파일이 append 외의 방식으로 바뀌었는지 확인할 때 해시하는 앞부분 크기
+PREFIX_CHECK_BYTES = 64 * 1024
+
+COLUMNS = ['id', 'localdate', 'title', 'content', 'userId', 'emotion']
+TEXT_COLUMNS = ['localdate', 'title', 'content']
+VALID_LABELS = (0, 1, 2)
+
+# 형식이 깨진 행 처리는 엔진별로 지정 (C: 오류 발생 -> python 엔진 재파싱, python: 건너뛰기)
+_READ_OPTIONS = dict(
+    quotechar='"',
+    skipinitialspace=True,
+    dtype=str,
+    keep_default_na=False,
+)
+
+
+def file_hash(path: str) -> str:
+    """파일 내용과 로더 버전으로 캐시 키 생성"""
+    h = hashlib.sha256(f"loader:{LOADER_VERSION}".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def prefix_hash(path: str, length: int) -> str:
+    """파일 앞부분 length 바이트의 해시 (append 외의 방식으로 파일이 바뀌었는지 판별용)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        h.update(f.read(length))
+    return h.hexdigest()
+
+
+def _split_segments(body: bytes, segment_bytes: int) -> List[bytes]:
+    """
+    헤더를 뺀 CSV 본문을 레코드 경계에서 세그먼트로 분할
+
+    따옴표 개수가 짝수인 줄바꿈만 레코드 경계로 보므로 여러 줄 content 필드가 잘리지 않습니다.
+    (이스케이프된 "" 는 짝수라 경계 판단에 영향 없음)
+    """
+    segments = []
+    start = 0
+    while start < len(body):
+        cut = body.find(b'\n', start + segment_bytes)
+        if cut == -1:
+            segments.append(body[start:])
+            break
+        quotes = body.count(b'"', start, cut)
+        while quotes % 2 == 1:
+            next_cut = body.find(b'\n', cut + 1)
+            if next_cut == -1:
+                cut = len(body) - 1
+                break
+            quotes += body.count(b'"', cut, next_cut)
+            cut = next_cut
+        segments.append(body[start:cut + 1])
+        start = cut + 1
+    return segments
+
+
+def _parse_segment(header: bytes, segment: bytes, index: int) -> pd.DataFrame:
+    """
+    세그먼트 1개 파싱 (C 엔진 우선, 실패하면 python 엔진)
+
+    C 엔진은 형식이 깨진 행에서 오류를 내도록 해 그런 행이 조용히 빠지지 않게 하고,
+    해당 세그먼트만 python 엔진(깨진 행 건너뛰기, 기존 로드 방식과 동일)으로 다시 파싱합니다.
+    """
+    try:
+        return pd.read_csv(
+            io.BytesIO(header + segment), engine='c', encoding='utf-8', on_bad_lines='error', **_READ_OPTIONS
+        )
+    except (pd.errors.ParserError, UnicodeDecodeError, ValueError) as e:
+        logger.warning(f"[DailyEmotionLoader] 세그먼트 {index} C 엔진 파싱 실패, python 엔진으로 재시도: {str(e)}")
+        return pd.read_csv(
+            io.BytesIO(header + segment), engine='python', encoding='utf-8', encoding_errors='replace',
+            on_bad_lines='skip', **_READ_OPTIONS
+        )
+
+
+def _last_record_end(buffer: bytes) -> int:
+    """버퍼에서 마지막 완결 레코드의 끝 위치 (따옴표 짝수인 마지막 줄바꿈 다음, 없으면 0)"""
+    total_quotes = buffer.count(b'"')
+    cut = buffer.rfind(b'\n')
+    while cut != -1:
+        # cut 이후 따옴표를 빼면 cut까지의 따옴표 개수
+        quotes_before = total_quotes - buffer.count(b'"', cut)
+        if quotes_before % 2 == 0:
+            return cut + 1
+        cut = buffer.rfind(b'\n', 0, cut)
+    return 0
+
+
+def iter_record_blocks(
+    path: str,
+    start_offset: int = 0,
+    block_bytes: int = SEGMENT_BYTES,
+    end_offset: Optional[int] = None,
+    include_tail: bool = True
+) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    CSV를 레코드 경계 단위 블록으로 나눠 정제된 테이블을 순서대로 생성 (메모리 사용량 = 블록 크기)
+
+    Args:
+        path: CSV 경로
+        start_offset: 읽기 시작 바이트 위치 (0이면 헤더 다음부터, 이전 호출이 반환한 위치로 이어 읽기 가능)
+        block_bytes: 한 번에 읽는 바이트 수
+        end_offset: 이 위치까지만 읽음 (None이면 호출 시점 파일 크기)
+        include_tail: 줄바꿈으로 끝나지 않는 마지막 레코드도 처리할지 여부
+            (False이면 작성 중일 수 있는 마지막 줄은 다음 호출로 미룸)
+
+    Yields:
+        (정제된 블록 테이블, 이 블록까지 소비한 바이트 위치) 튜플
+    """
+    if end_offset is None:
+        end_offset = os.path.getsize(path)
+
+    with open(path, 'rb') as f:
+        header = f.readline()
+        if header.startswith(b'\xef\xbb\xbf'):
+            header = header[3:]
+        position = max(start_offset, f.tell())
+        f.seek(position)
+
+        pending = b''
+        index = 0
+        while position + len(pending) < end_offset:
+            chunk = f.read(min(block_bytes, end_offset - position - len(pending)))
+            if not chunk:
+                break
+            buffer = pending + chunk
+            cut = _last_record_end(buffer)
+            if cut == 0:
+                pending = buffer
+                continue
+            segment, pending = buffer[:cut], buffer[cut:]
+            position += len(segment)
+            yield clean_table(_parse_segment(header, segment, index)), position
+            index += 1
+
+        if pending and include_tail and pending.count(b'"') % 2 == 0:
+            position += len(pending)
+            yield clean_table(_parse_segment(header, pending, index)), position
+
+
+def parse_csv(path: str, segment_bytes: int = SEGMENT_BYTES) -> pd.DataFrame:
+    """
+    CSV 파싱
+
+    파일을 레코드 경계 기준 세그먼트로 나눠 C 엔진으로 파싱하고,
+    형식이 깨진 세그먼트만 python 엔진으로 다시 파싱합니다.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if raw.startswith(b'\xef\xbb\xbf'):
+        raw = raw[3:]
+
+    header_end = raw.find(b'\n')
+    if header_end == -1:
+        return pd.read_csv(io.BytesIO(raw), engine='python', on_bad_lines='skip', **_READ_OPTIONS)
+    header, body = raw[:header_end + 1], raw[header_end + 1:]
+
+    frames = [
+        _parse_segment(header, segment, index)
+        for index, segment in enumerate(_split_segments(body, segment_bytes))
+    ]
+    if not frames:
+        return pd.read_csv(io.BytesIO(header), **_READ_OPTIONS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def clean_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    컬럼 단위 정제 (행 단위 변환 없음)
+
+    - 마지막 빈 컬럼(trailing comma) 제거
+    - id/emotion이 숫자가 아니거나 비어 있는 행, 라벨이 0~2가 아닌 행 제거
+    - 텍스트 컬럼은 앞뒤 공백 제거, 비어 있으면 ""
+    - 같은 id가 여러 번 나오면 마지막 행만 유지
+      (이전 로드 방식은 중복 행을 모두 두고 id 조회 시 첫 행을 반환했음.
+       id 인덱스는 id당 한 행만 가리키고 파일 뒤에 추가된 행이 같은 id를 교체하므로 나중 행 기준으로 변경)
+    """
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    df = df.reindex(columns=COLUMNS, fill_value='')
+
+    ids = pd.to_numeric(df['id'], errors='coerce')
+    labels = pd.to_numeric(df['emotion'], errors='coerce')
+    user_ids = pd.to_numeric(df['userId'], errors='coerce')
+
+    valid = ids.notna() & labels.isin(VALID_LABELS)
+    dropped = int((~valid).sum())
+    if dropped:
+        logger.warning(f"[DailyEmotionLoader] id/emotion이 올바르지 않은 행 {dropped}개 제외")
+
+    table = pd.DataFrame({
+        'id': ids[valid].astype('int64'),
+        'userId': user_ids[valid].fillna(0).astype('int64'),
+        'emotion': labels[valid].astype('int8'),
+    })
+    for column in TEXT_COLUMNS:
+        table[column] = df.loc[valid, column].fillna('').astype(str).str.strip()
+
+    table = table.drop_duplicates(subset='id', keep='last')
+    return table[COLUMNS].reset_index(drop=True)
+
+
+def load_table(path: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    정제된 일기 테이블 로드
+
+    파일 해시가 같은 Parquet 캐시가 있으면 CSV 파싱을 건너뜁니다.
+
+    Returns:
+        id, localdate, title, content, userId, emotion 컬럼의 DataFrame
+    """
+    cache_path: Optional[str] = None
+    if use_cache:
+        cache_path = os.path.join(CACHE_DIR, f"{file_hash(path)}.parquet")
+        if os.path.exists(cache_path):
+            try:
+                table = pd.read_parquet(cache_path, engine='pyarrow')
+                logger.info(f"[DailyEmotionLoader] Parquet 캐시 사용: {cache_path} ({len(table)}개 행)")
+                return table
+            except Exception as e:
+                logger.warning(f"[DailyEmotionLoader] Parquet 캐시 로드 실패, CSV를 다시 파싱합니다: {str(e)}")
+
+    table = clean_table(parse_csv(path))
+    logger.info(f"[DailyEmotionLoader] CSV 파싱 완료: {len(table)}개 행")
+
+    if cache_path is not None:
+        tmp_path = f"{cache_path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            table.to_parquet(tmp_path, engine='pyarrow', index=False)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"[DailyEmotionLoader] Parquet 캐시 저장: {cache_path}")
+        except Exception as e:
+            logger.warning(f"[DailyEmotionLoader] Parquet 캐시 저장 실패: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return table
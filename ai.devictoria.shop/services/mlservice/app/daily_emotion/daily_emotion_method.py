@@ -1,11 +1,17 @@
 import os
+from datetime import datetime
+from typing import List, Optional
+import joblib
 import pandas as pd
 import numpy as np
+import sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from app.daily_emotion.daily_emotion_dataset import DataSets
+from app.daily_emotion.daily_emotion_streaming import StreamingEmotionTrainer
+from app.daily_emotion.daily_emotion_morpheme import KiwiMorphemeVectorizer
 
 
 # Emotion 라벨 정의
@@ -18,6 +24,9 @@ EMOTION_LABELS = {
     2: "부정"
 }
 
+# 학습된 벡터화기 + 분류기 저장 경로
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "emotion_classifier.joblib")
+
 
 class DailyEmotionMethod(object): 
 
@@ -38,6 +47,12 @@ class DailyEmotionMethod(object):
         self.model = None
         self.accuracy = None
         self.is_trained = False
+        # 'tfidf' (공백 분리 TF-IDF), 'morpheme' (Kiwi 형태소 TF-IDF), 'streaming' (out-of-core 학습)
+        self.mode = None
+        # 학습 후 저장 경로 (작업 관리자는 staging 경로로 바꿔 학습한 뒤 교체)
+        self.model_path = MODEL_PATH
+        # 저장/로드된 모델 버전 (학습 시각)
+        self.trained_at = None
 
 
     def new_model(self):
@@ -116,16 +131,26 @@ class DailyEmotionMethod(object):
             print(f"전처리 실패: {str(e)}")
             raise
     
-    def modeling(self):
-        """모델 초기화"""
+    def modeling(self, mode: str = 'tfidf'):
+        """
+        모델 초기화
+        
+        Args:
+            mode: 'tfidf' (공백 분리 (1,2)-gram TF-IDF) 또는 'morpheme' (Kiwi 형태소 TF-IDF)
+        """
         try:
-            # TF-IDF 벡터화기 초기화
-            self.vectorizer = TfidfVectorizer(
-                max_features=1000,
-                ngram_range=(1, 2),
-                min_df=2,
-                max_df=0.95
-            )
+            if mode == 'morpheme':
+                # Kiwi 형태소 벡터화기 초기화 (형태소 분석 결과는 디스크 캐시 재사용)
+                self.vectorizer = KiwiMorphemeVectorizer()
+            else:
+                # TF-IDF 벡터화기 초기화
+                self.vectorizer = TfidfVectorizer(
+                    max_features=1000,
+                    ngram_range=(1, 2),
+                    min_df=2,
+                    max_df=0.95
+                )
+            self.mode = mode
             
             # RandomForest 분류기 초기화
             self.model = RandomForestClassifier(
@@ -134,7 +159,7 @@ class DailyEmotionMethod(object):
                 n_jobs=-1
             )
             
-            print("[모델링 완료] TF-IDF + RandomForest 모델 초기화")
+            print(f"[모델링 완료] {'Kiwi 형태소 TF-IDF' if mode == 'morpheme' else 'TF-IDF'} + RandomForest 모델 초기화")
             return self.model
         except Exception as e:
             print(f"모델링 실패: {str(e)}")
@@ -181,13 +206,42 @@ class DailyEmotionMethod(object):
             }
             
             self.is_trained = True
+            self.accuracy['mode'] = self.mode
+            self.accuracy['vocabulary_size'] = len(self.vectorizer.vocabulary_)
             print(f"[학습 완료] 학습 정확도: {self.accuracy['train_accuracy']}%, 테스트 정확도: {self.accuracy['test_accuracy']}%")
+            self.save_model()
             
             return self.accuracy
         except Exception as e:
             print(f"학습 실패: {str(e)}")
             raise
     
+    def learning_streaming(self, incremental: bool = False, state_save_path: Optional[str] = None):
+        """
+        out-of-core 스트리밍 학습 (HashingVectorizer + SGDClassifier.partial_fit)
+
+        CSV를 블록 단위로 읽어 메모리 사용량이 데이터 크기에 비례하지 않습니다.
+
+        Args:
+            incremental: True이면 마지막 스트리밍 학습 이후 CSV에 추가된 행만 이어서 학습
+            state_save_path: 학습 상태(모델 + 읽은 위치) 저장 경로 (None이면 공용 상태 파일에 바로 저장)
+        """
+        try:
+            trainer = StreamingEmotionTrainer(self.dataset.dname, save_path=state_save_path)
+            result = trainer.update() if incremental else trainer.train()
+
+            self.vectorizer = trainer.vectorizer
+            self.model = trainer.model
+            self.accuracy = result
+            self.is_trained = True
+            self.mode = 'streaming'
+            print(f"[스트리밍 학습 완료] 학습 정확도: {result['train_accuracy']}%, 검증 정확도: {result['test_accuracy']}%")
+            self.save_model()
+            return result
+        except Exception as e:
+            print(f"스트리밍 학습 실패: {str(e)}")
+            raise
+    
     def evaluate(self):
         """모델 평가 및 상세 메트릭 계산"""
         try:
@@ -236,6 +290,84 @@ class DailyEmotionMethod(object):
             return None
         return self.accuracy
     
+    def save_model(self, path: Optional[str] = None):
+        """학습된 벡터화기와 분류기를 함께 저장 (임시 파일에 기록 후 교체, 기본 경로는 self.model_path)"""
+        if not self.is_trained:
+            raise ValueError("모델이 학습되지 않았습니다. 먼저 learning()을 실행하세요.")
+        path = path or self.model_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.trained_at = datetime.now().isoformat()
+        bundle = {
+            'vectorizer': self.vectorizer,
+            'model': self.model,
+            'accuracy': self.accuracy,
+            'mode': self.mode,
+            'trained_at': self.trained_at,
+            'sklearn_version': sklearn.__version__,
+        }
+        tmp_path = f"{path}.tmp"
+        joblib.dump(bundle, tmp_path)
+        os.replace(tmp_path, path)
+        print(f"[모델 저장 완료] {path}")
+
+    def load_model(self, path: Optional[str] = None) -> bool:
+        """
+        저장된 벡터화기와 분류기 로드
+
+        Returns:
+            로드 성공 여부 (저장된 모델이 없으면 False)
+        """
+        path = path or self.model_path
+        if not os.path.exists(path):
+            return False
+        bundle = joblib.load(path)
+        self.vectorizer = bundle['vectorizer']
+        self.model = bundle['model']
+        self.accuracy = bundle.get('accuracy')
+        self.mode = bundle.get('mode', 'tfidf')
+        self.trained_at = bundle.get('trained_at')
+        self.is_trained = True
+        print(f"[모델 로드 완료] {path} (학습 시각: {bundle.get('trained_at')})")
+        return True
+
+    def predict_batch(self, texts: List[str]) -> List[dict]:
+        """
+        여러 텍스트의 감정을 한 번에 예측
+
+        전체 목록을 transform 1회, predict_proba 1회로 처리합니다.
+
+        Args:
+            texts: 예측할 일기 텍스트 목록 (title + content 결합 형태 권장)
+
+        Returns:
+            텍스트 순서대로 predict()와 같은 형식의 결과 리스트
+        """
+        if not self.is_trained or self.model is None or self.vectorizer is None:
+            raise ValueError("모델이 학습되지 않았습니다. 먼저 learning()을 실행하세요.")
+
+        empty = [i for i, text in enumerate(texts) if not text or not text.strip()]
+        if empty:
+            raise ValueError(f"예측할 텍스트가 비어있습니다. (인덱스: {empty})")
+        if not texts:
+            return []
+
+        text_vectorized = self.vectorizer.transform(texts)
+        probabilities = self.model.predict_proba(text_vectorized)
+        classes = self.model.classes_
+        predicted = classes[probabilities.argmax(axis=1)]
+        label_names = [EMOTION_LABELS.get(int(label), f"Unknown({label})") for label in classes]
+
+        return [
+            {
+                'predicted_emotion': int(label),
+                'emotion_name': EMOTION_LABELS.get(int(label), f"Unknown({label})"),
+                'probabilities': {
+                    name: round(float(prob) * 100, 2) for name, prob in zip(label_names, row)
+                }
+            }
+            for label, row in zip(predicted, probabilities)
+        ]
+
     def predict(self, text: str):
         """
         텍스트 입력으로 감정 예측
@@ -251,39 +383,4 @@ class DailyEmotionMethod(object):
                 'probabilities': dict      # 각 감정별 확률
             }
         """
-        try:
-            if not self.is_trained or self.model is None or self.vectorizer is None:
-                raise ValueError("모델이 학습되지 않았습니다. 먼저 learning()을 실행하세요.")
-            
-            # 텍스트 전처리
-            if not text or len(text.strip()) == 0:
-                raise ValueError("예측할 텍스트가 비어있습니다.")
-            
-            # 텍스트 벡터화
-            text_vectorized = self.vectorizer.transform([text])
-            
-            # 예측
-            predicted_label = self.model.predict(text_vectorized)[0]
-            
-            # 확률 계산
-            probabilities = self.model.predict_proba(text_vectorized)[0]
-            
-            # 결과 구성
-            result = {
-                'predicted_emotion': int(predicted_label),
-                'emotion_name': EMOTION_LABELS.get(predicted_label, f"Unknown({predicted_label})"),
-                'probabilities': {
-                    EMOTION_LABELS.get(i, f"Unknown({i})"): round(float(prob) * 100, 2)
-                    for i, prob in enumerate(probabilities)
-                }
-            }
-            
-            print(f"[예측 완료] 입력 텍스트: {text[:50]}...")
-            print(f"[예측 결과] 감정: {result['emotion_name']} (라벨: {result['predicted_emotion']})")
-            print(f"[확률] {result['probabilities']}")
-            
-            return result
-        except Exception as e:
-            print(f"예측 실패: {str(e)}")
-            raise
-
+        return self.predict_batch([text])[0]
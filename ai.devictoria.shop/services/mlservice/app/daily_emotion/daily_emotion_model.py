@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 # Emotion 라벨 정의
@@ -40,3 +40,25 @@ class DailyEmotion(BaseModel):
             }
         }
 
+
+
+class EmotionPredictRequest(BaseModel):
+    """감정 일괄 예측 요청 모델"""
+    
+    texts: List[str] = Field(
+        ...,
+        description="예측할 일기 텍스트 목록 (title + content 결합 형태 권장)",
+        min_length=1,
+        max_length=1000
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": [
+                    "맑고 따뜻하다. 충청수사, 순천부사, 사도첨사가 와서 활을 쏘았다.",
+                    "비가 많이 내렸다. 몸이 불편하여 종일 누워 앓았다."
+                ]
+            }
+        }
+
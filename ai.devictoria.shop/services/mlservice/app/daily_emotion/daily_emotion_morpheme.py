@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Optional
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 형태소 분석 결과 캐시 (diary 텍스트 해시 -> 형태소 시퀀스)
+TOKEN_CACHE_PATH = os.path.join(os.path.dirname(__file__), "cache", "morphemes.sqlite3")
+
+# 분석 설정이 바뀌면 올려서 기존 캐시 항목을 무시
+TOKENIZER_VERSION = "1"
+
+# 감정 분류에 쓰는 품사: 명사, 용언(동사/형용사/보조용언), 부사, 어근, 감탄사
+EMOTION_POS_TAGS = ['NNG', 'NNP', 'VV', 'VA', 'VX', 'MAG', 'XR', 'IC']
+
+# sqlite IN 절 변수 개수 제한 아래로 나눠 조회
+_LOOKUP_BATCH = 500
+
+
+class MorphemeTokenCache:
+    """
+    형태소 시퀀스 디스크 캐시 (sqlite)
+
+    키는 (분석 설정 + 텍스트)의 sha256이므로 내용이 같은 일기는 다시 분석하지 않습니다.
+    """
+
+    def __init__(self, path: str = TOKEN_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS morphemes (key TEXT PRIMARY KEY, tokens TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[str]]:
+        found: Dict[str, List[str]] = {}
+        with closing(self._connect()) as conn, conn:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                rows = conn.execute(f"SELECT key, tokens FROM morphemes WHERE key IN ({placeholders})", batch)
+                for key, tokens in rows:
+                    found[key] = tokens.split(' ') if tokens else []
+        return found
+
+    def put_many(self, items: Dict[str, List[str]]):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO morphemes (key, tokens) VALUES (?, ?)",
+                [(key, ' '.join(tokens)) for key, tokens in items.items()]
+            )
+
+
+def _split_tokens(document: str) -> List[str]:
+    """공백으로 이어 붙인 형태소 시퀀스를 다시 토큰으로 분리 (TfidfVectorizer tokenizer)"""
+    return document.split(' ') if document else []
+
+
+class KiwiMorphemeVectorizer:
+    """
+    Kiwi 형태소 기반 TF-IDF 벡터화기
+
+    - 일기 텍스트를 Kiwi로 일괄(멀티스레드) 분석해 "형태소/품사" 토큰으로 바꾼 뒤 TF-IDF 적용
+    - 활용형이 원형 형태소로 묶여 공백 분리 (1,2)-gram보다 어휘 수가 훨씬 작음
+    - 분석 결과는 MorphemeTokenCache에 저장되어 재학습/평가 시 바뀐 텍스트만 분석
+    - TfidfVectorizer와 같은 fit_transform/transform 인터페이스라 DailyEmotionMethod에서 그대로 교체 가능
+    """
+
+    def __init__(self, pos_tags: Optional[List[str]] = None, max_features: int = 5000, min_df: int = 2):
+        self.pos_tags = pos_tags or EMOTION_POS_TAGS
+        self.tfidf = TfidfVectorizer(
+            tokenizer=_split_tokens,
+            token_pattern=None,
+            lowercase=False,
+            ngram_range=(1, 1),
+            max_features=max_features,
+            min_df=min_df,
+            max_df=0.95,
+            sublinear_tf=True
+        )
+        self._cache: Optional[MorphemeTokenCache] = None
+
+    def __getstate__(self):
+        # 캐시 연결 정보는 저장하지 않음 (로드한 환경의 캐시 경로 사용)
+        state = self.__dict__.copy()
+        state['_cache'] = None
+        return state
+
+    def _key(self, text: str) -> str:
+        config = f"{TOKENIZER_VERSION}|{','.join(self.pos_tags)}|"
+        return hashlib.sha256((config + text).encode('utf-8')).hexdigest()
+
+    def analyze(self, texts: List[str]) -> List[str]:
+        """
+        텍스트 목록을 공백으로 이어 붙인 형태소 시퀀스로 변환 (캐시 미적중 텍스트만 Kiwi 분석)
+        """
+        # 지연 import: 형태소 모드를 쓰지 않으면 Kiwi를 초기화하지 않음
+        from app.nlp.korean.korean_nlp_service import get_korean_nlp_service
+
+        if self._cache is None:
+            self._cache = MorphemeTokenCache()
+
+        keys = [self._key(text) for text in texts]
+        cached = self._cache.get_many(list(set(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            tokenized = get_korean_nlp_service().tokenize_batch(
+                list(missing.values()),
+                pos_tags=self.pos_tags,
+                min_length=1,
+                remove_stopwords=False,
+                with_tag=True
+            )
+            analyzed = dict(zip(missing.keys(), tokenized))
+            self._cache.put_many(analyzed)
+            cached.update(analyzed)
+
+        logger.info(f"[KiwiMorphemeVectorizer] 형태소 분석: {len(texts)}개 중 캐시 적중 {len(texts) - len(missing)}개")
+        return [' '.join(cached[key]) for key in keys]
+
+    def fit_transform(self, texts):
+        return self.tfidf.fit_transform(self.analyze(list(texts)))
+
+    def transform(self, texts):
+        return self.tfidf.transform(self.analyze(list(texts)))
+
+    @property
+    def vocabulary_(self):
+        return self.tfidf.vocabulary_
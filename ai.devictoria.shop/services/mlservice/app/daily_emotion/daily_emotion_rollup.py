@@ -0,0 +1,146 @@
+import bisect
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('day', 'week', 'month')
+N_LABELS = 3  # 0: 중립, 1: 긍정, 2: 부정
+
+
+def bucket_of(localdate: str, granularity: str) -> Optional[str]:
+    """
+    날짜 문자열의 집계 구간 키
+
+    - day: YYYY-MM-DD
+    - week: 해당 주 월요일 YYYY-MM-DD (ISO 주)
+    - month: YYYY-MM
+
+    pandas datetime64 범위(1677~2262년)를 벗어나는 날짜(예: 1594-10-30)도 처리하도록 datetime.date를 사용합니다.
+    날짜 형식이 아니면 None.
+    """
+    try:
+        day = date.fromisoformat(localdate[:10])
+    except (TypeError, ValueError):
+        return None
+    if granularity == 'day':
+        return day.isoformat()
+    if granularity == 'week':
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day.isoformat()[:7]
+
+
+class EmotionTimelineRollup:
+    """
+    사용자별 감정 타임라인 집계 테이블
+
+    granularity(day/week/month) × userId × 구간 키 -> [중립, 긍정, 부정] 개수
+    사용자별 구간 키는 정렬 리스트로 보관해 날짜 범위 조회가 O(log n + 구간 수)입니다.
+    적재 시 한 번 group-by로 만들고, 이후 추가/삭제는 증분 갱신합니다.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[int, Dict[str, List[int]]]] = {g: {} for g in GRANULARITIES}
+        self._keys: Dict[str, Dict[int, List[str]]] = {g: {} for g in GRANULARITIES}
+
+    def build(self, user_ids: np.ndarray, localdates: np.ndarray, labels: np.ndarray):
+        """전체 데이터로 집계 테이블 생성 (기존 내용 교체)"""
+        self.__init__()
+        if len(user_ids) == 0:
+            return
+
+        frame = pd.DataFrame({'userId': user_ids, 'localdate': localdates, 'emotion': labels})
+        # 날짜 파싱은 고유 날짜에 대해서만 수행
+        unique_dates = pd.unique(frame['localdate'])
+        for granularity in GRANULARITIES:
+            mapping = {d: bucket_of(d, granularity) for d in unique_dates}
+            frame[granularity] = frame['localdate'].map(mapping)
+
+        for granularity in GRANULARITIES:
+            grouped = (
+                frame.dropna(subset=[granularity])
+                .groupby(['userId', granularity, 'emotion'])
+                .size()
+                .unstack(fill_value=0)
+                .reindex(columns=range(N_LABELS), fill_value=0)
+            )
+            counts = self._counts[granularity]
+            for (user_id, bucket), row in zip(grouped.index.tolist(), grouped.to_numpy().tolist()):
+                counts.setdefault(int(user_id), {})[bucket] = row
+            self._keys[granularity] = {user_id: sorted(buckets) for user_id, buckets in counts.items()}
+
+        logger.info(f"[EmotionTimelineRollup] 집계 테이블 생성 완료: 사용자 {len(self._counts['day'])}명")
+
+    def add(self, user_id: int, localdate: str, label: int, delta: int = 1):
+        """일기 1건 추가(delta=1) 또는 삭제(delta=-1) 반영"""
+        for granularity in GRANULARITIES:
+            bucket = bucket_of(localdate, granularity)
+            if bucket is None:
+                continue
+            buckets = self._counts[granularity].setdefault(user_id, {})
+            row = buckets.get(bucket)
+            if row is None:
+                if delta < 0:
+                    continue
+                row = buckets[bucket] = [0] * N_LABELS
+                bisect.insort(self._keys[granularity].setdefault(user_id, []), bucket)
+            row[label] += delta
+            if sum(row) <= 0:
+                del buckets[bucket]
+                keys = self._keys[granularity][user_id]
+                del keys[bisect.bisect_left(keys, bucket)]
+
+    def remove(self, user_id: int, localdate: str, label: int):
+        self.add(user_id, localdate, label, delta=-1)
+
+    def copy(self) -> 'EmotionTimelineRollup':
+        """독립적으로 갱신할 수 있는 사본 (개수 행과 구간 키 리스트까지 복사)"""
+        clone = EmotionTimelineRollup()
+        for granularity in GRANULARITIES:
+            clone._counts[granularity] = {
+                user_id: {bucket: list(row) for bucket, row in buckets.items()}
+                for user_id, buckets in self._counts[granularity].items()
+            }
+            clone._keys[granularity] = {
+                user_id: list(keys) for user_id, keys in self._keys[granularity].items()
+            }
+        return clone
+
+    def timeline(
+        self,
+        user_id: int,
+        granularity: str = 'day',
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        사용자 타임라인 조회
+
+        start_date/end_date가 속한 구간까지 포함합니다. (예: month 단위에서 2024-03-15 ~ 는 2024-03 부터)
+
+        Returns:
+            [{"bucket": 구간 키, "counts": [중립, 긍정, 부정]}, ...] (구간 오름차순)
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"지원하지 않는 집계 단위입니다: {granularity} (가능: {', '.join(GRANULARITIES)})")
+
+        keys = self._keys[granularity].get(user_id, [])
+        lo = 0
+        hi = len(keys)
+        if start_date:
+            start_bucket = bucket_of(start_date, granularity)
+            if start_bucket is None:
+                raise ValueError(f"잘못된 날짜 형식입니다: {start_date}")
+            lo = bisect.bisect_left(keys, start_bucket)
+        if end_date:
+            end_bucket = bucket_of(end_date, granularity)
+            if end_bucket is None:
+                raise ValueError(f"잘못된 날짜 형식입니다: {end_date}")
+            hi = bisect.bisect_right(keys, end_bucket)
+
+        counts = self._counts[granularity].get(user_id, {})
+        return [{'bucket': bucket, 'counts': list(counts[bucket])} for bucket in keys[lo:hi]]
@@ -1,10 +1,15 @@
 import os
 import logging
-from typing import List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 from icecream import ic
 from app.daily_emotion.daily_emotion_model import DailyEmotion
 from app.daily_emotion.daily_emotion_method import DailyEmotionMethod
+from app.daily_emotion.daily_emotion_job import DailyEmotionJob, DailyEmotionJobManager
+from app.daily_emotion.daily_emotion_store import DailyEmotionStore
+from app.daily_emotion.daily_emotion_loader import PREFIX_CHECK_BYTES, iter_record_blocks, load_table, prefix_hash
+from app.daily_emotion.daily_emotion_watcher import DailyEmotionDataWatcher, file_signature
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +25,9 @@ EMOTION_LABELS = {
     2: "부정"
 }
 
+# 파일 뒤에 추가된 행이 이보다 많으면 하나씩 add()하지 않고 전체 다시 로드
+INCREMENTAL_MAX_ROWS = 10_000
+
 
 class DailyEmotionService:
     """일기 감정 데이터 서비스 클래스"""
@@ -27,84 +35,130 @@ class DailyEmotionService:
     def __init__(self):
         """서비스 초기화"""
         self.data_path = os.path.join(os.path.dirname(__file__), "효진이.csv")
-        self._emotions_cache: Optional[List[DailyEmotion]] = None
+        self._store: Optional[DailyEmotionStore] = None
+        self._file_state: Dict[str, Any] = {}
+        self._reload_lock = threading.Lock()
         self._ml_method = DailyEmotionMethod()
+        self._jobs = DailyEmotionJobManager(self.data_path, self._publish_model)
         self._load_data()
+        self._load_model()
+        self._watcher = DailyEmotionDataWatcher(self.data_path, self.reload_data)
+        self._watcher.mark_seen(self._file_state.get('signature'))
+        self._watcher.start()
     
     def _load_data(self):
-        """CSV 파일에서 데이터 로드"""
+        """
+        CSV 파일에서 데이터 로드
+        
+        정제된 테이블(Parquet 캐시 또는 CSV 파싱 결과)을 인덱스 저장소에 적재합니다.
+        DailyEmotion 객체는 조회 결과로 반환되는 행에 대해서만 만들어집니다.
+        """
         try:
             if os.path.exists(self.data_path):
                 logger.info(f"[DailyEmotionService] 데이터 로드 시작: {self.data_path}")
-                # 여러 줄 필드를 처리하기 위해 quotechar와 escapechar 설정
-                # on_bad_lines='skip'으로 잘못된 형식의 행 건너뛰기
-                df = pd.read_csv(
-                    self.data_path,
-                    quotechar='"',
-                    skipinitialspace=True,
-                    on_bad_lines='skip',
-                    encoding='utf-8',
-                    engine='python'  # python 엔진이 복잡한 CSV를 더 잘 처리
-                )
-                
-                # 마지막 빈 컬럼 제거 (trailing comma 때문에 생기는 빈 컬럼)
-                df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-                
-                # 빈 행 제거 (id나 emotion이 없는 행)
-                df = df.dropna(subset=['id', 'emotion'], how='all')
-                df = df[df['id'].notna() & df['emotion'].notna()]
-                
-                # 숫자로 변환 가능한지 확인
-                df['id'] = pd.to_numeric(df['id'], errors='coerce')
-                df['userId'] = pd.to_numeric(df['userId'], errors='coerce')
-                df['emotion'] = pd.to_numeric(df['emotion'], errors='coerce')
-                
-                # 변환 실패한 행 제거
-                df = df.dropna(subset=['id', 'emotion'])
-                
-                logger.info(f"[DailyEmotionService] CSV 파싱 완료: {len(df)}개 행")
-                
-                self._emotions_cache = []
-                for idx, row in df.iterrows():
-                    try:
-                        emotion = self._dataframe_to_emotion(row)
-                        self._emotions_cache.append(emotion)
-                    except Exception as e:
-                        logger.warning(f"[DailyEmotionService] 행 변환 실패 (ID: {row.get('id', 'unknown')}): {str(e)}")
-                        continue
-                
-                logger.info(f"[DailyEmotionService] 데이터 로드 완료: {len(self._emotions_cache)}개")
+                self.reload_data()
+                logger.info(f"[DailyEmotionService] 데이터 로드 완료: {len(self._store)}개")
             else:
                 logger.warning(f"[DailyEmotionService] 데이터 파일을 찾을 수 없습니다: {self.data_path}")
-                self._emotions_cache = []
+                self._store = DailyEmotionStore()
         except Exception as e:
             logger.error(f"[DailyEmotionService] 데이터 로드 실패: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())
-            self._emotions_cache = []
+            self._store = DailyEmotionStore()
     
-    def _dataframe_to_emotion(self, row: pd.Series) -> DailyEmotion:
+    def reload_data(self) -> Dict[str, Any]:
         """
-        DataFrame 행을 DailyEmotion 모델로 변환
+        데이터 파일 변경 반영 (감시 스레드 또는 초기 로드에서 호출)
+        
+        - 파일 뒤에 행이 추가된 경우: 마지막으로 읽은 위치 이후 완결된 레코드만 파싱해
+          현재 저장소 사본에 add()로 반영 (인덱스/집계 테이블을 다시 만들지 않음)
+          줄바꿈으로 끝나지 않은 마지막 줄은 읽은 위치에 포함하지 않고 다음 반영 때 다시 읽음
+        - 그 외(덮어쓰기, 축소, 앞부분 변경) 또는 추가된 행이 INCREMENTAL_MAX_ROWS보다 많은 경우: 전체 다시 로드
+        
+        새 저장소는 요청 처리와 별도로 완성한 뒤 참조 하나만 교체하므로,
+        조회 중인 요청은 이전 저장소를 끝까지 사용하고 반쯤 만들어진 인덱스를 보지 않습니다.
         
-        Args:
-            row: pandas Series 객체
-            
         Returns:
-            DailyEmotion 모델 객체
+            반영 방식과 행 수 딕셔너리
         """
-        try:
-            return DailyEmotion(
-                id=int(row['id']),
-                localdate=str(row['localdate']).strip() if pd.notna(row['localdate']) else "",
-                title=str(row['title']).strip() if pd.notna(row['title']) else "",
-                content=str(row['content']).strip() if pd.notna(row['content']) else "",
-                userId=int(row['userId']) if pd.notna(row['userId']) else 0,
-                emotion=int(row['emotion']) if pd.notna(row['emotion']) else 0
+        with self._reload_lock:
+            signature = file_signature(self.data_path)
+            if signature is None:
+                logger.warning(f"[DailyEmotionService] 데이터 파일을 찾을 수 없습니다: {self.data_path}")
+                return {"mode": "missing", "rows": len(self._store or ())}
+            if signature == self._file_state.get('signature'):
+                return {"mode": "unchanged", "rows": len(self._store or ())}
+            
+            size = signature[0]
+            state = self._file_state
+            store = None
+            appended = (
+                self._store is not None
+                and 'size' in state
+                and state['size'] < size
+                and prefix_hash(self.data_path, state['check_bytes']) == state['prefix_hash']
             )
+            if appended:
+                # 작성 중일 수 있는 마지막 줄은 읽지 않고, 다음 반영 때 완결 레코드 위치부터 이어 읽음
+                offset = state['size']
+                blocks = []
+                for block, position in iter_record_blocks(
+                    self.data_path, start_offset=offset, end_offset=size, include_tail=False
+                ):
+                    blocks.append(block)
+                    offset = position
+                new_rows = sum(len(block) for block in blocks)
+                if new_rows <= INCREMENTAL_MAX_ROWS:
+                    # 조회 중인 저장소는 건드리지 않고 사본에 추가 (같은 id는 나중 행으로 교체)
+                    store = self._store.copy() if new_rows else self._store
+                    for block in blocks:
+                        store.add_table(block)
+                    mode = "incremental"
+                else:
+                    logger.info(f"[DailyEmotionService] 추가된 행이 많아 전체 다시 로드: {new_rows}개")
+            if store is None:
+                table = load_table(self.data_path)
+                new_rows = len(table)
+                offset = size
+                store = DailyEmotionStore()
+                store.load(table)
+                mode = "full"
+            
+            # 참조 교체 (조회 메서드는 교체 전/후 저장소 중 하나를 통째로 사용)
+            self._store = store
+            check_bytes = min(offset, PREFIX_CHECK_BYTES)
+            self._file_state = {
+                'signature': signature,
+                'size': offset,
+                'check_bytes': check_bytes,
+                'prefix_hash': prefix_hash(self.data_path, check_bytes),
+            }
+            logger.info(f"[DailyEmotionService] 데이터 반영 완료 (mode={mode}): 파싱 {new_rows}개, 전체 {len(store)}개")
+            return {"mode": mode, "parsed_rows": new_rows, "rows": len(store)}
+    
+    def _get_store(self) -> DailyEmotionStore:
+        """현재 저장소 (요청마다 한 번 가져와 그 요청 안에서는 같은 저장소 사용)"""
+        store = self._store
+        if store is None:
+            self._load_data()
+            store = self._store
+        return store
+    
+    def shutdown(self):
+        """데이터 파일 감시와 학습 워커 프로세스 중지"""
+        self._watcher.stop()
+        self._jobs.shutdown()
+    
+    def _load_model(self):
+        """저장된 감정 분류 모델 로드 (없으면 /train 호출 전까지 미학습 상태)"""
+        try:
+            if self._ml_method.load_model():
+                logger.info("[DailyEmotionService] 저장된 ML 모델 로드 완료")
+            else:
+                logger.info("[DailyEmotionService] 저장된 ML 모델이 없습니다. /api/daily-emotion/train 호출 후 사용 가능합니다.")
         except Exception as e:
-            logger.error(f"[DailyEmotionService] DailyEmotion 변환 실패: {str(e)}")
-            raise ValueError(f"DailyEmotion 변환 실패: {str(e)}")
+            logger.error(f"[DailyEmotionService] 저장된 ML 모델 로드 실패: {str(e)}")
     
     def get_emotion_by_id(self, emotion_id: int) -> Optional[DailyEmotion]:
         """
@@ -117,14 +171,9 @@ class DailyEmotionService:
             DailyEmotion 객체 (없으면 None)
         """
         try:
-            if self._emotions_cache is None:
-                self._load_data()
-            
-            for emotion in self._emotions_cache:
-                if emotion.id == emotion_id:
-                    return emotion
+            store = self._get_store()
             
-            return None
+            return store.get(emotion_id)
         except Exception as e:
             logger.error(f"[DailyEmotionService] 일기 조회 실패 (ID: {emotion_id}): {str(e)}")
             raise
@@ -140,48 +189,77 @@ class DailyEmotionService:
             DailyEmotion 객체 리스트
         """
         try:
-            if self._emotions_cache is None:
-                self._load_data()
+            store = self._get_store()
             
-            return self._emotions_cache[:limit] if self._emotions_cache else []
+            return store.first(limit)
         except Exception as e:
             logger.error(f"[DailyEmotionService] 상위 일기 조회 실패: {str(e)}")
             raise
     
-    def get_emotions_by_user_id(self, user_id: int) -> List[DailyEmotion]:
+    def get_emotions_by_user_id(
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        descending: bool = False
+    ) -> Tuple[int, List[DailyEmotion]]:
         """
-        사용자 ID로 일기 목록 조회
+        사용자 ID로 일기 목록 조회 (localdate 순)
         
         Args:
             user_id: 조회할 사용자 ID
+            offset: 건너뛸 개수
+            limit: 최대 반환 개수 (None이면 전체)
+            start_date: 시작 날짜 (포함, YYYY-MM-DD)
+            end_date: 종료 날짜 (포함, YYYY-MM-DD)
+            descending: True이면 최신 날짜부터
             
         Returns:
-            DailyEmotion 객체 리스트
+            (조건에 맞는 전체 개수, DailyEmotion 객체 리스트) 튜플
         """
         try:
-            if self._emotions_cache is None:
-                self._load_data()
+            store = self._get_store()
             
-            return [emotion for emotion in self._emotions_cache if emotion.userId == user_id]
+            return store.by_user(
+                user_id, offset=offset, limit=limit,
+                start_date=start_date, end_date=end_date, descending=descending
+            )
         except Exception as e:
             logger.error(f"[DailyEmotionService] 사용자별 일기 조회 실패 (UserID: {user_id}): {str(e)}")
             raise
     
-    def get_emotions_by_emotion_label(self, emotion_label: int) -> List[DailyEmotion]:
+    def get_emotions_by_emotion_label(
+        self,
+        emotion_label: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        descending: bool = False
+    ) -> Tuple[int, List[DailyEmotion]]:
         """
-        감정 라벨로 일기 목록 조회
+        감정 라벨로 일기 목록 조회 (localdate 순)
         
         Args:
             emotion_label: 조회할 감정 라벨
+            offset: 건너뛸 개수
+            limit: 최대 반환 개수 (None이면 전체)
+            start_date: 시작 날짜 (포함, YYYY-MM-DD)
+            end_date: 종료 날짜 (포함, YYYY-MM-DD)
+            descending: True이면 최신 날짜부터
             
         Returns:
-            DailyEmotion 객체 리스트
+            (조건에 맞는 전체 개수, DailyEmotion 객체 리스트) 튜플
         """
         try:
-            if self._emotions_cache is None:
-                self._load_data()
+            store = self._get_store()
             
-            return [emotion for emotion in self._emotions_cache if emotion.emotion == emotion_label]
+            return store.by_label(
+                emotion_label, offset=offset, limit=limit,
+                start_date=start_date, end_date=end_date, descending=descending
+            )
         except Exception as e:
             logger.error(f"[DailyEmotionService] 감정별 일기 조회 실패 (Emotion: {emotion_label}): {str(e)}")
             raise
@@ -194,22 +272,18 @@ class DailyEmotionService:
             라벨 분포 통계 딕셔너리
         """
         try:
-            if self._emotions_cache is None:
-                self._load_data()
+            store = self._get_store()
             
-            total_count = len(self._emotions_cache)
+            total_count = len(store)
             if total_count == 0:
                 return {
                     "total": 0,
                     "labels": {}
                 }
             
-            # 각 라벨별 개수 계산
-            label_counts = {0: 0, 1: 0, 2: 0}
-            for emotion in self._emotions_cache:
-                label = emotion.emotion
-                if label in label_counts:
-                    label_counts[label] += 1
+            # 각 라벨별 개수 (저장소에서 증분 관리)
+            stored_counts = store.label_counts()
+            label_counts = {label: stored_counts.get(label, 0) for label in (0, 1, 2)}
             
             # 비율 계산 및 결과 구성
             label_stats = {}
@@ -230,34 +304,134 @@ class DailyEmotionService:
             logger.error(f"[DailyEmotionService] 라벨 분포 조회 실패: {str(e)}")
             raise
 
-    def train_model(self):
-        """ML 모델 학습 실행"""
+    def get_emotion_timeline(
+        self,
+        user_id: int,
+        granularity: str = "day",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> dict:
+        """
+        사용자 감정 타임라인 조회 (일/주/월 단위 감정 개수와 비율)
+        
+        적재 시 만들어 둔 집계 테이블에서 조회하므로 일기 본문을 읽지 않습니다.
+        
+        Args:
+            user_id: 사용자 ID
+            granularity: 집계 단위 ("day", "week", "month")
+            start_date: 시작 날짜 (YYYY-MM-DD, 해당 구간 포함)
+            end_date: 종료 날짜 (YYYY-MM-DD, 해당 구간 포함)
+            
+        Returns:
+            구간별 감정 통계와 전체 합계 딕셔너리
+        """
         try:
-            logger.info("[DailyEmotionService] ML 모델 학습 시작")
-            self._ml_method.preprocess()
-            self._ml_method.modeling()
-            accuracy = self._ml_method.learning()
-            logger.info(f"[DailyEmotionService] ML 모델 학습 완료: {accuracy}")
-            return accuracy
+            store = self._get_store()
+            
+            def summarize(counts: List[int]) -> dict:
+                total = sum(counts)
+                return {
+                    "total": total,
+                    "counts": {EMOTION_LABELS[label]: count for label, count in enumerate(counts)},
+                    "ratios": {
+                        EMOTION_LABELS[label]: round(count / total * 100, 2) if total else 0.0
+                        for label, count in enumerate(counts)
+                    }
+                }
+            
+            rows = store.rollup.timeline(user_id, granularity, start_date, end_date)
+            overall = [0, 0, 0]
+            buckets = []
+            for row in rows:
+                for label, count in enumerate(row["counts"]):
+                    overall[label] += count
+                buckets.append({"bucket": row["bucket"], **summarize(row["counts"])})
+            
+            return {
+                "userId": user_id,
+                "granularity": granularity,
+                "startDate": start_date,
+                "endDate": end_date,
+                "summary": summarize(overall),
+                "count": len(buckets),
+                "buckets": buckets
+            }
         except Exception as e:
-            logger.error(f"[DailyEmotionService] ML 모델 학습 실패: {str(e)}")
+            logger.error(f"[DailyEmotionService] 감정 타임라인 조회 실패 (UserID: {user_id}): {str(e)}")
             raise
     
-    def evaluate_model(self):
-        """ML 모델 평가 실행"""
-        try:
-            logger.info("[DailyEmotionService] ML 모델 평가 시작")
-            evaluation = self._ml_method.evaluate()
-            logger.info(f"[DailyEmotionService] ML 모델 평가 완료")
-            return evaluation
-        except Exception as e:
-            logger.error(f"[DailyEmotionService] ML 모델 평가 실패: {str(e)}")
-            raise
+    def _publish_model(self, method: DailyEmotionMethod):
+        """학습이 끝난 모델로 교체 (작업 관리자가 호출, 참조 하나만 바꾸므로 예측 요청은 이전/새 모델 중 하나를 통째로 사용)"""
+        self._ml_method = method
+        logger.info(f"[DailyEmotionService] ML 모델 교체 완료 (mode={method.mode}, 학습 시각={method.trained_at})")
+    
+    def submit_training(self, mode: str = "tfidf") -> Tuple[DailyEmotionJob, bool]:
+        """
+        ML 모델 학습 작업 등록 (워커 프로세스에서 실행)
+        
+        Args:
+            mode: "tfidf" (공백 분리 TF-IDF + RandomForest, 전체 메모리 학습),
+                  "morpheme" (Kiwi 형태소 TF-IDF + RandomForest, 형태소 분석 결과 디스크 캐시) 또는
+                  "streaming" (HashingVectorizer + SGDClassifier, CSV 블록 단위 out-of-core 학습)
+        
+        Returns:
+            (작업, 새로 생성되었는지 여부) 튜플
+        """
+        logger.info(f"[DailyEmotionService] ML 모델 학습 작업 등록 (mode={mode})")
+        return self._jobs.submit("train", {"mode": mode})
+    
+    def submit_update(self) -> Tuple[DailyEmotionJob, bool]:
+        """스트리밍 모델 추가 학습 작업 등록 (마지막 학습 이후 CSV에 추가된 행만 partial_fit)"""
+        logger.info("[DailyEmotionService] ML 모델 추가 학습 작업 등록")
+        return self._jobs.submit("update")
+    
+    def submit_evaluation(self) -> Tuple[DailyEmotionJob, bool]:
+        """현재 모델 평가 작업 등록"""
+        if not self.is_model_ready():
+            raise ValueError("모델이 학습되지 않았습니다. /api/daily-emotion/train 엔드포인트를 호출하여 학습하세요.")
+        logger.info("[DailyEmotionService] ML 모델 평가 작업 등록")
+        return self._jobs.submit("evaluate")
+    
+    def get_job(self, job_id: str) -> Optional[DailyEmotionJob]:
+        """학습/평가 작업 조회"""
+        return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[DailyEmotionJob]:
+        """학습/평가 작업 목록 (최신순)"""
+        return self._jobs.list_jobs()
+    
+    def get_training_status(self) -> dict:
+        """현재 모델 버전, 마지막 학습 지표, 대기/실행 중인 작업"""
+        method = self._ml_method
+        return {
+            "model_ready": method.is_trained,
+            "mode": method.mode,
+            "trained_at": method.trained_at,
+            "metrics": method.get_accuracy(),
+            "active_jobs": [job.to_dict() for job in self._jobs.active_jobs()]
+        }
+    
+    def is_model_ready(self) -> bool:
+        """예측 가능한(학습 또는 로드된) 모델이 있는지 여부"""
+        return self._ml_method.is_trained
+
+    def predict_emotions(self, texts: List[str]) -> List[dict]:
+        """
+        일기 텍스트 목록의 감정 일괄 예측
+        
+        Args:
+            texts: 예측할 일기 텍스트 목록
+            
+        Returns:
+            텍스트 순서대로 예측 결과 리스트
+        """
+        return self._ml_method.predict_batch(texts)
     
     def get_model_accuracy(self):
         """학습된 모델의 정확도 조회"""
         try:
-            accuracy = self._ml_method.get_accuracy()
+            method = self._ml_method
+            accuracy = method.get_accuracy()
             if accuracy is None:
                 return {
                     "status": "not_trained",
@@ -265,6 +439,7 @@ class DailyEmotionService:
                 }
             return {
                 "status": "trained",
+                "trained_at": method.trained_at,
                 "accuracy": accuracy
             }
         except Exception as e:
@@ -0,0 +1,249 @@
+import bisect
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.daily_emotion.daily_emotion_model import DailyEmotion
+from app.daily_emotion.daily_emotion_rollup import EmotionTimelineRollup
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 정렬 키: (localdate, id) - localdate는 YYYY-MM-DD 문자열이라 사전순 = 날짜순
+SortKey = Tuple[str, int]
+
+
+class DailyEmotionStore:
+    """
+    일기 감정 데이터 인메모리 인덱스 저장소
+
+    - 행 데이터: load()로 적재한 행은 컬럼 배열로 보관하고 반환할 때만 DailyEmotion 객체 생성,
+      add()로 추가한 행은 객체로 보관
+    - id 해시 인덱스: id -> 행 위치 (O(1) 조회)
+    - userId / emotion 별 posting list: (localdate, id) 정렬 리스트 (O(log n + k) 범위/페이지 조회)
+    - 전체 날짜 인덱스: 전체 일기를 (localdate, id) 순으로 보관
+    - 라벨별 개수: 추가/삭제 시 증분 갱신 (분포 조회 O(1))
+    - 사용자 타임라인 집계: userId × 일/주/월 구간 × 감정 개수 (추가/삭제 시 증분 갱신)
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, np.ndarray] = {}
+        self._n_loaded = 0
+        self._rows: List[Optional[DailyEmotion]] = []  # add()로 추가된 행 (위치 = _n_loaded + 인덱스)
+        self._by_id: Dict[int, int] = {}
+        self._by_user: Dict[int, List[SortKey]] = {}
+        self._by_label: Dict[int, List[SortKey]] = {}
+        self._by_date: List[SortKey] = []
+        self._label_counts: Counter = Counter()
+        self.rollup = EmotionTimelineRollup()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @staticmethod
+    def _key(emotion: DailyEmotion) -> SortKey:
+        return (emotion.localdate, emotion.id)
+
+    # ***********
+    # 적재 / 변경
+    # ***********
+
+    def load(self, table: pd.DataFrame):
+        """
+        정제된 테이블 일괄 적재 (기존 내용 교체)
+
+        DailyEmotion 객체는 만들지 않고 컬럼 배열과 인덱스만 구성합니다.
+        posting list는 (localdate, id) 순으로 한 번 정렬한 뒤 userId/emotion 별로 나눕니다.
+
+        Args:
+            table: id, localdate, title, content, userId, emotion 컬럼 (id 중복 없음)
+        """
+        self.__init__()
+        self._columns = {column: table[column].to_numpy() for column in table.columns}
+        self._n_loaded = len(table)
+        if self._n_loaded == 0:
+            return
+
+        ids = self._columns['id']
+        dates = self._columns['localdate']
+        self._by_id = dict(zip(ids.tolist(), range(self._n_loaded)))
+
+        order = pd.DataFrame({'localdate': dates, 'id': ids}).sort_values(['localdate', 'id']).index.to_numpy()
+        self._by_date = list(zip(dates[order].tolist(), ids[order].tolist()))
+        self._by_user = self._group_postings(self._columns['userId'][order])
+        self._by_label = self._group_postings(self._columns['emotion'][order])
+
+        labels, counts = np.unique(self._columns['emotion'], return_counts=True)
+        self._label_counts = Counter(dict(zip(labels.tolist(), counts.tolist())))
+        self.rollup.build(self._columns['userId'], dates, self._columns['emotion'])
+        logger.info(f"[DailyEmotionStore] 인덱스 구성 완료: {len(self)}개, 사용자 {len(self._by_user)}명")
+
+    def _group_postings(self, keys_in_date_order: np.ndarray) -> Dict[int, List[SortKey]]:
+        """날짜순 정렬된 그룹 키 배열로 그룹별 posting list 생성 (stable 정렬로 날짜순 유지)"""
+        grouped = np.argsort(keys_in_date_order, kind='stable')
+        sorted_keys = keys_in_date_order[grouped]
+        bounds = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        postings = {}
+        for positions in np.split(grouped, bounds):
+            group_key = int(keys_in_date_order[positions[0]])
+            postings[group_key] = [self._by_date[i] for i in positions.tolist()]
+        return postings
+
+    def add(self, emotion: DailyEmotion):
+        """일기 1건 추가 (같은 id가 있으면 교체)"""
+        if emotion.id in self._by_id:
+            self.remove(emotion.id)
+
+        key = self._key(emotion)
+        self._by_id[emotion.id] = self._n_loaded + len(self._rows)
+        self._rows.append(emotion)
+        bisect.insort(self._by_user.setdefault(emotion.userId, []), key)
+        bisect.insort(self._by_label.setdefault(emotion.emotion, []), key)
+        bisect.insort(self._by_date, key)
+        self._label_counts[emotion.emotion] += 1
+        self.rollup.add(emotion.userId, emotion.localdate, emotion.emotion)
+
+    def add_table(self, table: pd.DataFrame) -> int:
+        """
+        정제된 테이블의 행을 순서대로 add() (같은 id는 나중 행으로 교체)
+
+        Returns:
+            추가한 행 수
+        """
+        for row in table[['id', 'localdate', 'title', 'content', 'userId', 'emotion']].itertuples(index=False):
+            self.add(DailyEmotion(
+                id=int(row.id),
+                localdate=row.localdate,
+                title=row.title,
+                content=row.content,
+                userId=int(row.userId),
+                emotion=int(row.emotion)
+            ))
+        return len(table)
+
+    def copy(self) -> 'DailyEmotionStore':
+        """
+        독립적으로 갱신할 수 있는 사본
+
+        적재된 컬럼 배열과 DailyEmotion 객체는 변경되지 않으므로 공유하고,
+        인덱스(dict/list)와 집계 테이블만 복사합니다.
+        """
+        clone = DailyEmotionStore()
+        clone._columns = self._columns
+        clone._n_loaded = self._n_loaded
+        clone._rows = list(self._rows)
+        clone._by_id = dict(self._by_id)
+        clone._by_user = {user_id: list(keys) for user_id, keys in self._by_user.items()}
+        clone._by_label = {label: list(keys) for label, keys in self._by_label.items()}
+        clone._by_date = list(self._by_date)
+        clone._label_counts = Counter(self._label_counts)
+        clone.rollup = self.rollup.copy()
+        return clone
+
+    def remove(self, emotion_id: int) -> Optional[DailyEmotion]:
+        """일기 1건 삭제 (삭제된 일기 반환, 없으면 None)"""
+        position = self._by_id.pop(emotion_id, None)
+        if position is None:
+            return None
+
+        emotion = self._materialize(position)
+        if position >= self._n_loaded:
+            self._rows[position - self._n_loaded] = None
+        key = self._key(emotion)
+        for postings in (self._by_user.get(emotion.userId), self._by_label.get(emotion.emotion), self._by_date):
+            if postings:
+                index = bisect.bisect_left(postings, key)
+                if index < len(postings) and postings[index] == key:
+                    del postings[index]
+        self._label_counts[emotion.emotion] -= 1
+        self.rollup.remove(emotion.userId, emotion.localdate, emotion.emotion)
+        return emotion
+
+    # ***********
+    # 조회
+    # ***********
+
+    def _materialize(self, position: int) -> DailyEmotion:
+        """행 위치의 DailyEmotion 객체 생성 (컬럼 적재 행은 요청 시점에만 생성)"""
+        if position >= self._n_loaded:
+            return self._rows[position - self._n_loaded]
+        columns = self._columns
+        return DailyEmotion(
+            id=int(columns['id'][position]),
+            localdate=columns['localdate'][position],
+            title=columns['title'][position],
+            content=columns['content'][position],
+            userId=int(columns['userId'][position]),
+            emotion=int(columns['emotion'][position])
+        )
+
+    def get(self, emotion_id: int) -> Optional[DailyEmotion]:
+        """id로 일기 조회 (O(1))"""
+        position = self._by_id.get(emotion_id)
+        return self._materialize(position) if position is not None else None
+
+    def first(self, limit: int) -> List[DailyEmotion]:
+        """적재 순서 기준 앞에서 limit개"""
+        result = []
+        for position in self._by_id.values():
+            if len(result) >= limit:
+                break
+            result.append(self._materialize(position))
+        return result
+
+    def label_counts(self) -> Dict[int, int]:
+        """라벨별 개수 (증분 관리 값)"""
+        return {label: count for label, count in self._label_counts.items() if count > 0}
+
+    def by_user(self, user_id: int, **page) -> Tuple[int, List[DailyEmotion]]:
+        """사용자별 일기 (localdate 순) - (범위 내 전체 개수, 페이지) 반환"""
+        return self._page(self._by_user.get(user_id, []), **page)
+
+    def by_label(self, emotion_label: int, **page) -> Tuple[int, List[DailyEmotion]]:
+        """감정 라벨별 일기 (localdate 순) - (범위 내 전체 개수, 페이지) 반환"""
+        return self._page(self._by_label.get(emotion_label, []), **page)
+
+    def by_date(self, **page) -> Tuple[int, List[DailyEmotion]]:
+        """전체 일기 (localdate 순) - (범위 내 전체 개수, 페이지) 반환"""
+        return self._page(self._by_date, **page)
+
+    def _page(
+        self,
+        postings: List[SortKey],
+        offset: int = 0,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        descending: bool = False
+    ) -> Tuple[int, List[DailyEmotion]]:
+        """
+        정렬된 posting list에서 날짜 범위와 페이지를 잘라 일기 객체로 변환
+
+        범위 경계는 이진 탐색으로 찾으므로 O(log n + 반환 개수)입니다.
+
+        Args:
+            postings: (localdate, id) 정렬 리스트
+            offset: 건너뛸 개수
+            limit: 최대 반환 개수 (None이면 전체)
+            start_date: 시작 날짜 (포함, YYYY-MM-DD)
+            end_date: 종료 날짜 (포함, YYYY-MM-DD)
+            descending: True이면 최신 날짜부터
+        """
+        lo = bisect.bisect_left(postings, (start_date,)) if start_date else 0
+        # end_date 당일 항목까지 포함하도록 end_date 뒤에 최대 문자를 붙여 상한 계산
+        hi = bisect.bisect_left(postings, (end_date + '\uffff',)) if end_date else len(postings)
+        total = max(hi - lo, 0)
+
+        offset = max(offset, 0)
+        count = total - offset if limit is None else min(limit, total - offset)
+        if count <= 0:
+            return total, []
+
+        if descending:
+            stop = hi - offset
+            keys = postings[stop - count:stop][::-1]
+        else:
+            start = lo + offset
+            keys = postings[start:start + count]
+        return total, [self._materialize(self._by_id[emotion_id]) for _, emotion_id in keys]
@@ -0,0 +1,185 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+import joblib
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from app.daily_emotion.daily_emotion_loader import PREFIX_CHECK_BYTES, iter_record_blocks, prefix_hash
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 스트리밍 학습 상태(모델 + 읽은 위치) 저장 경로
+STREAMING_STATE_PATH = os.path.join(os.path.dirname(__file__), "models", "emotion_streaming.joblib")
+
+# 한 번에 읽어 partial_fit 하는 CSV 바이트 수
+STREAM_BLOCK_BYTES = 4 * 1024 * 1024
+
+# id % HOLDOUT_MODULO == 0 인 행은 학습에 쓰지 않고 검증에만 사용 (추가 데이터에도 같은 규칙 적용)
+HOLDOUT_MODULO = 5
+
+CLASSES = np.array([0, 1, 2])
+
+
+def create_hashing_vectorizer() -> HashingVectorizer:
+    """상태 없는 해싱 벡터화기 (어휘 사전이 없어 데이터가 늘어도 메모리 고정)"""
+    return HashingVectorizer(
+        n_features=2 ** 20,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm='l2'
+    )
+
+
+def create_incremental_model() -> SGDClassifier:
+    """partial_fit 가능한 선형 분류기 (log_loss라 predict_proba 지원)"""
+    return SGDClassifier(
+        loss='log_loss',
+        alpha=1e-5,
+        random_state=42
+    )
+
+
+class StreamingEmotionTrainer:
+    """
+    일기 감정 분류기 out-of-core 학습기
+
+    - CSV를 블록 단위로 읽어 HashingVectorizer로 변환하고 SGDClassifier.partial_fit으로 학습합니다.
+      메모리 사용량은 전체 데이터가 아니라 블록 크기에 비례합니다.
+    - 학습 후 읽은 바이트 위치를 저장해 두고, 이후 CSV 뒤에 추가된 행만 이어서 학습(update)합니다.
+    - 상태는 state_path에서 읽고 save_path(작업의 staging 경로)에 저장합니다.
+      state_path로의 교체는 모델과 함께 publish 단계에서 이루어지므로, publish되지 않은 학습은 읽은 위치를 옮기지 않습니다.
+    - 정확도는 각 블록을 학습하기 전에 현재 모델로 먼저 예측하는 progressive validation으로 계산합니다.
+    """
+
+    def __init__(self, data_path: str, state_path: str = STREAMING_STATE_PATH, save_path: Optional[str] = None):
+        self.data_path = data_path
+        self.state_path = state_path
+        self.save_path = save_path or state_path
+        self.vectorizer = create_hashing_vectorizer()
+        self.model: Optional[SGDClassifier] = None
+        self.state: Dict[str, Any] = {}
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {
+            'offset': 0,
+            'rows_trained': 0,
+            'train_seen': 0,
+            'train_correct': 0,
+            'holdout_seen': 0,
+            'holdout_correct': 0,
+        }
+
+    def train(self, block_bytes: int = STREAM_BLOCK_BYTES) -> Dict[str, Any]:
+        """처음부터 전체 CSV 스트리밍 학습"""
+        self.model = create_incremental_model()
+        self.state = self._new_state()
+        logger.info(f"[StreamingEmotionTrainer] 전체 스트리밍 학습 시작: {self.data_path}")
+        return self._consume(block_bytes, include_tail=True)
+
+    def update(self, block_bytes: int = STREAM_BLOCK_BYTES) -> Dict[str, Any]:
+        """
+        저장된 상태에서 이어서, 마지막 학습 이후 CSV에 추가된 행만 학습
+
+        저장된 상태가 없거나 파일이 append가 아닌 방식으로 바뀌었으면 처음부터 다시 학습합니다.
+        """
+        if not self.load_state():
+            logger.info("[StreamingEmotionTrainer] 저장된 스트리밍 상태가 없어 전체 학습을 실행합니다.")
+            return self.train(block_bytes)
+
+        size = os.path.getsize(self.data_path)
+        offset = self.state['offset']
+        check_bytes = min(offset, PREFIX_CHECK_BYTES)
+        if size < offset or prefix_hash(self.data_path, check_bytes) != self.state.get('prefix_hash'):
+            logger.info("[StreamingEmotionTrainer] CSV가 append 이외의 방식으로 변경되어 전체 학습을 실행합니다.")
+            return self.train(block_bytes)
+
+        if size == offset:
+            logger.info("[StreamingEmotionTrainer] 추가된 행이 없습니다.")
+            return self.summary(new_rows=0)
+
+        logger.info(f"[StreamingEmotionTrainer] 추가 학습 시작: {offset} -> {size} bytes")
+        return self._consume(block_bytes, include_tail=False)
+
+    def _consume(self, block_bytes: int, include_tail: bool) -> Dict[str, Any]:
+        """저장된 offset부터 파일 끝까지 블록 단위로 검증 후 partial_fit"""
+        state = self.state
+        new_rows = 0
+        for table, position in iter_record_blocks(
+            self.data_path, start_offset=state['offset'], block_bytes=block_bytes, include_tail=include_tail
+        ):
+            state['offset'] = position
+            if table.empty:
+                continue
+
+            texts = (table['title'] + ' ' + table['content']).str.strip()
+            keep = texts.str.len() > 0
+            if not keep.any():
+                continue
+            X = self.vectorizer.transform(texts[keep].tolist())
+            y = table.loc[keep, 'emotion'].to_numpy().astype(int)
+            holdout = (table.loc[keep, 'id'].to_numpy() % HOLDOUT_MODULO) == 0
+
+            # 학습 전에 현재 모델로 예측 (progressive validation)
+            if self.model is not None and hasattr(self.model, 'coef_'):
+                predicted = self.model.predict(X)
+                correct = predicted == y
+                state['holdout_seen'] += int(holdout.sum())
+                state['holdout_correct'] += int(correct[holdout].sum())
+                state['train_seen'] += int((~holdout).sum())
+                state['train_correct'] += int(correct[~holdout].sum())
+
+            if (~holdout).any():
+                self.model.partial_fit(X[~holdout], y[~holdout], classes=CLASSES)
+                state['rows_trained'] += int((~holdout).sum())
+            new_rows += len(y)
+
+        if self.model is None or not hasattr(self.model, 'coef_'):
+            raise ValueError("학습할 데이터가 없습니다.")
+
+        state['prefix_hash'] = prefix_hash(self.data_path, min(state['offset'], PREFIX_CHECK_BYTES))
+        state['trained_at'] = datetime.now().isoformat()
+        self.save_state()
+        result = self.summary(new_rows=new_rows)
+        logger.info(f"[StreamingEmotionTrainer] 스트리밍 학습 완료: {result}")
+        return result
+
+    def summary(self, new_rows: int = 0) -> Dict[str, Any]:
+        """기존 accuracy 딕셔너리와 같은 키에 스트리밍 정보를 더한 결과"""
+        state = self.state
+
+        def ratio(correct: int, seen: int) -> Optional[float]:
+            return round(correct / seen * 100, 2) if seen else None
+
+        return {
+            'train_accuracy': ratio(state['train_correct'], state['train_seen']),
+            'test_accuracy': ratio(state['holdout_correct'], state['holdout_seen']),
+            'train_count': state['rows_trained'],
+            'test_count': state['holdout_seen'],
+            'mode': 'streaming',
+            'new_rows': new_rows,
+            'offset': state['offset'],
+        }
+
+    def save_state(self):
+        """모델과 읽은 위치를 save_path에 저장 (임시 파일에 기록 후 교체)"""
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        tmp_path = f"{self.save_path}.tmp"
+        joblib.dump({
+            'model': self.model,
+            'state': self.state,
+            'sklearn_version': sklearn.__version__,
+        }, tmp_path)
+        os.replace(tmp_path, self.save_path)
+
+    def load_state(self) -> bool:
+        """저장된 모델과 읽은 위치 로드 (없으면 False)"""
+        if not os.path.exists(self.state_path):
+            return False
+        bundle = joblib.load(self.state_path)
+        self.model = bundle['model']
+        self.state = bundle['state']
+        return True
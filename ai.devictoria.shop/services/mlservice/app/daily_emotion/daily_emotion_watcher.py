@@ -0,0 +1,79 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 데이터 파일 변경 확인 주기 (초)
+WATCH_INTERVAL_SECONDS = 5.0
+
+# (크기, 수정 시각) - 파일이 없으면 None
+FileSignature = Optional[Tuple[int, int]]
+
+
+def file_signature(path: str) -> FileSignature:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class DailyEmotionDataWatcher:
+    """
+    일기 데이터 파일 변경 감시 (백그라운드 스레드)
+
+    주기적으로 파일 크기와 수정 시각을 확인하고, 바뀌었으면 on_change를 호출합니다.
+    on_change는 감시 스레드에서 실행되므로 요청 처리 경로를 막지 않습니다.
+    쓰는 중인 파일을 읽지 않도록, 변경이 감지된 뒤 한 주기 동안 더 바뀌지 않을 때 호출합니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], None],
+        interval: float = WATCH_INTERVAL_SECONDS
+    ):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature: FileSignature = file_signature(path)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="daily-emotion-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"[DailyEmotionDataWatcher] 데이터 파일 감시 시작: {self.path} ({self.interval}초 주기)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def mark_seen(self, signature: FileSignature):
+        """현재 반영된 파일 상태 기록 (직접 다시 로드한 경우 중복 호출 방지)"""
+        self._signature = signature
+
+    def _run(self):
+        pending: FileSignature = None
+        while not self._stop.wait(self.interval):
+            current = file_signature(self.path)
+            if current == self._signature:
+                pending = None
+                continue
+            if current != pending:
+                # 변경 감지 - 다음 주기에도 같으면 반영
+                pending = current
+                continue
+            try:
+                self.on_change()
+                self._signature = current
+            except Exception as e:
+                logger.error(f"[DailyEmotionDataWatcher] 데이터 다시 로드 실패: {str(e)}")
+            pending = None
@@ -1,6 +1,8 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Path, Query
 from app.daily_emotion.daily_emotion_service import DailyEmotionService
-from app.daily_emotion.daily_emotion_model import DailyEmotion
+from app.daily_emotion.daily_emotion_job import TrainingConflictError
+from app.daily_emotion.daily_emotion_model import DailyEmotion, EmotionPredictRequest
 
 # 라우터 생성
 router = APIRouter(prefix="/api/daily-emotion", tags=["daily-emotion"])
@@ -109,15 +111,28 @@ async def get_emotion_by_id(
         )
 
 
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+
 @router.get("/emotions/user/{user_id}")
 async def get_emotions_by_user_id(
-    user_id: int = Path(..., description="사용자 ID", example=1, ge=1)
+    user_id: int = Path(..., description="사용자 ID", example=1, ge=1),
+    offset: int = Query(0, description="건너뛸 개수", ge=0),
+    limit: Optional[int] = Query(None, description="최대 반환 개수 (생략 시 전체)", ge=1, le=1000),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD, 포함)", pattern=DATE_PATTERN),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 포함)", pattern=DATE_PATTERN),
+    descending: bool = Query(False, description="true이면 최신 날짜부터")
 ):
-    """사용자 ID로 일기 목록 조회"""
+    """사용자 ID로 일기 목록 조회 (localdate 순, 페이지/날짜 범위 지원)"""
     try:
-        emotions = daily_emotion_service.get_emotions_by_user_id(user_id)
+        total, emotions = daily_emotion_service.get_emotions_by_user_id(
+            user_id, offset=offset, limit=limit,
+            start_date=start_date, end_date=end_date, descending=descending
+        )
         return {
             "count": len(emotions),
+            "total": total,
+            "offset": offset,
             "userId": user_id,
             "emotions": [emotion.dict() for emotion in emotions]
         }
@@ -128,6 +143,32 @@ async def get_emotions_by_user_id(
         )
 
 
+@router.get("/users/{user_id}/timeline")
+async def get_emotion_timeline(
+    user_id: int = Path(..., description="사용자 ID", example=1, ge=1),
+    granularity: str = Query("day", description="집계 단위 (day, week, month)", pattern="^(day|week|month)$"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD, 해당 구간 포함)", pattern=DATE_PATTERN),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 해당 구간 포함)", pattern=DATE_PATTERN)
+):
+    """
+    사용자 감정 타임라인 조회
+    
+    일/주(월요일 시작)/월 단위로 감정(중립, 긍정, 부정) 개수와 비율을 반환합니다.
+    미리 집계된 테이블에서 조회하므로 일기 본문은 포함되지 않습니다.
+    """
+    try:
+        return daily_emotion_service.get_emotion_timeline(
+            user_id, granularity=granularity, start_date=start_date, end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"감정 타임라인 조회 실패: {str(e)}"
+        )
+
+
 @router.get("/emotions/label/{emotion_label}")
 async def get_emotions_by_label(
     emotion_label: int = Path(
@@ -136,10 +177,15 @@ async def get_emotions_by_label(
         example=1, 
         ge=0,
         le=2
-    )
+    ),
+    offset: int = Query(0, description="건너뛸 개수", ge=0),
+    limit: Optional[int] = Query(None, description="최대 반환 개수 (생략 시 전체)", ge=1, le=1000),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD, 포함)", pattern=DATE_PATTERN),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD, 포함)", pattern=DATE_PATTERN),
+    descending: bool = Query(False, description="true이면 최신 날짜부터")
 ):
     """
-    감정 라벨로 일기 목록 조회
+    감정 라벨로 일기 목록 조회 (localdate 순, 페이지/날짜 범위 지원)
     
     - **emotion_label**: 감정 라벨
         - 0: 중립 (Neutral)
@@ -147,11 +193,16 @@ async def get_emotions_by_label(
         - 2: 부정 (Negative)
     """
     try:
-        emotions = daily_emotion_service.get_emotions_by_emotion_label(emotion_label)
+        total, emotions = daily_emotion_service.get_emotions_by_emotion_label(
+            emotion_label, offset=offset, limit=limit,
+            start_date=start_date, end_date=end_date, descending=descending
+        )
         # 라벨 이름 매핑
         label_names = {0: "중립", 1: "긍정", 2: "부정"}
         return {
             "count": len(emotions),
+            "total": total,
+            "offset": offset,
             "emotionLabel": emotion_label,
             "emotionLabelName": label_names.get(emotion_label, "Unknown"),
             "emotions": [emotion.dict() for emotion in emotions]
@@ -180,48 +231,148 @@ async def get_label_distribution():
         )
 
 
-@router.post("/train")
-async def train_model():
+@router.post("/data/reload")
+def reload_data():
     """
-    ML 모델 학습 실행
+    데이터 파일 변경 즉시 반영
     
-    일기 감정 분류 모델을 학습합니다.
+    평소에는 백그라운드 감시 스레드가 파일 변경을 감지해 자동으로 반영합니다.
+    뒤에 추가된 행만 파싱하고, 파일이 덮어써진 경우에는 전체를 다시 로드합니다.
     """
     try:
-        accuracy = daily_emotion_service.train_model()
+        result = daily_emotion_service.reload_data()
         return {
             "status": "success",
-            "message": "모델 학습이 완료되었습니다.",
-            "accuracy": accuracy
+            "message": "데이터 반영이 완료되었습니다.",
+            "result": result
         }
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"모델 학습 실패: {str(e)}"
+            detail=f"데이터 반영 실패: {str(e)}"
+        )
+
+
+def _job_response(job, created: bool, message: str, duplicate_message: str) -> dict:
+    """작업 등록 응답"""
+    return {
+        "message": message if created else duplicate_message,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/daily-emotion/jobs/{job.id}"
+    }
+
+
+@router.post("/train", status_code=202)
+async def train_model(
+    mode: str = Query(
+        "tfidf",
+        description=(
+            "학습 방식 (tfidf: TF-IDF + RandomForest, morpheme: Kiwi 형태소 TF-IDF + RandomForest, "
+            "streaming: HashingVectorizer + SGD out-of-core 학습)"
+        ),
+        pattern="^(tfidf|morpheme|streaming)$"
+    )
+):
+    """
+    ML 모델 학습 작업 등록
+    
+    일기 감정 분류 모델 학습을 워커 프로세스에서 실행하고 작업 ID를 즉시 반환합니다.
+    학습이 끝까지 성공한 경우에만 예측에 쓰는 모델이 새 모델로 교체됩니다.
+    진행 상황과 결과는 /api/daily-emotion/jobs/{job_id} 에서 조회합니다.
+    """
+    try:
+        job, created = daily_emotion_service.submit_training(mode=mode)
+        return _job_response(
+            job, created,
+            "모델 학습 작업이 등록되었습니다.",
+            "동일한 학습 작업이 이미 진행 중입니다."
+        )
+    except TrainingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"모델 학습 작업 등록 실패: {str(e)}"
+        )
+
+
+@router.post("/train/incremental", status_code=202)
+async def update_model():
+    """
+    스트리밍 모델 추가 학습 작업 등록
+    
+    마지막 스트리밍 학습 이후 CSV 뒤에 추가된 일기만 읽어 기존 모델에 이어서 학습합니다.
+    저장된 스트리밍 모델이 없거나 CSV가 append 이외의 방식으로 바뀌었으면 처음부터 학습합니다.
+    """
+    try:
+        job, created = daily_emotion_service.submit_update()
+        return _job_response(
+            job, created,
+            "모델 추가 학습 작업이 등록되었습니다.",
+            "동일한 추가 학습 작업이 이미 진행 중입니다."
+        )
+    except TrainingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"모델 추가 학습 작업 등록 실패: {str(e)}"
         )
 
 
-@router.post("/evaluate")
+@router.post("/evaluate", status_code=202)
 async def evaluate_model():
     """
-    ML 모델 평가 실행
+    ML 모델 평가 작업 등록
     
-    학습된 모델의 상세 평가 메트릭을 계산합니다.
+    현재 모델의 상세 평가 메트릭을 워커 프로세스에서 계산합니다.
     """
     try:
-        evaluation = daily_emotion_service.evaluate_model()
-        return {
-            "status": "success",
-            "message": "모델 평가가 완료되었습니다.",
-            "evaluation": evaluation
-        }
+        job, created = daily_emotion_service.submit_evaluation()
+        return _job_response(
+            job, created,
+            "모델 평가 작업이 등록되었습니다.",
+            "동일한 평가 작업이 이미 진행 중입니다."
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"모델 평가 실패: {str(e)}"
+            detail=f"모델 평가 작업 등록 실패: {str(e)}"
         )
 
 
+@router.get("/training/status")
+async def get_training_status():
+    """현재 모델 버전(학습 시각), 마지막 학습 지표, 대기/실행 중인 작업 조회"""
+    return daily_emotion_service.get_training_status()
+
+
+@router.get("/jobs")
+async def list_jobs():
+    """학습/평가 작업 목록 조회 (최신순)"""
+    jobs = daily_emotion_service.list_jobs()
+    return {
+        "count": len(jobs),
+        "jobs": [job.to_dict() for job in jobs]
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    작업 상태 조회
+    
+    진행 단계(preprocess/modeling/learning/publish/evaluate), 진행률, 결과를 반환합니다.
+    """
+    job = daily_emotion_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업 {job_id}를 찾을 수 없습니다.")
+    return job.to_dict()
+
+
 @router.get("/accuracy")
 async def get_model_accuracy():
     """
@@ -238,3 +389,32 @@ async def get_model_accuracy():
             detail=f"정확도 조회 실패: {str(e)}"
         )
 
+
+
+@router.post("/predict")
+def predict_emotions(request: EmotionPredictRequest):
+    """
+    일기 텍스트 감정 일괄 예측
+    
+    전달된 텍스트 목록을 한 번에 벡터화하고 분류하여 입력 순서대로 결과를 반환합니다.
+    벡터화/예측은 CPU 작업이므로 이벤트 루프를 막지 않도록 동기 함수(스레드풀)로 실행합니다.
+    서버 시작 시 저장된 모델을 불러오며, 저장된 모델이 없으면 /train 호출 후 사용할 수 있습니다.
+    """
+    if not daily_emotion_service.is_model_ready():
+        raise HTTPException(
+            status_code=503,
+            detail="모델이 학습되지 않았습니다. /api/daily-emotion/train 엔드포인트를 호출하여 학습하세요."
+        )
+    try:
+        predictions = daily_emotion_service.predict_emotions(request.texts)
+        return {
+            "count": len(predictions),
+            "predictions": predictions
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"감정 예측 실패: {str(e)}"
+        )
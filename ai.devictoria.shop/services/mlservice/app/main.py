@@ -10,9 +10,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.titanic.config import TitanicServiceConfig
 from app.titanic.titanic_router import router as titanic_router
-from app.daily_emotion.router import router as daily_emotion_router
+from app.titanic.titanic_job import get_titanic_job_manager
+from app.daily_emotion.router import router as daily_emotion_router, daily_emotion_service
 from app.seoul_crime.save.seoul_router import router as seoul_crime_router
 from app.nlp.nlp_router import router as nlp_router
+from app.nlp.emma.parallel_tagger import get_parallel_tagger
+from app.nlp.emma.word_normalizer import get_word_normalizer
 from app.nlp.korean.korean_router import router as korean_nlp_router
 from app.nlp.samsung.samsung_router import router as samsung_router
 from app.us_unemployment.router import router as us_unemployment_router
@@ -69,6 +72,10 @@ async def startup_event():
 async def shutdown_event():
     """서비스 종료 시 실행"""
     logger.info(f"{config.service_name} shutting down")
+    get_titanic_job_manager().shutdown()
+    daily_emotion_service.shutdown()
+    get_parallel_tagger().shutdown()
+    get_word_normalizer().shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+n-gram 통계 / 연어(collocation) 엔진
+정수 토큰 배열(CorpusAnalysis.token_ids)에서 numpy로 바이그램/트라이그램을 세고
+PMI, likelihood ratio, t-score를 한 번에 벡터 계산
+
+점수 공식과 계수 방식, 순위(점수 내림차순 -> n-gram 사전순)는
+nltk BigramCollocationFinder / TrigramCollocationFinder + Bigram/TrigramAssocMeasures와 같습니다.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# 지원하는 점수
+MEASURES = ("likelihood_ratio", "pmi", "t_score")
+
+# nltk.metrics.association._SMALL
+_SMALL = 1e-20
+
+
+def _count_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """정수 키 배열의 고유값과 빈도"""
+    return np.unique(keys, return_counts=True)
+
+
+def _lookup(unique_keys: np.ndarray, counts: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """정렬된 고유 키 표에서 keys의 빈도 조회 (모든 키가 표에 있어야 함)"""
+    return counts[np.searchsorted(unique_keys, keys)]
+
+
+def _expected_values(cont: np.ndarray, n: int) -> np.ndarray:
+    """
+    분할표 기대값 (nltk NgramAssocMeasures._expected_values의 벡터 버전)
+
+    Args:
+        cont: (n-gram 수, 2**n) 분할표. 열 번호의 j번째 비트가 1이면 j번째 위치가 '다른 단어'
+    """
+    n_all = cont.sum(axis=1)
+    cells = np.arange(2 ** n)
+    expected = np.empty_like(cont)
+    for i in cells:
+        product = np.ones(len(cont))
+        for j in (1 << b for b in range(n)):
+            product *= cont[:, (cells & j) == (i & j)].sum(axis=1)
+        expected[:, i] = product / n_all ** (n - 1)
+    return expected
+
+
+class NgramStats:
+    """
+    말뭉치 1개의 바이그램/트라이그램 빈도 표와 연어 점수 계산기
+
+    빈도 표는 처음 요청될 때 한 번만 만들고 재사용합니다.
+    n-gram은 (w1 * V + w2) 형태의 int64 키로 인코딩합니다.
+    """
+
+    def __init__(self, vocab: List[str], token_ids: np.ndarray):
+        self.vocab = vocab
+        self.V = len(vocab)
+        self.ids = token_ids.astype(np.int64)
+        self.N = len(token_ids)
+        self.word_counts = np.bincount(self.ids, minlength=self.V)
+        self._tables: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._vocab_rank: Optional[np.ndarray] = None
+
+    def _table(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """'bigram', 'skip' (w1, *, w3), 'trigram' 빈도 표"""
+        table = self._tables.get(name)
+        if table is None:
+            ids, V = self.ids, self.V
+            if name == "bigram":
+                keys = ids[:-1] * V + ids[1:]
+            elif name == "skip":
+                keys = ids[:-2] * V + ids[2:]
+            else:
+                keys = (ids[:-2] * V + ids[1:-1]) * V + ids[2:]
+            table = _count_keys(keys)
+            self._tables[name] = table
+        return table
+
+    @property
+    def vocab_rank(self) -> np.ndarray:
+        """어휘 사전순 순위 (동점 n-gram을 nltk처럼 문자열 순서로 정렬할 때 사용)"""
+        if self._vocab_rank is None:
+            order = sorted(range(self.V), key=self.vocab.__getitem__)
+            rank = np.empty(self.V, dtype=np.int64)
+            rank[order] = np.arange(self.V)
+            self._vocab_rank = rank
+        return self._vocab_rank
+
+    def _decode(self, keys: np.ndarray, n: int) -> np.ndarray:
+        """int64 키 -> (n-gram 수, n) 단어 id 배열"""
+        words = np.empty((len(keys), n), dtype=np.int64)
+        for position in range(n - 1, -1, -1):
+            keys, words[:, position] = np.divmod(keys, self.V)
+        return words
+
+    def _scores(self, n: int, words: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+        """n-gram별 PMI / likelihood ratio / t-score"""
+        N = float(self.N)
+        unigrams = self.word_counts[words].astype(np.float64)
+        n_gram = counts.astype(np.float64)
+        if n == 2:
+            n_ix, n_xi = unigrams[:, 0], unigrams[:, 1]
+            n_oi = n_xi - n_gram
+            n_io = n_ix - n_gram
+            cont = np.stack([n_gram, n_oi, n_io, N - n_gram - n_oi - n_io], axis=1)
+        else:
+            V = self.V
+            n_iix = _lookup(*self._table("bigram"), words[:, 0] * V + words[:, 1]).astype(np.float64)
+            n_ixi = _lookup(*self._table("skip"), words[:, 0] * V + words[:, 2]).astype(np.float64)
+            n_xii = _lookup(*self._table("bigram"), words[:, 1] * V + words[:, 2]).astype(np.float64)
+            n_ixx, n_xix, n_xxi = unigrams[:, 0], unigrams[:, 1], unigrams[:, 2]
+            n_oii = n_xii - n_gram
+            n_ioi = n_ixi - n_gram
+            n_iio = n_iix - n_gram
+            n_ooi = n_xxi - n_gram - n_oii - n_ioi
+            n_oio = n_xix - n_gram - n_oii - n_iio
+            n_ioo = n_ixx - n_gram - n_ioi - n_iio
+            n_ooo = N - n_gram - n_oii - n_ioi - n_iio - n_ooi - n_oio - n_ioo
+            cont = np.stack([n_gram, n_oii, n_ioi, n_ooi, n_iio, n_oio, n_ioo, n_ooo], axis=1)
+
+        unigram_product = unigrams.prod(axis=1)
+        expected = _expected_values(cont, n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            likelihood = 2 * (cont * np.log(cont / (expected + _SMALL) + _SMALL)).sum(axis=1)
+        return {
+            "likelihood_ratio": likelihood,
+            "pmi": np.log2(n_gram * N ** (n - 1)) - np.log2(unigram_product),
+            "t_score": (n_gram - unigram_product / N ** (n - 1)) / np.sqrt(n_gram + _SMALL),
+        }
+
+    def collocations(
+        self,
+        n: int = 2,
+        measure: str = "likelihood_ratio",
+        top_k: int = 20,
+        min_freq: int = 2,
+        min_word_length: int = 3,
+        stopwords: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        상위 k개 연어와 점수
+
+        기본값은 nltk Text.collocation_list와 같은 필터입니다
+        (빈도 2 이상, 3글자 미만 단어와 불용어(소문자 비교)를 포함한 n-gram 제외, likelihood ratio 순).
+
+        Args:
+            n: 2(바이그램) 또는 3(트라이그램)
+            measure: 순위 기준 점수 ("likelihood_ratio", "pmi", "t_score")
+            top_k: 반환할 개수
+            min_freq: 최소 n-gram 빈도
+            min_word_length: 최소 단어 길이
+            stopwords: 제외할 단어 (소문자)
+        """
+        if n not in (2, 3):
+            raise ValueError("n은 2 또는 3이어야 합니다.")
+        if measure not in MEASURES:
+            raise ValueError(f"지원하지 않는 점수입니다: {measure} (가능: {', '.join(MEASURES)})")
+        if self.N < n:
+            return []
+
+        keys, counts = self._table("bigram" if n == 2 else "trigram")
+        words = self._decode(keys, n)
+
+        # 빈도 필터 + 단어 필터 (n-gram의 단어 중 하나라도 걸리면 제외)
+        excluded = set(stopwords or ())
+        bad_word = np.fromiter(
+            (len(word) < min_word_length or word.lower() in excluded for word in self.vocab),
+            dtype=bool, count=self.V
+        )
+        mask = (counts >= min_freq) & ~bad_word[words].any(axis=1)
+        words, counts = words[mask], counts[mask]
+        if len(counts) == 0:
+            return []
+
+        scores = self._scores(n, words, counts)
+        ranking = scores[measure]
+        # 점수 내림차순, 같으면 n-gram 문자열 사전순 (np.lexsort는 마지막 키가 1순위)
+        rank = self.vocab_rank[words]
+        order = np.lexsort(tuple(rank[:, position] for position in range(n - 1, -1, -1)) + (-ranking,))[:top_k]
+
+        return [
+            {
+                "ngram": [self.vocab[w] for w in words[i].tolist()],
+                "count": int(counts[i]),
+                **{name: float(values[i]) for name, values in scores.items()}
+            }
+            for i in order.tolist()
+        ]
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Gutenberg 말뭉치 분석 결과 캐시
+파일(fileid)별 토큰, 빈도 분포를 한 번만 계산해 압축 바이너리(npz)로 저장하고 재사용
+품사 태그는 고유명사/품사가 필요한 요청이 처음 올 때만 계산해 같은 파일에 추가 저장
+
+빌드 단계에서 미리 생성:
+    python -m app.nlp.emma.corpus_analysis austen-emma.txt   # 지정 파일
+    python -m app.nlp.emma.corpus_analysis --all             # Gutenberg 전체
+"""
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from nltk import FreqDist
+from nltk.tag import pos_tag
+from nltk.tokenize import RegexpTokenizer
+from app.nlp.emma.collocations import NgramStats
+from app.nlp.emma.corpus_index import CorpusIndex
+
+logger = logging.getLogger(__name__)
+
+# 토큰화/태깅 방식이 바뀌면 올려서 저장된 분석 결과를 무효화
+CORPUS_ANALYSIS_VERSION = "1"
+
+# 분석 결과 저장 디렉토리
+CORPUS_CACHE_DIR = Path(__file__).parent.parent / "cache" / "corpus"
+
+# NLTKService.tokenize_regex 기본 패턴과 같아야 결과가 일치
+TOKEN_PATTERN = r"[\w]+"
+
+# 고유명사 추출 시 기본 제외 단어
+NAME_STOPWORDS = ("Mr.", "Mrs.", "Miss", "Mr", "Mrs", "Dear")
+
+
+def _encode_words(words: Sequence[str]) -> np.ndarray:
+    """단어 목록을 줄바꿈으로 이은 UTF-8 바이트 배열로 변환 (토큰에는 줄바꿈이 없음)"""
+    return np.frombuffer("\n".join(words).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_words(data: np.ndarray) -> List[str]:
+    text = data.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+class CorpusAnalysis:
+    """
+    말뭉치 파일 1개의 분석 결과
+
+    토큰은 어휘 사전 + int32 인덱스 배열, 품사는 태그 사전 + uint8 배열로 보관합니다.
+    품사 태깅은 전체 텍스트 기준으로 수 초가 걸리므로 tag()가 호출될 때까지 하지 않습니다 (tag_ids = None).
+    FreqDist는 처음 요청될 때 인덱스 배열의 bincount로 만들고 재사용합니다.
+    어휘 사전은 처음 등장한 순서이므로 FreqDist(tokens)와 동률 순서까지 같습니다.
+    위치 역색인(CorpusIndex)과 n-gram 통계(NgramStats)도 처음 요청될 때 한 번만 만듭니다.
+    """
+
+    def __init__(
+        self,
+        fileid: str,
+        version: str,
+        text: str,
+        vocab: List[str],
+        token_ids: np.ndarray,
+        starts: np.ndarray,
+        tag_vocab: Optional[List[str]] = None,
+        tag_ids: Optional[np.ndarray] = None
+    ):
+        self.fileid = fileid
+        self.version = version
+        self.text = text
+        self.vocab = vocab
+        self.token_ids = token_ids
+        self.starts = starts
+        self.tag_vocab = tag_vocab or []
+        self.tag_ids = tag_ids
+        self._tag_lock = threading.Lock()
+        self._tokens: Optional[List[str]] = None
+        self._freq_dist: Optional[FreqDist] = None
+        self._index: Optional[CorpusIndex] = None
+        self._ngrams: Optional[NgramStats] = None
+        self._names: Dict[Tuple[str, ...], FreqDist] = {}
+
+    @classmethod
+    def build(cls, fileid: str, version: str, text: str) -> "CorpusAnalysis":
+        """원문 토큰화 (품사 태깅은 하지 않음)"""
+        spans = list(RegexpTokenizer(TOKEN_PATTERN).span_tokenize(text))
+        vocab_index: Dict[str, int] = {}
+        token_ids = np.fromiter(
+            (vocab_index.setdefault(text[start:end], len(vocab_index)) for start, end in spans),
+            dtype=np.int32, count=len(spans)
+        )
+        starts = np.fromiter((start for start, _ in spans), dtype=np.int64, count=len(spans))
+        return cls(fileid, version, text, list(vocab_index), token_ids, starts)
+
+    @property
+    def has_tags(self) -> bool:
+        """품사 태깅 완료 여부"""
+        return self.tag_ids is not None
+
+    def tag(self) -> bool:
+        """
+        전체 토큰 품사 태깅 (처음 한 번만, averaged_perceptron_tagger 필요)
+
+        Returns:
+            이번 호출에서 새로 태깅했는지 여부
+        """
+        if self.tag_ids is not None:
+            return False
+        with self._tag_lock:
+            if self.tag_ids is not None:
+                return False
+            tags = [tag for _, tag in pos_tag(self.tokens)]
+            tag_index: Dict[str, int] = {}
+            tag_ids = np.fromiter(
+                (tag_index.setdefault(tag, len(tag_index)) for tag in tags),
+                dtype=np.uint8, count=len(tags)
+            )
+            self.tag_vocab = list(tag_index)
+            self.tag_ids = tag_ids
+        return True
+
+    def save(self, path: Path):
+        """압축 npz로 저장 (임시 파일에 기록 후 교체)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            arrays = dict(
+                version=_encode_words([self.version]),
+                text=np.frombuffer(self.text.encode("utf-8"), dtype=np.uint8),
+                vocab=_encode_words(self.vocab),
+                token_ids=self.token_ids,
+                starts=self.starts
+            )
+            if self.has_tags:
+                arrays.update(tag_vocab=_encode_words(self.tag_vocab), tag_ids=self.tag_ids)
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @classmethod
+    def load(cls, fileid: str, path: Path) -> "CorpusAnalysis":
+        with np.load(path, allow_pickle=False) as data:
+            tagged = "tag_ids" in data.files
+            return cls(
+                fileid,
+                _decode_words(data["version"])[0],
+                data["text"].tobytes().decode("utf-8"),
+                _decode_words(data["vocab"]),
+                data["token_ids"],
+                data["starts"],
+                _decode_words(data["tag_vocab"]) if tagged else None,
+                data["tag_ids"] if tagged else None
+            )
+
+    @property
+    def tokens(self) -> List[str]:
+        """tokenize_regex(text)와 같은 토큰 리스트"""
+        if self._tokens is None:
+            vocab = self.vocab
+            self._tokens = [vocab[i] for i in self.token_ids.tolist()]
+        return self._tokens
+
+    @property
+    def freq_dist(self) -> FreqDist:
+        """FreqDist(tokens)와 같은 빈도 분포"""
+        if self._freq_dist is None:
+            counts = np.bincount(self.token_ids, minlength=len(self.vocab))
+            self._freq_dist = FreqDist(dict(zip(self.vocab, counts.tolist())))
+        return self._freq_dist
+
+    @property
+    def index(self) -> CorpusIndex:
+        """concordance / dispersion / similar 질의용 위치 역색인"""
+        if self._index is None:
+            self._index = CorpusIndex(self.vocab, self.token_ids, self.tokens)
+        return self._index
+
+    @property
+    def ngrams(self) -> NgramStats:
+        """연어 점수 계산용 바이그램/트라이그램 통계"""
+        if self._ngrams is None:
+            self._ngrams = NgramStats(self.vocab, self.token_ids)
+        return self._ngrams
+
+    def _require_tags(self):
+        if self.tag_ids is None:
+            raise RuntimeError(f"품사 태깅 전입니다: {self.fileid} (CorpusAnalysisCache.ensure_tags 필요)")
+
+    def tagged_tokens(self) -> List[Tuple[str, str]]:
+        """pos_tag(tokens)와 같은 (단어, 품사) 리스트"""
+        self._require_tags()
+        tag_vocab = self.tag_vocab
+        return [(token, tag_vocab[t]) for token, t in zip(self.tokens, self.tag_ids.tolist())]
+
+    def names_freq_dist(self, stopwords: Optional[Sequence[str]] = None) -> FreqDist:
+        """
+        고유명사(NNP) 빈도 분포 (NLTKService.extract_names_from_text(text)와 같은 결과)
+
+        Args:
+            stopwords: 제외할 단어 (None이면 NAME_STOPWORDS)
+        """
+        self._require_tags()
+        stopwords = tuple(NAME_STOPWORDS if stopwords is None else stopwords)
+        cached = self._names.get(stopwords)
+        if cached is not None:
+            return cached
+
+        if "NNP" not in self.tag_vocab:
+            names = FreqDist()
+        else:
+            name_ids = self.token_ids[self.tag_ids == self.tag_vocab.index("NNP")]
+            # 고유명사로 처음 등장한 순서 유지 (FreqDist(names_list)와 동률 순서 일치)
+            unique_ids, first_index = np.unique(name_ids, return_index=True)
+            ordered = unique_ids[np.argsort(first_index, kind="stable")]
+            counts = np.bincount(name_ids, minlength=len(self.vocab))
+            excluded = set(stopwords)
+            names = FreqDist({
+                self.vocab[i]: int(counts[i]) for i in ordered.tolist() if self.vocab[i] not in excluded
+            })
+        self._names[stopwords] = names
+        return names
+
+    def prefix_tokens(self, length: int) -> List[str]:
+        """
+        tokenize_regex(text[:length])와 같은 토큰 리스트
+
+        length에서 잘리는 토큰은 잘린 앞부분만 포함합니다.
+        """
+        vocab_lengths = np.fromiter((len(word) for word in self.vocab), dtype=np.int64, count=len(self.vocab))
+        ends = self.starts + vocab_lengths[self.token_ids]
+        n_full = int(np.searchsorted(ends, length, side="right"))
+        tokens = self.tokens[:n_full]
+        if n_full < len(self.starts) and self.starts[n_full] < length:
+            tokens = tokens + [self.text[int(self.starts[n_full]):length]]
+        return tokens
+
+
+class CorpusAnalysisCache:
+    """
+    fileid별 분석 결과 캐시 (메모리 + 디스크)
+
+    저장 파일명에 (분석 버전 + 말뭉치 파일 버전) 해시를 포함하므로 말뭉치가 바뀌면 새로 분석합니다.
+    같은 파일을 동시에 요청하면 한 요청만 분석하고 나머지는 결과를 기다립니다.
+    """
+
+    def __init__(self, cache_dir: Path = CORPUS_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, CorpusAnalysis] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, fileid: str, version: str) -> Path:
+        digest = hashlib.sha256(version.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{fileid}.{digest}.npz"
+
+    def get(self, fileid: str, corpus_version: str, load_text: Callable[[], str]) -> CorpusAnalysis:
+        """
+        분석 결과 조회 (메모리 -> 디스크 -> 새로 분석 순)
+
+        Args:
+            fileid: 파일 ID
+            corpus_version: 말뭉치 파일 버전 (NLTKService.get_corpus_version)
+            load_text: 새로 분석할 때 원문을 읽는 함수
+        """
+        version = f"{CORPUS_ANALYSIS_VERSION}|{corpus_version}"
+        analysis = self._memory.get(fileid)
+        if analysis is not None and analysis.version == version:
+            return analysis
+
+        with self._lock:
+            file_lock = self._locks.setdefault(fileid, threading.Lock())
+        with file_lock:
+            analysis = self._memory.get(fileid)
+            if analysis is not None and analysis.version == version:
+                return analysis
+
+            path = self._path(fileid, version)
+            analysis = None
+            if path.exists():
+                try:
+                    analysis = CorpusAnalysis.load(fileid, path)
+                    logger.info(f"[CorpusAnalysisCache] 저장된 분석 결과 사용: {path}")
+                except Exception as e:
+                    logger.warning(f"[CorpusAnalysisCache] 분석 결과 로드 실패, 다시 분석합니다: {str(e)}")
+
+            if analysis is None:
+                logger.info(f"[CorpusAnalysisCache] 말뭉치 분석 시작: {fileid}")
+                analysis = CorpusAnalysis.build(fileid, version, load_text())
+                try:
+                    analysis.save(path)
+                    logger.info(f"[CorpusAnalysisCache] 분석 결과 저장: {path} ({len(analysis.token_ids)}개 토큰)")
+                except OSError as e:
+                    logger.warning(f"[CorpusAnalysisCache] 분석 결과 저장 실패: {str(e)}")
+
+            self._memory[fileid] = analysis
+            return analysis
+
+    def ensure_tags(self, analysis: CorpusAnalysis) -> CorpusAnalysis:
+        """
+        분석 결과에 품사 태그 추가 (처음 한 번만 태깅하고 디스크 파일도 태그 포함본으로 교체)
+
+        Args:
+            analysis: get()으로 받은 분석 결과
+        """
+        if analysis.has_tags:
+            return analysis
+        logger.info(f"[CorpusAnalysisCache] 품사 태깅 시작: {analysis.fileid}")
+        if analysis.tag():
+            path = self._path(analysis.fileid, analysis.version)
+            try:
+                analysis.save(path)
+                logger.info(f"[CorpusAnalysisCache] 품사 태그 저장: {path}")
+            except OSError as e:
+                logger.warning(f"[CorpusAnalysisCache] 품사 태그 저장 실패: {str(e)}")
+        return analysis
+
+
+# 캐시 싱글톤
+_analysis_cache: Optional[CorpusAnalysisCache] = None
+
+
+def get_corpus_analysis_cache() -> CorpusAnalysisCache:
+    """분석 결과 캐시 인스턴스 싱글톤 패턴"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = CorpusAnalysisCache()
+    return _analysis_cache
+
+
+# 빌드 단계 실행
+if __name__ == "__main__":
+    import sys
+    from app.nlp.emma.emma_wordcloud import NLTKService
+
+    logging.basicConfig(level=logging.INFO)
+    nltk_service = NLTKService()
+    args = sys.argv[1:] or ["austen-emma.txt"]
+    fileids = nltk_service.get_corpus_fileids() if args == ["--all"] else args
+    for fid in fileids:
+        result = nltk_service.get_corpus_analysis(fid, with_tags=True)
+        print(f"{fid}: 토큰 {len(result.token_ids)}개, 어휘 {len(result.vocab)}개")
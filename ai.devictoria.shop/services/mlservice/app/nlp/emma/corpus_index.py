@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+말뭉치 위치 역색인
+단어 -> 등장 위치(정렬된 numpy 배열) 색인과 단어×문맥 행렬을 한 번 만들어
+concordance / dispersion / similar 질의를 토큰 전체 스캔 없이 처리
+
+결과는 nltk.Text의 concordance_list / dispersion_plot / similar와 같은 규칙을 따릅니다.
+- concordance, similar: 대소문자 무시 (nltk와 동일)
+- dispersion: 대소문자 구분 (nltk dispersion_plot 기본값과 동일, ignore_case로 변경 가능)
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def _group_positions(ids: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    id별 위치 목록을 CSR 형태로 구성
+
+    Returns:
+        (indptr, positions) 튜플 - id i의 위치는 positions[indptr[i]:indptr[i + 1]] (오름차순)
+    """
+    positions = np.argsort(ids, kind="stable")
+    indptr = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=n_groups), out=indptr[1:])
+    return indptr, positions
+
+
+def _gather(indptr: np.ndarray, values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """CSR 배열에서 여러 행의 값을 한 번에 이어 붙이기 (파이썬 반복 없이)"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return values[:0]
+    # 각 행 시작 위치로 점프하도록 오프셋을 반복 후 0..total-1 에 더함
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return values[offsets + np.arange(total)]
+
+
+class CorpusIndex:
+    """
+    토큰 id 배열 기반 위치 역색인
+
+    - 대소문자 구분 색인: 어휘 id -> 위치
+    - 소문자 색인: 소문자 어휘 id -> 위치
+    - 문맥 행렬: 소문자 단어 × (왼쪽 단어, 오른쪽 단어) 문맥의 이진 희소 행렬 (CSR + CSC 배열)
+    """
+
+    def __init__(self, vocab: List[str], token_ids: np.ndarray, tokens: List[str]):
+        self.vocab = vocab
+        self.tokens = tokens
+        self.n_tokens = len(token_ids)
+        self.word_index: Dict[str, int] = {word: i for i, word in enumerate(vocab)}
+        self.word_indptr, self.word_positions = _group_positions(token_ids, len(vocab))
+
+        # 소문자 어휘 (처음 등장 순서 유지)
+        lower_index: Dict[str, int] = {}
+        lower_of = np.fromiter(
+            (lower_index.setdefault(word.lower(), len(lower_index)) for word in vocab),
+            dtype=np.int32, count=len(vocab)
+        )
+        self.lower_vocab = list(lower_index)
+        self.lower_index = lower_index
+        lower_ids = lower_of[token_ids] if len(token_ids) else np.zeros(0, dtype=np.int32)
+        self.lower_indptr, self.lower_positions = _group_positions(lower_ids, len(self.lower_vocab))
+
+        self._build_context_matrix(vocab, token_ids, lower_ids)
+
+    def _build_context_matrix(self, vocab: List[str], token_ids: np.ndarray, lower_ids: np.ndarray):
+        """nltk ContextIndex(filter=isalpha, key=lower)와 같은 문맥으로 단어×문맥 행렬 구성"""
+        n_lower = len(self.lower_vocab)
+        start_id, end_id = n_lower, n_lower + 1
+
+        # nltk와 같이 알파벳 토큰만 남긴 뒤 그 안에서 이웃 단어를 문맥으로 사용
+        is_alpha = np.fromiter((word.isalpha() for word in vocab), dtype=bool, count=len(vocab))
+        mask = is_alpha[token_ids] if len(token_ids) else np.zeros(0, dtype=bool)
+        words = lower_ids[mask].astype(np.int64)
+        left = np.empty_like(words)
+        right = np.empty_like(words)
+        if len(words):
+            left[0], left[1:] = start_id, words[:-1]
+            right[-1], right[:-1] = end_id, words[1:]
+
+        contexts, context_ids = np.unique(left * (n_lower + 2) + right, return_inverse=True)
+        self.n_contexts = len(contexts)
+
+        # (단어, 문맥) 쌍 중복 제거 -> 이진 행렬
+        pairs = np.unique(words * max(self.n_contexts, 1) + context_ids)
+        rows = pairs // max(self.n_contexts, 1)
+        cols = pairs % max(self.n_contexts, 1)
+        # 단어 -> 문맥 (CSR): pairs가 행 우선 정렬이므로 그대로 사용
+        self.context_indptr = np.zeros(n_lower + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_lower), out=self.context_indptr[1:])
+        self.context_indices = cols
+        # 문맥 -> 단어 (CSC)
+        self.context_word_indptr, order = _group_positions(cols, self.n_contexts)
+        self.context_word_indices = rows[order]
+
+    def positions(self, word: str, ignore_case: bool = False) -> np.ndarray:
+        """단어 등장 위치 (오름차순)"""
+        if ignore_case:
+            i = self.lower_index.get(word.lower())
+            if i is None:
+                return self.lower_positions[:0]
+            return self.lower_positions[self.lower_indptr[i]:self.lower_indptr[i + 1]]
+        i = self.word_index.get(word)
+        if i is None:
+            return self.word_positions[:0]
+        return self.word_positions[self.word_indptr[i]:self.word_indptr[i + 1]]
+
+    def concordance(self, word: str, width: int = 80, lines: Optional[int] = 25) -> Dict:
+        """
+        단어 주변 문맥 (nltk ConcordanceIndex.find_concordance와 같은 창 크기/출력 형식)
+
+        왼쪽 문맥은 half_width 폭으로 오른쪽 정렬하므로 질의 단어가 모든 줄에서 같은 열에 옵니다.
+
+        Args:
+            word: 찾을 단어 (대소문자 무시)
+            width: 한 줄 글자 수
+            lines: 반환할 최대 줄 수 (None이면 전체)
+        """
+        offsets = self.positions(word, ignore_case=True)
+        # width가 단어보다 짧으면 좌우 문맥 없이 단어만 출력 ([-0:]은 문자열 전체이므로 0으로 맞춤)
+        half_width = max((width - len(word) - 2) // 2, 0)
+        context = width // 4
+        tokens = self.tokens
+        results = []
+        for i in offsets[:lines].tolist():
+            left_context = tokens[max(0, i - context):i]
+            right_context = tokens[i + 1:i + context]
+            left_text = " ".join(left_context)
+            left_print = left_text[max(len(left_text) - half_width, 0):].rjust(half_width)
+            right_print = " ".join(right_context)[:half_width]
+            results.append({
+                "offset": i,
+                "left": left_context,
+                "query": tokens[i],
+                "right": right_context,
+                "line": " ".join([left_print, tokens[i], right_print])
+            })
+        return {"total_matches": len(offsets), "lines": results}
+
+    def dispersion(self, words: Sequence[str], ignore_case: bool = False) -> Dict[str, List[int]]:
+        """단어별 등장 위치 (dispersion plot 데이터)"""
+        return {word: self.positions(word, ignore_case).tolist() for word in words}
+
+    def similar(self, word: str, num: int = 20) -> List[str]:
+        """
+        같은 문맥(왼쪽, 오른쪽 단어)을 공유하는 단어 (nltk Text.similar와 같은 순위와 동률 순서)
+
+        공유하는 서로 다른 문맥 수가 많은 순, 같으면 말뭉치에서 먼저 등장한 단어 순입니다.
+        """
+        i = self.lower_index.get(word.lower())
+        if i is None:
+            return []
+        contexts = self.context_indices[self.context_indptr[i]:self.context_indptr[i + 1]]
+        if len(contexts) == 0:
+            return []
+        scores = np.bincount(
+            _gather(self.context_word_indptr, self.context_word_indices, contexts),
+            minlength=len(self.lower_vocab)
+        )
+        scores[i] = 0
+        candidates = np.flatnonzero(scores)
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")][:num]
+        return [self.lower_vocab[j] for j in ranked.tolist()]
@@ -4,6 +4,7 @@
 NLTK 자연어 처리 서비스 클래스
 https://datascienceschool.net/view-notebook/118731eec74b4ad3bdd2f89bab077e1b/
 """
+import os
 import nltk
 import matplotlib.pyplot as plt
 from typing import List, Tuple, Dict, Optional
@@ -12,28 +13,31 @@ from nltk.stem import PorterStemmer, LancasterStemmer, WordNetLemmatizer
 from nltk.tag import pos_tag, untag
 from nltk import Text, FreqDist
 from nltk.corpus import gutenberg
+from nltk.corpus import stopwords as nltk_stopwords
 from wordcloud import WordCloud
+from app.nlp.emma.corpus_index import CorpusIndex
+from app.nlp.emma.corpus_analysis import CorpusAnalysis, NAME_STOPWORDS, TOKEN_PATTERN, get_corpus_analysis_cache
+from app.nlp.emma.word_normalizer import get_word_normalizer
+from app.nlp.emma.parallel_tagger import get_parallel_tagger, span_sentence_boundaries
+from app.nlp.nltk_resources import get_nltk_resources
 
 
 class NLTKService:
     """NLTK 자연어 처리 서비스 클래스"""
     
-    def __init__(self, download_resources: bool = True):
+    def __init__(self, check_resources: bool = True):
         """
         초기화
         
+        NLTK 리소스는 내려받지 않고 로컬에 있는지만 확인합니다 (app/nlp/nltk_resources.py).
+        각 기능은 처음 사용할 때 필요한 리소스를 확인하고, 없으면 NLTKResourceMissingError를 발생시킵니다.
+        
         Args:
-            download_resources: NLTK 리소스 다운로드 여부
+            check_resources: 시작 시 없는 리소스를 경고로 기록할지 여부
         """
-        if download_resources:
-            try:
-                nltk.download('book', quiet=True)
-                nltk.download('punkt', quiet=True)
-                nltk.download('averaged_perceptron_tagger', quiet=True)
-                nltk.download('averaged_perceptron_tagger_eng', quiet=True)
-                nltk.download('wordnet', quiet=True)
-            except Exception as e:
-                print(f"Warning: NLTK resource download failed: {e}")
+        self.resources = get_nltk_resources()
+        if check_resources:
+            self.resources.log_missing(["tokenize", "pos_tag", "lemmatize", "gutenberg", "tagset_help", "stopwords"])
         
         self.porter_stemmer = PorterStemmer()
         self.lancaster_stemmer = LancasterStemmer()
@@ -51,11 +55,12 @@ class NLTKService:
         Returns:
             파일 ID 목록
         """
+        self.resources.require("gutenberg")
         return gutenberg.fileids()
     
     def load_corpus_text(self, fileid: str) -> str:
         """
-        말뭉치에서 텍스트 로드
+        말뭉치에서 텍스트 로드 (분석 결과 캐시에 보관된 원문)
         
         Args:
             fileid: 파일 ID (예: "austen-emma.txt")
@@ -63,7 +68,139 @@ class NLTKService:
         Returns:
             원문 텍스트
         """
-        return gutenberg.raw(fileid)
+        return self.get_corpus_analysis(fileid).text
+    
+    def get_corpus_analysis(self, fileid: str, with_tags: bool = False) -> CorpusAnalysis:
+        """
+        말뭉치 파일 분석 결과 (토큰, 빈도 분포, 선택적으로 품사 태그)
+        
+        처음 한 번만 전체 토큰화를 수행하고, 이후에는 메모리 또는 cache/corpus/*.npz에서 가져옵니다.
+        품사 태깅은 with_tags=True로 처음 요청될 때만 수행합니다 (pos_tag 리소스 필요).
+        
+        Args:
+            fileid: 파일 ID (예: "austen-emma.txt")
+            with_tags: 품사 태그(고유명사 추출 등)가 필요한지 여부
+            
+        Returns:
+            CorpusAnalysis 객체
+        """
+        self.resources.require("gutenberg")
+        if fileid not in gutenberg.fileids():
+            raise ValueError(f"말뭉치 파일을 찾을 수 없습니다: {fileid}")
+        
+        cache = get_corpus_analysis_cache()
+        analysis = cache.get(fileid, self.get_corpus_version(fileid), lambda: gutenberg.raw(fileid))
+        if with_tags and not analysis.has_tags:
+            self.resources.require("pos_tag")
+            cache.ensure_tags(analysis)
+        return analysis
+    
+    def get_corpus_index(self, fileid: str) -> CorpusIndex:
+        """
+        말뭉치 파일의 위치 역색인 (파일별로 한 번만 생성)
+        
+        Args:
+            fileid: 파일 ID (예: "austen-emma.txt")
+            
+        Returns:
+            CorpusIndex 객체
+        """
+        return self.get_corpus_analysis(fileid).index
+    
+    def find_corpus_collocations(
+        self,
+        fileid: str,
+        n: int = 2,
+        measure: str = "likelihood_ratio",
+        top_k: int = 20,
+        min_freq: int = 2,
+        min_word_length: int = 3,
+        exclude_stopwords: bool = True
+    ) -> List[Dict]:
+        """
+        말뭉치 파일의 연어와 점수 (기본값은 Text.collocation_list와 같은 필터/순위)
+        
+        Args:
+            fileid: 파일 ID
+            n: 2(바이그램) 또는 3(트라이그램)
+            measure: "likelihood_ratio", "pmi", "t_score"
+            top_k: 반환할 개수
+            min_freq: 최소 빈도
+            min_word_length: 최소 단어 길이
+            exclude_stopwords: 영어 불용어 포함 n-gram 제외 여부
+            
+        Returns:
+            {"ngram", "count", "likelihood_ratio", "pmi", "t_score"} 딕셔너리 리스트
+        """
+        stop = None
+        if exclude_stopwords:
+            self.resources.require("stopwords")
+            stop = nltk_stopwords.words("english")
+        return self.get_corpus_analysis(fileid).ngrams.collocations(
+            n=n,
+            measure=measure,
+            top_k=top_k,
+            min_freq=min_freq,
+            min_word_length=min_word_length,
+            stopwords=stop
+        )
+    
+    def analyze_corpus(
+        self,
+        fileid: str,
+        text_length: Optional[int] = None,
+        extract_names: bool = False
+    ) -> Dict:
+        """
+        말뭉치 파일의 토큰/빈도/고유명사 분석 (분석 결과 캐시 사용)
+        
+        text_length가 있으면 앞부분 토큰과 빈도는 캐시에서 잘라 쓰고,
+        고유명사는 문맥에 따라 품사가 달라질 수 있어 앞부분만 다시 태깅합니다.
+        
+        Args:
+            fileid: 파일 ID
+            text_length: 분석할 텍스트 길이 (None이면 전체)
+            extract_names: 고유명사 빈도 분포 포함 여부
+            
+        Returns:
+            {"text", "tokens", "freq_dist", "names_freq_dist"(선택)} 딕셔너리
+        """
+        analysis = self.get_corpus_analysis(fileid, with_tags=extract_names and not text_length)
+        if text_length:
+            text = analysis.text[:text_length]
+            tokens = analysis.prefix_tokens(text_length)
+            result = {"text": text, "tokens": tokens, "freq_dist": self.create_freq_dist(tokens)}
+            if extract_names:
+                result["names_freq_dist"] = self.extract_names_from_text(text)
+        else:
+            result = {"text": analysis.text, "tokens": analysis.tokens, "freq_dist": analysis.freq_dist}
+            if extract_names:
+                result["names_freq_dist"] = analysis.names_freq_dist()
+        return result
+    
+    def get_corpus_version(self, fileid: str) -> str:
+        """
+        말뭉치 파일 버전 (캐시 키용)
+        
+        텍스트를 읽지 않고 nltk 버전과 파일 크기/수정 시각으로 구분합니다.
+        
+        Args:
+            fileid: 파일 ID (예: "austen-emma.txt")
+            
+        Returns:
+            버전 문자열
+        """
+        self.resources.require("gutenberg")
+        pointer = gutenberg.abspath(fileid)
+        parts = [nltk.__version__, fileid]
+        path = getattr(pointer, "path", None)
+        if path and os.path.isfile(path):
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        else:
+            # zip 안의 말뭉치 등은 경로로만 구분
+            parts.append(str(pointer))
+        return "|".join(parts)
     
     def get_emma_text(self, length: int = 1302) -> str:
         """
@@ -92,6 +229,7 @@ class NLTKService:
         Returns:
             문장 리스트
         """
+        self.resources.require("tokenize")
         return sent_tokenize(text)
     
     def tokenize_words(self, text: str) -> List[str]:
@@ -104,6 +242,7 @@ class NLTKService:
         Returns:
             단어 리스트
         """
+        self.resources.require("tokenize")
         return word_tokenize(text)
     
     def tokenize_regex(self, text: str, pattern: str = r"[\w]+") -> List[str]:
@@ -159,10 +298,32 @@ class NLTKService:
         Returns:
             원형 복원된 단어 리스트
         """
+        self.resources.require("lemmatize")
         if pos:
             return [self.lemmatizer.lemmatize(w, pos=pos) for w in words]
         return [self.lemmatizer.lemmatize(w) for w in words]
     
+    def normalize_batch(
+        self,
+        words: List[str],
+        method: str = "porter",
+        pos: Optional[str] = None
+    ) -> Tuple[List[str], Dict]:
+        """
+        일괄 어간 추출/원형 복원 (중복 제거 + 요청 간 공유 LRU 캐시, 결과는 단어별 처리와 동일)
+        
+        Args:
+            words: 단어 리스트
+            method: "porter", "lancaster", "lemmatize"
+            pos: 원형 복원 시 품사 (예: "v", "n", "a", "r")
+            
+        Returns:
+            (입력 순서대로 처리된 단어 리스트, 처리 통계) 튜플
+        """
+        if method == "lemmatize":
+            self.resources.require("lemmatize")
+        return get_word_normalizer().normalize(words, method, pos)
+    
     # **********
     # POS tagging 메서드
     # **********
@@ -177,6 +338,7 @@ class NLTKService:
         Returns:
             품사 태그 설명
         """
+        self.resources.require("tagset_help")
         return nltk.help.upenn_tagset(tag)
     
     def tag_pos(self, sentence: str) -> List[Tuple[str, str]]:
@@ -189,9 +351,25 @@ class NLTKService:
         Returns:
             (단어, 품사) 튜플 리스트
         """
+        self.resources.require("tokenize", "pos_tag")
         tokens = word_tokenize(sentence)
         return pos_tag(tokens)
     
+    def tag_pos_parallel(self, sentence: str, compare_serial: bool = False) -> Tuple[List[Tuple[str, str]], Dict]:
+        """
+        품사 태깅 (긴 텍스트는 문장 경계로 나눠 병렬 처리, 결과는 tag_pos와 동일)
+        
+        Args:
+            sentence: 입력 텍스트
+            compare_serial: 직렬 태깅과 속도/결과 비교 여부
+            
+        Returns:
+            ((단어, 품사) 튜플 리스트, 태깅 통계) 튜플
+        """
+        self.resources.require("tokenize", "pos_tag")
+        tokens = word_tokenize(sentence)
+        return get_parallel_tagger().tag(tokens, compare_serial=compare_serial)
+    
     def extract_nouns(self, sentence: str) -> List[str]:
         """
         명사만 추출
@@ -369,8 +547,9 @@ class NLTKService:
             고유명사 빈도 분포
         """
         if stopwords is None:
-            stopwords = ["Mr.", "Mrs.", "Miss", "Mr", "Mrs", "Dear"]
+            stopwords = list(NAME_STOPWORDS)
         
+        self.resources.require("pos_tag")
         tokens = self.tokenize_regex(text)
         tagged_tokens = pos_tag(tokens)
         names_list = [
@@ -379,6 +558,36 @@ class NLTKService:
         ]
         return self.create_freq_dist(names_list)
     
+    def extract_names_parallel(
+        self,
+        text: str,
+        stopwords: Optional[List[str]] = None,
+        compare_serial: bool = False
+    ) -> Tuple[FreqDist, Dict]:
+        """
+        고유명사(NNP) 빈도 분포를 병렬로 계산 (결과는 extract_names_from_text와 동일)
+        
+        Args:
+            text: 입력 텍스트
+            stopwords: 제외할 단어 리스트
+            compare_serial: 직렬 태깅과 속도/결과 비교 여부
+            
+        Returns:
+            (고유명사 빈도 분포, 태깅 통계) 튜플
+        """
+        if stopwords is None:
+            stopwords = list(NAME_STOPWORDS)
+        
+        self.resources.require("pos_tag")
+        spans = list(RegexpTokenizer(TOKEN_PATTERN).span_tokenize(text))
+        tokens = [text[start:end] for start, end in spans]
+        return get_parallel_tagger().extract_names(
+            tokens,
+            stopwords,
+            boundaries=span_sentence_boundaries(text, spans),
+            compare_serial=compare_serial
+        )
+    
     # ***********
     # 워드클라우드 관련 메서드
     # ***********
@@ -432,7 +641,9 @@ class NLTKService:
         plot_frequency: bool = False,
         plot_dispersion_words: Optional[List[str]] = None,
         extract_names: bool = False,
-        create_wordcloud: bool = False
+        create_wordcloud: bool = False,
+        parallel_tagging: bool = False,
+        compare_serial: bool = False
     ) -> Dict:
         """
         텍스트 종합 분석
@@ -444,6 +655,8 @@ class NLTKService:
             plot_dispersion_words: 분산도 그래프에 사용할 단어 리스트
             extract_names: 고유명사 추출 여부
             create_wordcloud: 워드클라우드 생성 여부
+            parallel_tagging: 고유명사 추출 시 병렬 품사 태깅 사용 여부
+            compare_serial: 병렬 태깅 시 직렬 태깅과 속도/결과 비교 여부
             
         Returns:
             분석 결과 딕셔너리
@@ -474,7 +687,11 @@ class NLTKService:
         
         # 고유명사 추출
         if extract_names:
-            names_freq = self.extract_names_from_text(text)
+            if parallel_tagging:
+                names_freq, tagging_stats = self.extract_names_parallel(text, compare_serial=compare_serial)
+                result["tagging_stats"] = tagging_stats
+            else:
+                names_freq = self.extract_names_from_text(text)
             result["names_freq_dist"] = names_freq
             result["most_common_names"] = self.get_most_common(names_freq, 10)
         
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+병렬 품사 태깅 엔진
+긴 텍스트의 토큰을 문장 경계에서 나눠 프로세스 풀에서 태깅하고, 결과와 고유명사 빈도 분포를 순서대로 병합
+
+NLTK averaged perceptron 태거는 위치 i의 품사를 앞뒤 2개 단어와 직전 2개 품사로 결정합니다.
+그래서 각 청크를 앞쪽 warmup 토큰과 뒤쪽 2개 토큰을 붙여 태깅하고,
+warmup 끝의 2개 품사가 앞 청크의 실제 품사와 같으면 청크 결과가 직렬 태깅과 동일함이 보장됩니다.
+다르면(드묾) 그 청크만 warmup을 늘려 다시 태깅하며, 최악의 경우 처음부터 태깅하므로 결과는 항상 직렬과 같습니다.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from nltk import FreqDist
+from nltk.tag import pos_tag
+
+logger = logging.getLogger(__name__)
+
+# 청크 앞에 붙여 태거 상태를 맞추는 토큰 수
+WARMUP_TOKENS = 64
+
+# 태거 문맥에 쓰이는 뒤쪽 단어 수 (i+1, i+2)
+LOOKAHEAD_TOKENS = 2
+
+# 이보다 짧은 청크로는 나누지 않음 (프로세스 간 전송 비용 대비 이득이 없음)
+MIN_CHUNK_TOKENS = 20000
+
+# 문장 끝 토큰 (word_tokenize 결과 기준)
+SENTENCE_END_TOKENS = frozenset({".", "!", "?"})
+
+
+def sentence_boundaries(tokens: Sequence[str]) -> List[int]:
+    """문장 끝 토큰 다음 위치 목록 (word_tokenize처럼 구두점이 토큰인 경우)"""
+    return [i + 1 for i, token in enumerate(tokens) if token in SENTENCE_END_TOKENS]
+
+
+def span_sentence_boundaries(text: str, spans: Sequence[Tuple[int, int]]) -> List[int]:
+    """토큰 사이 원문에 문장 끝 구두점이 있는 위치 목록 (정규식 토큰처럼 구두점이 빠진 경우)"""
+    boundaries = []
+    for i in range(1, len(spans)):
+        gap = text[spans[i - 1][1]:spans[i][0]]
+        if "." in gap or "!" in gap or "?" in gap:
+            boundaries.append(i)
+    return boundaries
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스 측
+# ---------------------------------------------------------------------------
+
+# 워커별 태거 (초기화 시 한 번 로드)
+_worker_tagger = None
+
+
+def _init_worker():
+    global _worker_tagger
+    # spawn 워커는 부모의 nltk.data.path 설정을 물려받지 않으므로 서비스 데이터 경로를 다시 등록
+    import app.nlp.nltk_resources  # noqa: F401
+    from nltk.tag.perceptron import PerceptronTagger
+    _worker_tagger = PerceptronTagger()
+
+
+def _tag_chunk(
+    tokens: List[str],
+    warmup: int,
+    core_length: int,
+    stopwords: Optional[Tuple[str, ...]]
+) -> Tuple[List[str], List[str], Optional[FreqDist]]:
+    """
+    청크 태깅 (워커 프로세스에서 실행)
+
+    Returns:
+        (warmup 마지막 2개 품사, 청크 본문 품사, 청크 고유명사 빈도 분포 또는 None) 튜플
+    """
+    tags = [tag for _, tag in _worker_tagger.tag(tokens)]
+    boundary = tags[max(0, warmup - 2):warmup]
+    core = tags[warmup:warmup + core_length]
+    names = None
+    if stopwords is not None:
+        names = _names_freq(tokens[warmup:warmup + core_length], core, stopwords)
+    return boundary, core, names
+
+
+def _names_freq(tokens: Sequence[str], tags: Sequence[str], stopwords: Sequence[str]) -> FreqDist:
+    """NNP 토큰 빈도 분포 (NLTKService.extract_names_from_text와 같은 규칙)"""
+    return FreqDist(token for token, tag in zip(tokens, tags) if tag == "NNP" and token not in stopwords)
+
+
+# ---------------------------------------------------------------------------
+# 부모(API) 프로세스 측
+# ---------------------------------------------------------------------------
+
+class ParallelPosTagger:
+    """
+    프로세스 풀 기반 품사 태깅 엔진
+
+    - 토큰 수가 MIN_CHUNK_TOKENS × 2 미만이면 프로세스를 쓰지 않고 직렬로 태깅합니다.
+    - 프로세스 풀은 처음 병렬 태깅할 때 만들고, 워커마다 태거 모델을 한 번만 로드합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        min_chunk_tokens: int = MIN_CHUNK_TOKENS,
+        warmup: int = WARMUP_TOKENS
+    ):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.min_chunk_tokens = min_chunk_tokens
+        self.warmup = warmup
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tagger = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _get_tagger(self):
+        """부모 프로세스용 태거 (청크 재태깅에 사용)"""
+        if self._tagger is None:
+            from nltk.tag.perceptron import PerceptronTagger
+            self._tagger = PerceptronTagger()
+        return self._tagger
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def plan_chunks(self, n_tokens: int, boundaries: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        청크 구간 [(시작, 끝), ...] 계산
+
+        워커 수만큼 비슷한 크기로 나누되 가능한 한 문장 경계에서 자릅니다.
+        """
+        if n_tokens < self.min_chunk_tokens * 2 or self.max_workers < 2:
+            return [(0, n_tokens)]
+        target = max(self.min_chunk_tokens, math.ceil(n_tokens / self.max_workers))
+        chunks = []
+        start = 0
+        candidates = iter(sorted(boundaries))
+        while n_tokens - start >= target + self.min_chunk_tokens:
+            cut = start + target
+            # 목표 위치 이후 첫 문장 경계 (없으면 목표 위치)
+            for boundary in candidates:
+                if boundary >= cut:
+                    cut = boundary
+                    break
+            if n_tokens - cut < self.min_chunk_tokens:
+                break
+            chunks.append((start, cut))
+            start = cut
+        chunks.append((start, n_tokens))
+        return chunks
+
+    def _retag(self, tokens: Sequence[str], tags: List[str], start: int, end: int) -> List[str]:
+        """
+        앞 청크 품사와 맞을 때까지 warmup을 늘려 [start, end) 구간 재태깅 (부모 프로세스)
+
+        warmup이 시작 위치에 닿으면 처음부터 태깅하는 것과 같으므로 항상 직렬 결과와 일치합니다.
+        """
+        tagger = self._get_tagger()
+        warmup = self.warmup * 4
+        while True:
+            begin = max(0, start - warmup)
+            chunk_tags = [tag for _, tag in tagger.tag(list(tokens[begin:min(len(tokens), end + LOOKAHEAD_TOKENS)]))]
+            offset = start - begin
+            if begin == 0 or chunk_tags[offset - 2:offset] == tags[start - 2:start]:
+                return chunk_tags[offset:offset + end - start]
+            warmup *= 4
+
+    def _tag_parallel(
+        self,
+        tokens: Sequence[str],
+        chunks: List[Tuple[int, int]],
+        stopwords: Optional[Tuple[str, ...]]
+    ) -> Tuple[List[str], Optional[FreqDist], int]:
+        """청크를 워커에 나눠 태깅하고 순서대로 병합 (품사, 고유명사 빈도 분포, 재태깅한 청크 수)"""
+        executor = self._get_executor()
+        futures = []
+        for start, end in chunks:
+            begin = max(0, start - self.warmup)
+            futures.append(executor.submit(
+                _tag_chunk,
+                list(tokens[begin:min(len(tokens), end + LOOKAHEAD_TOKENS)]),
+                start - begin,
+                end - start,
+                stopwords
+            ))
+
+        tags: List[str] = []
+        names = FreqDist() if stopwords is not None else None
+        resynced = 0
+        for (start, end), future in zip(chunks, futures):
+            boundary, core, chunk_names = future.result()
+            if start >= 2 and boundary != tags[start - 2:start]:
+                resynced += 1
+                core = self._retag(tokens, tags, start, end)
+                if stopwords is not None:
+                    chunk_names = _names_freq(tokens[start:end], core, stopwords)
+            tags.extend(core)
+            if names is not None:
+                # 청크 순서대로 병합하므로 처음 등장 순서도 직렬과 같음
+                names.update(chunk_names)
+        return tags, names, resynced
+
+    def _run(
+        self,
+        tokens: Sequence[str],
+        boundaries: Optional[Sequence[int]],
+        stopwords: Optional[Tuple[str, ...]],
+        compare_serial: bool
+    ) -> Tuple[List[str], Optional[FreqDist], Dict]:
+        if boundaries is None:
+            boundaries = sentence_boundaries(tokens)
+        chunks = self.plan_chunks(len(tokens), boundaries)
+
+        started = time.perf_counter()
+        if len(chunks) == 1:
+            tags = [tag for _, tag in pos_tag(list(tokens))]
+            names = _names_freq(tokens, tags, stopwords) if stopwords is not None else None
+            resynced = 0
+        else:
+            tags, names, resynced = self._tag_parallel(tokens, chunks, stopwords)
+        elapsed = time.perf_counter() - started
+
+        stats = {
+            "mode": "parallel" if len(chunks) > 1 else "serial",
+            "workers": self.max_workers if len(chunks) > 1 else 1,
+            "chunks": len(chunks),
+            "tokens": len(tokens),
+            "resynced_chunks": resynced,
+            "elapsed_seconds": round(elapsed, 4),
+        }
+        if compare_serial:
+            started = time.perf_counter()
+            serial_tags = [tag for _, tag in pos_tag(list(tokens))]
+            serial_elapsed = time.perf_counter() - started
+            stats["serial_elapsed_seconds"] = round(serial_elapsed, 4)
+            stats["speedup"] = round(serial_elapsed / elapsed, 2) if elapsed > 0 else None
+            stats["identical"] = serial_tags == tags
+        logger.info(f"[ParallelPosTagger] 태깅 완료: {stats}")
+        return tags, names, stats
+
+    def tag(
+        self,
+        tokens: Sequence[str],
+        boundaries: Optional[Sequence[int]] = None,
+        compare_serial: bool = False
+    ) -> Tuple[List[Tuple[str, str]], Dict]:
+        """
+        pos_tag(tokens)와 같은 결과를 병렬로 계산
+
+        Args:
+            tokens: 토큰 리스트
+            boundaries: 청크를 나눌 수 있는 위치 (None이면 문장 끝 구두점 토큰 기준)
+            compare_serial: True이면 직렬 태깅도 실행해 속도 향상과 결과 일치 여부를 함께 반환
+
+        Returns:
+            ((단어, 품사) 리스트, 실행 통계) 튜플
+        """
+        tags, _, stats = self._run(tokens, boundaries, None, compare_serial)
+        return list(zip(tokens, tags)), stats
+
+    def extract_names(
+        self,
+        tokens: Sequence[str],
+        stopwords: Sequence[str],
+        boundaries: Optional[Sequence[int]] = None,
+        compare_serial: bool = False
+    ) -> Tuple[FreqDist, Dict]:
+        """
+        고유명사(NNP) 빈도 분포를 병렬로 계산 (청크별 FreqDist를 순서대로 병합)
+
+        Returns:
+            (고유명사 빈도 분포, 실행 통계) 튜플
+        """
+        _, names, stats = self._run(tokens, boundaries, tuple(stopwords), compare_serial)
+        return names, stats
+
+
+# 엔진 싱글톤
+_parallel_tagger: Optional[ParallelPosTagger] = None
+
+
+def get_parallel_tagger() -> ParallelPosTagger:
+    """병렬 태깅 엔진 인스턴스 싱글톤 패턴"""
+    global _parallel_tagger
+    if _parallel_tagger is None:
+        _parallel_tagger = ParallelPosTagger()
+    return _parallel_tagger
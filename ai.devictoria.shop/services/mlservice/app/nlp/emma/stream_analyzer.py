@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+스트리밍 텍스트 분석
+업로드 본문을 조각(chunk) 단위로 받아 토큰화하면서 단어/바이그램 빈도를 누적
+
+- 조각 경계에서 잘린 토큰(과 UTF-8 멀티바이트 문자)은 다음 조각으로 넘겨 이어 붙입니다.
+- 빈도 카운터는 항목 수 상한이 있어 문서 크기와 관계없이 메모리가 일정 수준을 넘지 않습니다.
+  상한을 넘으면 빈도가 낮은 항목을 버리고, 그로 인해 생길 수 있는 최대 과소 집계량(max_error)을 누적해 보고합니다.
+"""
+import codecs
+import heapq
+import re
+from operator import itemgetter
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from app.nlp.emma.corpus_analysis import TOKEN_PATTERN
+
+# 카운터별 최대 항목 수
+MAX_WORD_ENTRIES = 200_000
+MAX_BIGRAM_ENTRIES = 500_000
+
+# 공백 없이 이어지는 토큰의 최대 길이 (넘으면 잘라서 집계, 이월 버퍼가 무한히 커지지 않도록)
+MAX_TOKEN_LENGTH = 1 << 16
+
+
+class BoundedCounter:
+    """
+    항목 수 상한이 있는 빈도 카운터
+
+    항목 수가 capacity를 넘으면 빈도 순위 상위 capacity // 2개만 남기고 나머지를 버립니다
+    (동률이어도 개수 기준으로 자르므로 카운터가 통째로 비지 않음).
+    정리할 때마다 버린 항목의 빈도 최댓값을 max_error에 더합니다. 한 항목이 여러 번 버려졌다가
+    다시 나타나도 잃은 빈도는 매번 그 시점의 최댓값 이하이므로, 모든 항목의 실제 빈도는
+    [보고된 빈도, 보고된 빈도 + max_error] 범위에 있습니다 (카운터에 없는 항목은 보고된 빈도 0).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.max_error = 0
+
+    def update(self, items: Iterable[Hashable]):
+        self.counts.update(items)
+        if len(self.counts) > self.capacity:
+            self._prune()
+
+    def _prune(self):
+        keep = self.capacity // 2
+        top = heapq.nlargest(keep + 1, self.counts.items(), key=itemgetter(1))
+        # keep + 1번째 항목의 빈도 = 버리는 항목 중 최대 빈도
+        self.max_error += top[-1][1]
+        self.counts = Counter(dict(top[:keep]))
+
+    def most_common(self, n: int) -> List[Tuple[Hashable, int]]:
+        return self.counts.most_common(n)
+
+
+class StreamingTextAnalyzer:
+    """
+    조각 단위 토큰화 + 단어/바이그램 빈도 누적
+
+    토큰화 규칙은 NLTKService.tokenize_regex 기본 패턴과 같으므로,
+    본문 전체를 한 번에 tokenize_regex 한 결과와 같은 토큰 열을 집계합니다.
+    """
+
+    def __init__(
+        self,
+        lowercase: bool = False,
+        encoding: str = "utf-8",
+        max_words: int = MAX_WORD_ENTRIES,
+        max_bigrams: int = MAX_BIGRAM_ENTRIES
+    ):
+        self.lowercase = lowercase
+        self._pattern = re.compile(TOKEN_PATTERN)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._carry = ""
+        self._prev_token: Optional[str] = None
+        self.words = BoundedCounter(max_words)
+        self.bigrams = BoundedCounter(max_bigrams)
+        self.total_tokens = 0
+        self.total_bytes = 0
+        self.chunks = 0
+
+    def feed(self, data: bytes):
+        """본문 조각 처리 (마지막 토큰이 조각 끝에 걸려 있으면 다음 조각으로 이월)"""
+        self.total_bytes += len(data)
+        self.chunks += 1
+        text = self._carry + self._decoder.decode(data)
+        self._carry = ""
+
+        tokens = []
+        last_end = 0
+        for match in self._pattern.finditer(text):
+            tokens.append(match.group())
+            last_end = match.end()
+        if tokens and last_end == len(text) and len(tokens[-1]) < MAX_TOKEN_LENGTH:
+            self._carry = tokens.pop()
+        self._count(tokens)
+
+    def finish(self):
+        """남은 이월 토큰과 디코더 버퍼 처리"""
+        text = self._carry + self._decoder.decode(b"", final=True)
+        self._carry = ""
+        self._count(self._pattern.findall(text))
+
+    def _count(self, tokens: List[str]):
+        if not tokens:
+            return
+        if self.lowercase:
+            tokens = [token.lower() for token in tokens]
+        self.words.update(tokens)
+        # 이전 조각의 마지막 토큰과 이어지는 바이그램 포함
+        sequence = [self._prev_token] + tokens if self._prev_token is not None else tokens
+        self.bigrams.update(zip(sequence, sequence[1:]))
+        self._prev_token = tokens[-1]
+        self.total_tokens += len(tokens)
+
+    def result(self, top_k: int = 20, min_word_length: int = 1) -> Dict:
+        """
+        상위 k개 단어/바이그램
+
+        Args:
+            top_k: 반환할 개수
+            min_word_length: 바이그램의 두 단어가 모두 이 길이 이상인 것만 포함
+        """
+        bigrams = (
+            (pair, count) for pair, count in self.bigrams.counts.items()
+            if len(pair[0]) >= min_word_length and len(pair[1]) >= min_word_length
+        )
+        return {
+            "total_bytes": self.total_bytes,
+            "chunks": self.chunks,
+            "total_tokens": self.total_tokens,
+            "vocabulary_size": len(self.words.counts),
+            "most_common": self.words.most_common(top_k),
+            "most_common_bigrams": [
+                {"bigram": " ".join(pair), "count": count}
+                # nsmallest는 동률일 때 먼저 집계된 순서를 유지 (Counter.most_common과 동일)
+                for pair, count in heapq.nsmallest(top_k, bigrams, key=lambda item: -item[1])
+            ],
+            # 0이면 정확한 빈도, 0보다 크면 각 빈도가 최대 이만큼 적게 집계되었을 수 있음 (정리 시마다 누적)
+            "max_error": {"words": self.words.max_error, "bigrams": self.bigrams.max_error}
+        }
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+일괄 어간 추출 / 원형 복원 엔진
+입력 단어를 중복 제거한 뒤 요청 간에 공유되는 LRU 캐시를 먼저 확인하고,
+캐시에 없는 단어만 계산(많으면 프로세스 풀로 분산)해서 원래 순서대로 돌려줌
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from nltk.stem import LancasterStemmer, PorterStemmer, WordNetLemmatizer
+
+logger = logging.getLogger(__name__)
+
+NORMALIZE_METHODS = ("porter", "lancaster", "lemmatize")
+
+# LRU 캐시 최대 항목 수 ((방법, 품사, 단어) 단위)
+CACHE_SIZE = 200_000
+
+# 캐시에 없는 고유 단어가 이보다 많으면 프로세스 풀로 분산
+PARALLEL_THRESHOLD = 50_000
+
+# 워커 하나에 보내는 최소 단어 수
+MIN_CHUNK_WORDS = 10_000
+
+
+def _make_normalizers() -> Dict[str, object]:
+    return {
+        "porter": PorterStemmer(),
+        "lancaster": LancasterStemmer(),
+        "lemmatize": WordNetLemmatizer(),
+    }
+
+
+def _apply(normalizer, method: str, words: Sequence[str], pos: Optional[str]) -> List[str]:
+    """NLTKService.stem_porter / stem_lancaster / lemmatize와 같은 호출"""
+    if method == "lemmatize":
+        if pos:
+            return [normalizer.lemmatize(w, pos=pos) for w in words]
+        return [normalizer.lemmatize(w) for w in words]
+    return [normalizer.stem(w) for w in words]
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스 측
+# ---------------------------------------------------------------------------
+
+# 워커별 형태소 분석기 (초기화 시 한 번 생성)
+_worker_normalizers: Dict[str, object] = {}
+
+
+def _init_worker():
+    global _worker_normalizers
+    # spawn 워커에도 서비스 NLTK 데이터 경로 등록 (wordnet)
+    import app.nlp.nltk_resources  # noqa: F401
+    _worker_normalizers = _make_normalizers()
+
+
+def _normalize_chunk(method: str, words: List[str], pos: Optional[str]) -> List[str]:
+    return _apply(_worker_normalizers[method], method, words, pos)
+
+
+# ---------------------------------------------------------------------------
+# 부모(API) 프로세스 측
+# ---------------------------------------------------------------------------
+
+class LRUCache:
+    """스레드 안전 LRU 캐시 (여러 키를 한 번의 잠금으로 조회/저장)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Tuple[str, Optional[str], str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[Tuple[str, Optional[str], str]]) -> Dict[Tuple[str, Optional[str], str], str]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._data.get(key)
+                if value is not None:
+                    self._data.move_to_end(key)
+                    found[key] = value
+        return found
+
+    def put_many(self, items: Dict[Tuple[str, Optional[str], str], str]):
+        with self._lock:
+            self._data.update(items)
+            for key in items:
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class WordNormalizer:
+    """
+    일괄 형태소 정규화 엔진
+
+    - 같은 단어는 요청 안에서 한 번만, 요청 간에는 LRU 캐시에 있으면 다시 계산하지 않습니다.
+    - 캐시에 없는 고유 단어가 PARALLEL_THRESHOLD 이상이면 프로세스 풀에서 나눠 계산합니다.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = CACHE_SIZE,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        max_workers: Optional[int] = None
+    ):
+        self.cache = LRUCache(cache_size)
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._normalizers = _make_normalizers()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _compute(self, method: str, words: List[str], pos: Optional[str]) -> Tuple[List[str], bool]:
+        """캐시에 없는 고유 단어 계산 (결과, 병렬 처리 여부)"""
+        if len(words) < self.parallel_threshold or self.max_workers < 2:
+            return _apply(self._normalizers[method], method, words, pos), False
+
+        size = max(MIN_CHUNK_WORDS, math.ceil(len(words) / self.max_workers))
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_normalize_chunk, method, words[i:i + size], pos)
+            for i in range(0, len(words), size)
+        ]
+        results: List[str] = []
+        for future in futures:
+            results.extend(future.result())
+        return results, True
+
+    def normalize(
+        self,
+        words: Sequence[str],
+        method: str,
+        pos: Optional[str] = None
+    ) -> Tuple[List[str], Dict]:
+        """
+        단어 목록 정규화 (입력 순서와 길이 유지)
+
+        Args:
+            words: 단어 리스트 (중복 가능)
+            method: "porter", "lancaster", "lemmatize"
+            pos: 원형 복원 시 품사 (예: "v", "n")
+
+        Returns:
+            (정규화된 단어 리스트, 처리 통계) 튜플
+        """
+        if method not in NORMALIZE_METHODS:
+            raise ValueError(f"지원하지 않는 형태소 분석 방법입니다: {method}")
+        if method != "lemmatize":
+            pos = None
+
+        started = time.perf_counter()
+        unique_words = list(dict.fromkeys(words))
+        keys = [(method, pos, word) for word in unique_words]
+        mapping = {key[2]: value for key, value in self.cache.get_many(keys).items()}
+        misses = [word for word in unique_words if word not in mapping]
+
+        parallel = False
+        if misses:
+            computed, parallel = self._compute(method, misses, pos)
+            mapping.update(zip(misses, computed))
+            self.cache.put_many({(method, pos, word): value for word, value in zip(misses, computed)})
+
+        stats = {
+            "total_words": len(words),
+            "unique_words": len(unique_words),
+            "cache_hits": len(unique_words) - len(misses),
+            "computed": len(misses),
+            "parallel": parallel,
+            "cache_size": len(self.cache),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        return [mapping[word] for word in words], stats
+
+
+# 엔진 싱글톤
+_word_normalizer: Optional[WordNormalizer] = None
+
+
+def get_word_normalizer() -> WordNormalizer:
+    """정규화 엔진 인스턴스 싱글톤 패턴"""
+    global _word_normalizer
+    if _word_normalizer is None:
+        _word_normalizer = WordNormalizer()
+    return _word_normalizer
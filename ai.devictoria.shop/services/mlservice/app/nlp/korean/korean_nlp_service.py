@@ -32,7 +32,8 @@ class KoreanNLPService:
             
         try:
             from kiwipiepy import Kiwi
-            self._kiwi = Kiwi()
+            # num_workers=0: 가용 코어 수만큼 스레드 사용 (tokenize_batch의 일괄 분석에 적용)
+            self._kiwi = Kiwi(num_workers=0)
             print("[Korean NLP] Kiwi 형태소 분석기 초기화 완료")
         except ImportError:
             print("[Korean NLP] kiwipiepy가 설치되지 않았습니다. pip install kiwipiepy")
@@ -130,6 +131,53 @@ class KoreanNLPService:
         
         return tokens
     
+    def tokenize_batch(
+        self,
+        texts: List[str],
+        pos_tags: Optional[List[str]] = None,
+        min_length: int = 2,
+        remove_stopwords: bool = True,
+        with_tag: bool = False
+    ) -> List[List[str]]:
+        """
+        여러 텍스트 일괄 토큰화
+        
+        Kiwi에 텍스트 목록을 한 번에 넘겨 내부 스레드 풀에서 병렬 분석합니다.
+        결과 순서는 입력 순서와 같습니다.
+        
+        Args:
+            texts: 입력 텍스트 목록
+            pos_tags: 추출할 품사 태그 (None이면 모든 명사: NNG, NNP, NNB)
+            min_length: 최소 토큰 길이
+            remove_stopwords: 불용어 제거 여부
+            with_tag: True이면 "형태소/품사" 형태로 반환 (예: "맑/VA")
+        
+        Returns:
+            텍스트별 토큰 리스트
+        """
+        if not self._kiwi:
+            raise RuntimeError("Kiwi 형태소 분석기가 초기화되지 않았습니다.")
+        if not texts:
+            return []
+        
+        tag_set = set(pos_tags) if pos_tags is not None else {'NNG', 'NNP', 'NNB'}
+        stopwords = self.stopwords if remove_stopwords else set()
+        
+        results = []
+        for result in self._kiwi.tokenize(list(texts)):
+            tokens = []
+            for token in result:
+                # 용언의 규칙/불규칙 활용 표시(VV-R, VA-I 등)는 기본 품사로 묶음
+                tag = token.tag.split('-', 1)[0]
+                if tag not in tag_set:
+                    continue
+                word = token.form
+                if len(word) < min_length or word in stopwords:
+                    continue
+                tokens.append(f"{word}/{tag}" if with_tag else word)
+            results.append(tokens)
+        return results
+    
     def create_bow(
         self,
         text: str,
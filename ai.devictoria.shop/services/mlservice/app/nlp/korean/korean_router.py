@@ -3,18 +3,19 @@
 """
 import base64
 import hashlib
-import io
 from pathlib import Path
 from typing import List, Dict, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 
+from app.nlp.nlp_cache import cache_key, file_version, get_nlp_result_cache, image_url
+from app.nlp.wordcloud_renderer import render_wordcloud_png
 from .korean_nlp_service import get_korean_nlp_service
 
+# 불용어 파일 (바뀌면 BoW가 달라지므로 캐시 키에 포함)
+STOPWORDS_PATH = Path(__file__).parent.parent / "data" / "stopwords.txt"
+
 # 라우터 생성
 router = APIRouter(
     prefix="/korean",
@@ -55,6 +56,7 @@ class WordCloudRequest(BaseModel):
     height: int = 600
     background_color: str = "white"
     font_path: Optional[str] = None
+    embed_image: bool = False  # True이면 응답에 base64 이미지 포함
 
 
 @router.get("/")
@@ -158,22 +160,17 @@ async def analyze_pos(text: str):
 
 
 @router.post("/wordcloud")
-async def create_wordcloud(request: WordCloudRequest):
-    """한국어 워드클라우드 생성"""
+def create_wordcloud(request: WordCloudRequest):
+    """
+    한국어 워드클라우드 생성
+    
+    결과는 (텍스트 해시 + 파라미터 + 불용어 파일 버전) 캐시 키로 저장되어,
+    같은 요청은 형태소 분석과 워드클라우드 배치를 건너뜁니다.
+    이미지는 wordcloud_url(ETag 지원)로 받고, embed_image=true이면 base64로도 포함합니다.
+    """
     try:
         service = get_korean_nlp_service()
-        
-        # BoW 생성
-        bow = service.create_bow(
-            text=request.text,
-            pos_tags=request.pos_tags,
-            min_length=request.min_length,
-            remove_stopwords=request.remove_stopwords,
-            top_n=request.top_n
-        )
-        
-        if not bow:
-            raise HTTPException(status_code=400, detail="추출된 단어가 없습니다.")
+        cache = get_nlp_result_cache()
         
         # 한글 폰트 경로 설정 (없으면 기본 폰트 사용)
         font_path = request.font_path
@@ -187,61 +184,61 @@ async def create_wordcloud(request: WordCloudRequest):
                 # Docker 컨테이너 내부라면 사전에 설치된 폰트 사용
                 font_path = '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
         
-        # 워드클라우드 생성
-        wc = WordCloud(
-            width=request.width,
-            height=request.height,
-            background_color=request.background_color,
-            font_path=font_path,
-            relative_scaling=0.2,
-            min_font_size=10,
-            random_state=42
-        ).generate_from_frequencies(bow)
-        
-        # save 폴더에 워드클라우드 이미지 저장
-        save_dir = Path(__file__).parent.parent / "save"
-        save_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일명 생성
-        params_str = f"{request.top_n}_{request.width}_{request.height}_{request.background_color}"
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
-        filename = f"korean_wordcloud_{params_hash}.png"
-        filepath = save_dir / filename
+        params = request.model_dump(exclude={"text", "font_path", "embed_image"})
+        params["text_sha256"] = hashlib.sha256(request.text.encode("utf-8")).hexdigest()
+        params["font_path"] = font_path
+        key = cache_key("korean", params, file_version(STOPWORDS_PATH, Path(font_path)))
         
-        # 이미 파일이 존재하면 재사용
-        if filepath.exists():
-            with open(filepath, 'rb') as f:
-                img_data = f.read()
-            img_base64 = base64.b64encode(img_data).decode('utf-8')
-        else:
-            # 새로 생성
-            plt.figure(figsize=(request.width/100, request.height/100))
-            plt.imshow(wc, interpolation='bilinear')
-            plt.axis("off")
-            plt.tight_layout(pad=0)
+        def compute():
+            # BoW 생성
+            bow = service.create_bow(
+                text=request.text,
+                pos_tags=request.pos_tags,
+                min_length=request.min_length,
+                remove_stopwords=request.remove_stopwords,
+                top_n=request.top_n
+            )
             
-            # 파일로 저장
-            plt.savefig(filepath, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
+            if not bow:
+                raise HTTPException(status_code=400, detail="추출된 단어가 없습니다.")
             
-            # base64 인코딩
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
-            plt.close()
+            # 워드클라우드 생성
+            wc = WordCloud(
+                width=request.width,
+                height=request.height,
+                background_color=request.background_color,
+                font_path=font_path,
+                relative_scaling=0.2,
+                min_font_size=10,
+                random_state=42
+            ).generate_from_frequencies(bow)
             
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-            img_buffer.close()
+            return {"vocabulary_size": len(bow)}, render_wordcloud_png(wc), f"korean_wordcloud_{key}.png"
         
-        return {
+        cached, cache_hit = cache.get_or_compute("korean", key, compute)
+        filepath = cache.image_path(cached["image_file"])
+        
+        result = {
             "status": "success",
-            "vocabulary_size": len(bow),
-            "wordcloud_image": f"data:image/png;base64,{img_base64}",
+            "vocabulary_size": cached["stats"]["vocabulary_size"],
+            "wordcloud_url": image_url("korean", key),
             "wordcloud_file": str(filepath),
-            "wordcloud_filename": filename,
+            "wordcloud_filename": cached["image_file"],
             "wordcloud_width": request.width,
-            "wordcloud_height": request.height
+            "wordcloud_height": request.height,
+            "cache_key": key,
+            "cache_hit": cache_hit
         }
         
+        if request.embed_image:
+            with open(filepath, 'rb') as f:
+                img_base64 = base64.b64encode(f.read()).decode('utf-8')
+            result["wordcloud_image"] = f"data:image/png;base64,{img_base64}"
+        
+        return result
+        
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
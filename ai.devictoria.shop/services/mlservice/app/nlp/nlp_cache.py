@@ -0,0 +1,166 @@
+"""
+NLP 분석 결과 캐시
+분석 통계(JSON)와 워드클라우드 이미지(PNG)를 save/ 폴더에 캐시 키 단위로 저장하고,
+같은 키의 동시 요청은 한 번만 계산(coalescing)
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 캐시 파일 저장 디렉토리
+SAVE_DIR = Path(__file__).parent / "save"
+
+# 분석/렌더링 로직이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = "2"
+
+# 캐시 이미지 제공 경로 (nlp_router의 이미지 라우트)
+IMAGE_URL_PREFIX = "/nlp/images"
+
+# compute 함수 반환값: (통계 딕셔너리, PNG 바이트, 이미지 파일명)
+ComputeResult = Tuple[Dict[str, Any], bytes, str]
+
+
+def cache_key(namespace: str, params: Dict[str, Any], corpus_version: str) -> str:
+    """파라미터 + 말뭉치 버전 + 캐시 버전으로 캐시 키 생성"""
+    payload = json.dumps(
+        {"namespace": namespace, "params": params, "corpus": corpus_version, "version": CACHE_VERSION},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_version(*paths: Path) -> str:
+    """입력 파일들의 이름/크기/수정 시각 (캐시 키의 말뭉치 버전용, 파일 내용은 읽지 않음)"""
+    parts = []
+    for path in paths:
+        path = Path(path)
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        else:
+            parts.append(f"{path.name}:missing")
+    return "|".join(parts)
+
+
+def image_url(namespace: str, key: str) -> str:
+    """캐시된 워드클라우드 이미지 URL (키가 내용을 결정하므로 URL별 이미지는 바뀌지 않음)"""
+    return f"{IMAGE_URL_PREFIX}/{namespace}/{key}.png"
+
+
+def write_atomic(path: Path, data: bytes):
+    """임시 파일에 기록 후 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class NLPResultCache:
+    """
+    워드클라우드 분석 결과 캐시
+
+    - save/<namespace>_<key>.json: 분석 통계 + 이미지 파일명
+    - save/<이미지 파일명>: 워드클라우드 PNG
+    JSON은 이미지를 쓴 뒤에 기록하므로, JSON이 있으면 이미지도 완성된 상태입니다.
+    """
+
+    def __init__(self, save_dir: Path = SAVE_DIR):
+        self.save_dir = save_dir
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _meta_path(self, namespace: str, key: str) -> Path:
+        return self.save_dir / f"{namespace}_{key}.json"
+
+    def image_path(self, filename: str) -> Path:
+        return self.save_dir / filename
+
+    def load(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 결과 조회 (JSON 또는 이미지가 없으면 None)"""
+        meta_path = self._meta_path(namespace, key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if not self.image_path(meta["image_file"]).exists():
+            return None
+        return meta
+
+    def store(self, namespace: str, key: str, stats: Dict[str, Any], image: bytes, filename: str) -> Dict[str, Any]:
+        """결과 저장 (이미지 -> JSON 순서)"""
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.image_path(filename), image)
+        meta = {"cache_key": key, "image_file": filename, "stats": stats}
+        write_atomic(
+            self._meta_path(namespace, key),
+            json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        )
+        return meta
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], ComputeResult]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        캐시 조회 후 없으면 계산
+
+        같은 키로 동시에 들어온 요청은 먼저 온 요청의 계산 결과를 기다려 함께 사용합니다.
+
+        Returns:
+            ({"cache_key", "image_file", "stats"} 딕셔너리, 캐시 적중 여부) 튜플
+        """
+        cached = self.load(namespace, key)
+        if cached is not None:
+            return cached, True
+
+        inflight_key = f"{namespace}:{key}"
+        with self._lock:
+            future = self._inflight.get(inflight_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[inflight_key] = future
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            # 대기열 등록 직전에 다른 요청이 계산을 끝냈을 수 있음
+            meta = self.load(namespace, key)
+            hit = meta is not None
+            if meta is None:
+                stats, image, filename = compute()
+                meta = self.store(namespace, key, stats, image, filename)
+            future.set_result(meta)
+            return meta, hit
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(inflight_key, None)
+
+
+# 캐시 싱글톤
+_result_cache: Optional[NLPResultCache] = None
+
+
+def get_nlp_result_cache() -> NLPResultCache:
+    """결과 캐시 인스턴스 싱글톤 패턴"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = NLPResultCache()
+    return _result_cache
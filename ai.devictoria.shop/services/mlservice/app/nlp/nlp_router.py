@@ -2,19 +2,21 @@
 NLTK 자연어 처리 라우터
 """
 import base64
-import hashlib
-import io
-from datetime import datetime
-from pathlib import Path
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, Response
+import time
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
 from typing import List, Dict, Optional
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import matplotlib
 matplotlib.use('Agg')  # GUI 백엔드 사용 안 함
-import matplotlib.pyplot as plt
 
+from app.nlp.emma.collocations import MEASURES as COLLOCATION_MEASURES
 from app.nlp.emma.emma_wordcloud import NLTKService
+from app.nlp.emma.stream_analyzer import StreamingTextAnalyzer
+from app.nlp.nltk_resources import NLTKResourceMissingError, get_nltk_resources
+from app.nlp.nlp_cache import cache_key, get_nlp_result_cache, image_url
+from app.nlp.wordcloud_renderer import render_wordcloud_png
 
 # 라우터 생성
 router = APIRouter(
@@ -23,6 +25,12 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+# 캐시 이미지는 키가 같으면 내용도 같으므로 1년간 재검증 없이 캐시
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 스트리밍 분석 시 스레드풀로 넘기는 본문 묶음 크기 (서버가 주는 작은 조각을 모아서 처리)
+STREAM_BATCH_BYTES = 1 << 20
+
 # 서비스 인스턴스
 _nltk_service: Optional[NLTKService] = None
 
@@ -45,6 +53,7 @@ class StemRequest(BaseModel):
     words: List[str]
     method: str = "porter"  # "porter", "lancaster", "lemmatize"
     pos: Optional[str] = None
+    batch: bool = False  # 중복 제거 + 공유 캐시 + 대량 입력 병렬 처리
 
 
 class AnalyzeTextRequest(BaseModel):
@@ -54,6 +63,8 @@ class AnalyzeTextRequest(BaseModel):
     plot_dispersion_words: Optional[List[str]] = None
     extract_names: bool = False
     create_wordcloud: bool = False
+    parallel_tagging: bool = True  # 고유명사 추출 시 병렬 품사 태깅
+    compare_serial: bool = False  # 직렬 태깅과 속도/결과 비교
 
 
 @router.get("/")
@@ -68,11 +79,27 @@ async def root():
             "stem": "/nlp/stem - 형태소 분석",
             "pos_tag": "/nlp/pos-tag - 품사 태깅",
             "analyze": "/nlp/analyze - 텍스트 종합 분석",
-            "emma": "/nlp/emma - 엠마 텍스트 분석 및 워드클라우드 생성 (GET)"
+            "analyze_stream": "/nlp/analyze/stream - 대용량 문서 스트리밍 분석 (요청 본문에 원문)",
+            "emma": "/nlp/emma - 엠마 텍스트 분석 및 워드클라우드 생성 (GET)",
+            "images": "/nlp/images/{namespace}/{key}.png - 캐시된 워드클라우드 이미지 (ETag 지원)",
+            "concordance": "/nlp/corpus/{fileid}/concordance - 단어 주변 문맥",
+            "dispersion": "/nlp/corpus/{fileid}/dispersion - 단어별 등장 위치",
+            "similar": "/nlp/corpus/{fileid}/similar - 같은 문맥의 단어",
+            "collocations": "/nlp/corpus/{fileid}/collocations - 연어와 PMI/likelihood ratio/t-score",
+            "resources": "/nlp/resources - 로컬 NLTK 리소스 상태"
         }
     }
 
 
+@router.get("/resources")
+def get_nltk_resource_status():
+    """로컬 NLTK 리소스/기능별 사용 가능 여부 (네트워크 접근 없음)"""
+    return {
+        "status": "success",
+        **get_nltk_resources().status()
+    }
+
+
 @router.get("/corpus")
 async def get_corpus_fileids():
     """말뭉치 파일 ID 목록 조회"""
@@ -84,28 +111,164 @@ async def get_corpus_fileids():
             "count": len(fileids),
             "fileids": fileids
         }
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"말뭉치 조회 중 오류 발생: {str(e)}")
 
 
 @router.get("/corpus/{fileid}")
-async def get_corpus_text(fileid: str, length: Optional[int] = None):
-    """말뭉치 텍스트 조회"""
+def get_corpus_text(fileid: str, length: Optional[int] = None):
+    """
+    말뭉치 텍스트 조회
+    
+    원문과 토큰/어휘 수는 말뭉치 분석 결과 캐시에서 가져옵니다.
+    """
     try:
         service = get_nltk_service()
-        text = service.load_corpus_text(fileid)
+        analysis = service.get_corpus_analysis(fileid)
+        text = analysis.text
         if length:
             text = text[:length]
         return {
             "status": "success",
             "fileid": fileid,
             "text_length": len(text),
+            "total_tokens": len(analysis.token_ids),
+            "vocabulary_size": len(analysis.vocab),
             "text": text
         }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"말뭉치 텍스트 조회 중 오류 발생: {str(e)}")
 
 
+@router.get("/corpus/{fileid}/concordance")
+def get_concordance(fileid: str, word: str, width: int = 80, lines: int = 25):
+    """
+    단어 주변 문맥 (nltk concordance와 같은 창, 대소문자 무시)
+    
+    말뭉치 파일별 위치 역색인에서 등장 위치를 바로 찾으므로 토큰 전체를 다시 훑지 않습니다.
+    """
+    try:
+        index = get_nltk_service().get_corpus_index(fileid)
+        started = time.perf_counter()
+        result = index.concordance(word, width=width, lines=lines)
+        return {
+            "status": "success",
+            "fileid": fileid,
+            "word": word,
+            **result,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"문맥 조회 중 오류 발생: {str(e)}")
+
+
+@router.get("/corpus/{fileid}/dispersion")
+def get_dispersion(fileid: str, words: List[str] = Query(...), ignore_case: bool = False):
+    """
+    단어별 등장 위치 (dispersion plot 데이터, 그래프 대신 JSON으로 반환)
+    """
+    try:
+        index = get_nltk_service().get_corpus_index(fileid)
+        started = time.perf_counter()
+        positions = index.dispersion(words, ignore_case=ignore_case)
+        return {
+            "status": "success",
+            "fileid": fileid,
+            "total_tokens": index.n_tokens,
+            "positions": positions,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분산도 조회 중 오류 발생: {str(e)}")
+
+
+@router.get("/corpus/{fileid}/similar")
+def get_similar_words(fileid: str, word: str, num: int = 20):
+    """
+    같은 문맥에서 쓰인 단어 (nltk Text.similar와 같은 순위)
+    """
+    try:
+        index = get_nltk_service().get_corpus_index(fileid)
+        started = time.perf_counter()
+        similar = index.similar(word, num=num)
+        return {
+            "status": "success",
+            "fileid": fileid,
+            "word": word,
+            "similar_words": similar,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"유사 단어 조회 중 오류 발생: {str(e)}")
+
+
+@router.get("/corpus/{fileid}/collocations")
+def get_collocations(
+    fileid: str,
+    n: int = Query(2, ge=2, le=3),
+    measure: str = "likelihood_ratio",
+    top_k: int = 20,
+    min_freq: int = 2,
+    min_word_length: int = 3,
+    exclude_stopwords: bool = True
+):
+    """
+    연어(collocation)와 점수 (PMI, likelihood ratio, t-score)
+    
+    말뭉치 분석 결과의 정수 토큰 배열에서 n-gram을 numpy로 세며, 빈도 표는 파일별로 한 번만 만듭니다.
+    기본값은 nltk Text.collocation_list와 같은 필터와 순위입니다.
+    """
+    if measure not in COLLOCATION_MEASURES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 점수입니다: {measure} (가능: {', '.join(COLLOCATION_MEASURES)})"
+        )
+    try:
+        service = get_nltk_service()
+        started = time.perf_counter()
+        collocations = service.find_corpus_collocations(
+            fileid,
+            n=n,
+            measure=measure,
+            top_k=top_k,
+            min_freq=min_freq,
+            min_word_length=min_word_length,
+            exclude_stopwords=exclude_stopwords
+        )
+        return {
+            "status": "success",
+            "fileid": fileid,
+            "n": n,
+            "measure": measure,
+            "collocations": collocations,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"연어 조회 중 오류 발생: {str(e)}")
+
+
 @router.post("/tokenize")
 async def tokenize_text(request: TokenizeRequest):
     """텍스트 토큰화"""
@@ -127,16 +290,35 @@ async def tokenize_text(request: TokenizeRequest):
             "token_count": len(tokens),
             "tokens": tokens
         }
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"토큰화 중 오류 발생: {str(e)}")
 
 
 @router.post("/stem")
-async def stem_words(request: StemRequest):
-    """형태소 분석 (어간 추출 또는 원형 복원)"""
+def stem_words(request: StemRequest):
+    """
+    형태소 분석 (어간 추출 또는 원형 복원)
+    
+    batch=true이면 입력 단어를 중복 제거하고 요청 간 공유되는 캐시를 사용하며,
+    대량 입력은 프로세스 풀에서 나눠 처리합니다. 응답에 입력 단어 목록은 다시 싣지 않습니다.
+    """
     try:
         service = get_nltk_service()
         
+        if request.batch:
+            if request.method not in ("porter", "lancaster", "lemmatize"):
+                raise HTTPException(status_code=400, detail="지원하지 않는 형태소 분석 방법입니다.")
+            result, stats = service.normalize_batch(request.words, request.method, request.pos)
+            return {
+                "status": "success",
+                "method": request.method,
+                "pos": request.pos,
+                "output_words": result,
+                "stats": stats
+            }
+        
         if request.method == "porter":
             result = service.stem_porter(request.words)
         elif request.method == "lancaster":
@@ -153,28 +335,47 @@ async def stem_words(request: StemRequest):
             "input_words": request.words,
             "output_words": result
         }
+    except HTTPException:
+        raise
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"형태소 분석 중 오류 발생: {str(e)}")
 
 
 @router.post("/pos-tag")
-async def pos_tag_text(text: str):
-    """품사 태깅"""
+def pos_tag_text(text: str, parallel: bool = True, compare_serial: bool = False):
+    """
+    품사 태깅
+    
+    Args:
+        text: 입력 텍스트
+        parallel: 긴 텍스트를 문장 경계로 나눠 병렬 태깅 (결과는 직렬과 동일)
+        compare_serial: 직렬 태깅도 실행해 속도 향상(speedup)과 결과 일치 여부 보고
+    """
     try:
         service = get_nltk_service()
-        tagged = service.tag_pos(text)
+        if parallel:
+            tagged, tagging_stats = service.tag_pos_parallel(text, compare_serial=compare_serial)
+        else:
+            tagged, tagging_stats = service.tag_pos(text), None
         
-        return {
+        response = {
             "status": "success",
             "tagged_tokens": tagged,
-            "nouns": service.extract_nouns(text)
+            "nouns": [word for word, tag in tagged if tag == "NN"]  # extract_nouns와 같은 규칙, 재태깅 없이
         }
+        if tagging_stats is not None:
+            response["tagging_stats"] = tagging_stats
+        return response
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"품사 태깅 중 오류 발생: {str(e)}")
 
 
 @router.post("/analyze")
-async def analyze_text(request: AnalyzeTextRequest):
+def analyze_text(request: AnalyzeTextRequest):
     """텍스트 종합 분석"""
     try:
         service = get_nltk_service()
@@ -184,7 +385,9 @@ async def analyze_text(request: AnalyzeTextRequest):
             plot_frequency=request.plot_frequency,
             plot_dispersion_words=request.plot_dispersion_words,
             extract_names=request.extract_names,
-            create_wordcloud=request.create_wordcloud
+            create_wordcloud=request.create_wordcloud,
+            parallel_tagging=request.parallel_tagging,
+            compare_serial=request.compare_serial
         )
         
         # Text 객체와 WordCloud 객체는 JSON 직렬화 불가능하므로 제외
@@ -198,19 +401,75 @@ async def analyze_text(request: AnalyzeTextRequest):
         
         if "names_freq_dist" in result:
             response["most_common_names"] = result["most_common_names"]
+        if "tagging_stats" in result:
+            response["tagging_stats"] = result["tagging_stats"]
         
         return response
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"텍스트 분석 중 오류 발생: {str(e)}")
 
 
+@router.post("/analyze/stream")
+async def analyze_text_stream(
+    request: Request,
+    top_k: int = 20,
+    lowercase: bool = False,
+    min_word_length: int = 1,
+    encoding: str = "utf-8"
+):
+    """
+    대용량 문서 스트리밍 분석
+    
+    요청 본문(원문 텍스트, 예: curl --data-binary @corpus.txt)을 받는 대로 조각 단위로 토큰화하고
+    단어/바이그램 빈도를 누적합니다. 본문 전체나 토큰 목록을 메모리에 올리지 않으며,
+    카운터 항목 수에 상한이 있어 수백 MB 문서도 일정한 메모리로 분석합니다.
+    """
+    try:
+        analyzer = StreamingTextAnalyzer(lowercase=lowercase, encoding=encoding)
+    except LookupError:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 인코딩입니다: {encoding}")
+    try:
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer.extend(chunk)
+            if len(buffer) >= STREAM_BATCH_BYTES:
+                await run_in_threadpool(analyzer.feed, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(analyzer.feed, bytes(buffer))
+        await run_in_threadpool(analyzer.finish)
+        result = await run_in_threadpool(analyzer.result, top_k, min_word_length)
+        
+        return {
+            "status": "success",
+            **result
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스트리밍 분석 중 오류 발생: {str(e)}")
+
+
 @router.get("/freq-dist")
-async def get_frequency_distribution(text: str, word: Optional[str] = None):
-    """빈도 분포 조회"""
+def get_frequency_distribution(
+    text: Optional[str] = None,
+    word: Optional[str] = None,
+    fileid: Optional[str] = None
+):
+    """
+    빈도 분포 조회
+    
+    text 대신 fileid(예: austen-emma.txt)를 주면 말뭉치 분석 결과 캐시의 빈도 분포를 사용합니다.
+    """
+    if text is None and fileid is None:
+        raise HTTPException(status_code=400, detail="text 또는 fileid 중 하나를 지정하세요.")
     try:
         service = get_nltk_service()
-        tokens = service.tokenize_regex(text)
-        freq_dist = service.create_freq_dist(tokens)
+        if fileid is not None:
+            freq_dist = service.get_corpus_analysis(fileid).freq_dist
+        else:
+            tokens = service.tokenize_regex(text)
+            freq_dist = service.create_freq_dist(tokens)
         
         result = {
             "status": "success",
@@ -229,129 +488,164 @@ async def get_frequency_distribution(text: str, word: Optional[str] = None):
             }
         
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"빈도 분포 조회 중 오류 발생: {str(e)}")
 
 
 @router.get("/emma")
-async def analyze_emma_with_wordcloud(
+def analyze_emma_with_wordcloud(
     text_length: Optional[int] = None,
     extract_names: bool = True,
     width: int = 1000,
     height: int = 600,
-    background_color: str = "white"
+    background_color: str = "white",
+    embed_image: bool = False
 ):
     """
     엠마 텍스트 분석 및 워드클라우드 생성
     
+    분석 통계와 이미지는 (파라미터 + 말뭉치 버전) 캐시 키로 save/ 폴더에 저장되며,
+    캐시가 있으면 텍스트 로드/토큰화/품사 태깅/워드클라우드 배치를 모두 건너뜁니다.
+    같은 파라미터의 동시 요청은 한 번만 계산합니다.
+    
     Args:
         text_length: 분석할 텍스트 길이 (None이면 전체)
         extract_names: 고유명사 추출 여부
         width: 워드클라우드 너비
         height: 워드클라우드 높이
         background_color: 배경색
+        embed_image: True이면 이미지를 base64로 응답에 포함 (기본은 wordcloud_url만 반환)
         
     Returns:
-        분석 결과 및 워드클라우드 이미지 (base64 인코딩)
+        분석 결과 및 워드클라우드 이미지 URL
     """
     try:
         service = get_nltk_service()
+        cache = get_nlp_result_cache()
         
-        # 엠마 텍스트 로드
-        if text_length:
-            emma_text = service.get_emma_text(text_length)
-        else:
-            emma_text = service.load_corpus_text("austen-emma.txt")
-        
-        # 텍스트 분석 (워드클라우드 생성 포함)
-        tokens = service.tokenize_regex(emma_text)
-        text_obj = service.create_text_object(tokens, "Emma")
-        freq_dist = service.create_freq_dist(tokens)
-        
-        # 고유명사 추출 (선택적)
-        names_freq = None
-        most_common_names = None
-        if extract_names:
-            names_freq = service.extract_names_from_text(emma_text)
-            most_common_names = service.get_most_common(names_freq, 10)
-        
-        # 워드클라우드에 사용할 빈도 분포 선택
-        wordcloud_freq = names_freq if (extract_names and names_freq) else freq_dist
-        
-        # emma_wordcloud.py의 create_wordcloud 메서드 활용
-        wc = service.create_wordcloud(
-            freq_dist=wordcloud_freq,
-            width=width,
-            height=height,
-            background_color=background_color,
-            random_state=0,
-            show=False  # 파일로만 저장, 화면에 표시하지 않음
-        )
-        
-        # save 폴더에 워드클라우드 이미지 저장
-        # nlp_router.py는 app/nlp/에 있으므로 save 폴더는 app/nlp/save/
-        save_dir = Path(__file__).parent / "save"
-        save_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일명 생성 (파라미터 기반, 타임스탬프 제거하여 같은 파라미터면 같은 파일명)
-        params_str = f"{extract_names}_{width}_{height}_{background_color}_{text_length or 'full'}"
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
-        if extract_names and names_freq:
-            filename = f"emma_names_wordcloud_{params_hash}.png"
-        else:
-            filename = f"emma_wordcloud_{params_hash}.png"
-        filepath = save_dir / filename
+        params = {
+            "text_length": text_length,
+            "extract_names": extract_names,
+            "width": width,
+            "height": height,
+            "background_color": background_color
+        }
+        key = cache_key("emma", params, service.get_corpus_version("austen-emma.txt"))
         
-        # 이미 파일이 존재하면 재사용
-        if filepath.exists():
-            # 기존 파일을 읽어서 base64 인코딩
-            with open(filepath, 'rb') as f:
-                img_data = f.read()
-            img_base64 = base64.b64encode(img_data).decode('utf-8')
-        else:
-            # 새로 생성
-            # 워드클라우드를 이미지로 변환 (파일 저장 및 base64 인코딩)
-            plt.figure(figsize=(width/100, height/100))
-            plt.imshow(wc, interpolation='bilinear')
-            plt.axis("off")
-            plt.tight_layout(pad=0)
+        def compute():
+            # 엠마 텍스트 분석 (말뭉치 분석 결과 캐시 사용)
+            analysis = service.analyze_corpus("austen-emma.txt", text_length, extract_names)
+            emma_text = analysis["text"]
+            tokens = analysis["tokens"]
+            freq_dist = analysis["freq_dist"]
+            
+            stats = {
+                "text_length": len(emma_text),
+                "total_tokens": len(tokens),
+                "vocabulary_size": len(freq_dist),
+                "most_common_words": service.get_most_common(freq_dist, 20)
+            }
+            
+            # 고유명사 추출 (선택적)
+            names_freq = analysis.get("names_freq_dist")
+            if extract_names:
+                if names_freq:
+                    stats["most_common_names"] = service.get_most_common(names_freq, 10)
+                    stats["names_count"] = names_freq.N()
             
-            # 먼저 파일로 저장
-            plt.savefig(filepath, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
+            # 워드클라우드에 사용할 빈도 분포 선택
+            wordcloud_freq = names_freq if (extract_names and names_freq) else freq_dist
             
-            # base64 인코딩을 위한 버퍼
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
-            plt.close()
+            # emma_wordcloud.py의 create_wordcloud 메서드 활용
+            wc = service.create_wordcloud(
+                freq_dist=wordcloud_freq,
+                width=width,
+                height=height,
+                background_color=background_color,
+                random_state=0,
+                show=False  # 파일로만 저장, 화면에 표시하지 않음
+            )
             
-            # base64 인코딩
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-            img_buffer.close()
+            # 워드클라우드를 PNG로 한 번만 인코딩 (파일 저장은 캐시가 담당)
+            prefix = "emma_names_wordcloud" if (extract_names and names_freq) else "emma_wordcloud"
+            return stats, render_wordcloud_png(wc), f"{prefix}_{key}.png"
+        
+        cached, cache_hit = cache.get_or_compute("emma", key, compute)
+        
+        filepath = cache.image_path(cached["image_file"])
         
         # 결과 반환
+        stats = cached["stats"]
         result = {
             "status": "success",
             "text_name": "Emma",
-            "text_length": len(emma_text),
-            "total_tokens": len(tokens),
-            "vocabulary_size": len(freq_dist),
-            "most_common_words": service.get_most_common(freq_dist, 20),
-            "wordcloud_image": f"data:image/png;base64,{img_base64}",
+            "text_length": stats["text_length"],
+            "total_tokens": stats["total_tokens"],
+            "vocabulary_size": stats["vocabulary_size"],
+            "most_common_words": stats["most_common_words"],
+            "wordcloud_url": image_url("emma", key),
             "wordcloud_file": str(filepath),
-            "wordcloud_filename": filename,
+            "wordcloud_filename": cached["image_file"],
             "wordcloud_width": width,
-            "wordcloud_height": height
+            "wordcloud_height": height,
+            "cache_key": key,
+            "cache_hit": cache_hit
         }
         
-        if extract_names and names_freq:
-            result["most_common_names"] = most_common_names
-            result["names_count"] = names_freq.N()
+        if "most_common_names" in stats:
+            result["most_common_names"] = stats["most_common_names"]
+            result["names_count"] = stats["names_count"]
+        
+        if embed_image:
+            with open(filepath, 'rb') as f:
+                img_base64 = base64.b64encode(f.read()).decode('utf-8')
+            result["wordcloud_image"] = f"data:image/png;base64,{img_base64}"
         
         return result
         
+    except NLTKResourceMissingError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"엠마 텍스트 분석 중 오류 발생: {str(e)}")
 
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (약한 비교, '*' 포함)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+@router.get("/images/{namespace}/{key}.png")
+def get_wordcloud_image(
+    request: Request,
+    namespace: str = Path(..., pattern="^[a-z_]+$", description="캐시 구분 (emma, korean, samsung)"),
+    key: str = Path(..., pattern="^[0-9a-f]{16}$", description="캐시 키")
+):
+    """
+    캐시된 워드클라우드 PNG 이미지
+    
+    캐시 키를 강한 ETag로 사용하며, If-None-Match가 일치하면 본문 없이 304를 반환합니다.
+    키가 같으면 이미지도 같으므로 긴 캐시 수명(immutable)을 지정합니다.
+    """
+    cached = get_nlp_result_cache().load(namespace, key)
+    if cached is None:
+        raise HTTPException(status_code=404, detail=f"워드클라우드 이미지를 찾을 수 없습니다: {namespace}/{key}")
+    
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": IMAGE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(
+        path=str(get_nlp_result_cache().image_path(cached["image_file"])),
+        media_type="image/png",
+        headers=headers
+    )
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+NLTK 리소스 관리
+서비스 실행 중에는 네트워크에 접근하지 않고 로컬 NLTK 데이터만 확인하며,
+기능(feature)별로 처음 사용할 때 필요한 리소스를 확인
+
+빌드 단계에서 필요한 리소스만 nltk_data/ 폴더에 내려받기:
+    python app/nlp/nltk_resources.py --vendor
+로컬 리소스 상태 확인 (네트워크 접근 없음):
+    python app/nlp/nltk_resources.py --check
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import nltk
+
+logger = logging.getLogger(__name__)
+
+# 서비스에 포함(vendoring)되는 NLTK 데이터 디렉토리 (기본 검색 경로보다 먼저 확인)
+NLTK_DATA_DIR = Path(__file__).parent / "nltk_data"
+
+if str(NLTK_DATA_DIR) not in nltk.data.path:
+    nltk.data.path.insert(0, str(NLTK_DATA_DIR))
+
+# 서비스가 사용하는 리소스: 패키지 ID -> nltk.data.find 경로 (nltk 3.8.1 기준)
+REQUIRED_RESOURCES: Dict[str, str] = {
+    "punkt": "tokenizers/punkt",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+    "gutenberg": "corpora/gutenberg",
+    "tagsets": "help/tagsets",
+    "stopwords": "corpora/stopwords",
+}
+
+# 기능별 필요 리소스
+FEATURE_RESOURCES: Dict[str, Sequence[str]] = {
+    "tokenize": ("punkt",),
+    "pos_tag": ("averaged_perceptron_tagger",),
+    "lemmatize": ("wordnet", "omw-1.4"),
+    "gutenberg": ("gutenberg",),
+    "tagset_help": ("tagsets",),
+    "stopwords": ("stopwords",),
+}
+
+
+class NLTKResourceMissingError(RuntimeError):
+    """필요한 NLTK 리소스가 로컬에 없음"""
+
+    def __init__(self, feature: str, missing: List[str]):
+        self.feature = feature
+        self.missing = missing
+        super().__init__(
+            f"NLTK 리소스가 없어 '{feature}' 기능을 사용할 수 없습니다: {', '.join(missing)} "
+            f"(빌드 단계에서 'python app/nlp/nltk_resources.py --vendor' 실행 필요)"
+        )
+
+
+class NLTKResourceManager:
+    """
+    로컬 NLTK 리소스 확인기
+
+    확인된 리소스와 기능은 기억해 두고 다시 확인하지 않습니다.
+    없는 리소스는 기억하지 않으므로, 실행 중에 데이터를 추가하면 다음 요청부터 사용할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._available: Dict[str, bool] = {}
+        self._ready_features: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def is_available(self, resource: str) -> bool:
+        """리소스가 로컬 검색 경로에 있는지 확인 (zip 형태 포함)"""
+        if self._available.get(resource):
+            return True
+        try:
+            nltk.data.find(REQUIRED_RESOURCES[resource])
+        except LookupError:
+            return False
+        with self._lock:
+            self._available[resource] = True
+        return True
+
+    def missing(self, feature: Optional[str] = None) -> List[str]:
+        """없는 리소스 목록 (feature가 None이면 전체)"""
+        resources = REQUIRED_RESOURCES if feature is None else FEATURE_RESOURCES[feature]
+        return [resource for resource in resources if not self.is_available(resource)]
+
+    def require(self, *features: str):
+        """
+        기능 사용 전 리소스 확인 (기능별로 처음 한 번만 검사)
+
+        Raises:
+            NLTKResourceMissingError: 리소스가 없을 때
+        """
+        for feature in features:
+            if self._ready_features.get(feature):
+                continue
+            missing = self.missing(feature)
+            if missing:
+                raise NLTKResourceMissingError(feature, missing)
+            with self._lock:
+                self._ready_features[feature] = True
+
+    def status(self) -> Dict:
+        """리소스/기능별 사용 가능 여부"""
+        resources = {resource: self.is_available(resource) for resource in REQUIRED_RESOURCES}
+        return {
+            "data_dir": str(NLTK_DATA_DIR),
+            "search_paths": list(nltk.data.path),
+            "resources": resources,
+            "features": {
+                feature: all(resources[resource] for resource in required)
+                for feature, required in FEATURE_RESOURCES.items()
+            },
+            "missing": [resource for resource, ok in resources.items() if not ok],
+        }
+
+    def log_missing(self, features: Sequence[str]):
+        """서비스 시작 시 없는 리소스를 경고로 기록 (요청을 막지는 않음)"""
+        for feature in features:
+            missing = self.missing(feature)
+            if missing:
+                logger.warning(f"[NLTKResourceManager] '{feature}' 기능에 필요한 리소스 없음: {', '.join(missing)}")
+
+
+def vendor_resources(download_dir: Path = NLTK_DATA_DIR) -> List[str]:
+    """
+    필요한 리소스만 download_dir에 내려받기 (빌드 단계 전용, 네트워크 사용)
+
+    Returns:
+        내려받지 못한 리소스 목록
+    """
+    download_dir.mkdir(parents=True, exist_ok=True)
+    failed = []
+    for resource in REQUIRED_RESOURCES:
+        if not nltk.download(resource, download_dir=str(download_dir), quiet=True):
+            failed.append(resource)
+    return failed
+
+
+# 리소스 관리자 싱글톤
+_resource_manager: Optional[NLTKResourceManager] = None
+
+
+def get_nltk_resources() -> NLTKResourceManager:
+    """리소스 관리자 인스턴스 싱글톤 패턴"""
+    global _resource_manager
+    if _resource_manager is None:
+        _resource_manager = NLTKResourceManager()
+    return _resource_manager
+
+
+# 빌드 단계 실행
+if __name__ == "__main__":
+    import json
+    import sys
+
+    if "--vendor" in sys.argv[1:]:
+        failed = vendor_resources()
+        if failed:
+            print(f"내려받기 실패: {', '.join(failed)}")
+            sys.exit(1)
+        print(f"NLTK 리소스 준비 완료: {NLTK_DATA_DIR}")
+
+    report = NLTKResourceManager().status()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report["missing"] else 0)
@@ -2,18 +2,18 @@
 삼성 보고서 워드클라우드 라우터
 """
 import base64
-import hashlib
-import io
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import FileResponse
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 
+from app.nlp.nlp_cache import cache_key, file_version, get_nlp_result_cache, image_url
+from app.nlp.wordcloud_renderer import render_wordcloud_png
 from .samsung_wordcloud import SamsungWordcloud
 
+# 보고서/불용어/폰트 파일 디렉토리
+DATA_DIR = Path(__file__).parent.parent / "data"
+
 # 라우터 생성
 router = APIRouter(
     prefix="/samsung",
@@ -64,111 +64,105 @@ async def root():
 
 
 @router.get("/wordcloud")
-async def generate_samsung_wordcloud(
+def generate_samsung_wordcloud(
     width: int = Query(1000, description="워드클라우드 너비"),
     height: int = Query(600, description="워드클라우드 높이"),
-    background_color: str = Query("white", description="배경색")
+    background_color: str = Query("white", description="배경색"),
+    embed_image: bool = Query(False, description="True이면 응답에 base64 이미지 포함")
 ):
     """
     삼성 보고서 워드클라우드 생성
     
+    결과는 (파라미터 + 보고서/불용어/폰트 파일 버전) 캐시 키로 저장되어,
+    같은 요청은 형태소 분석과 워드클라우드 배치를 건너뜁니다.
+    
     Args:
         width: 워드클라우드 너비
         height: 워드클라우드 높이
         background_color: 배경색
+        embed_image: True이면 이미지를 base64로 응답에 포함 (기본은 wordcloud_url만 반환)
         
     Returns:
-        워드클라우드 이미지 (base64 인코딩) 및 분석 결과
+        워드클라우드 이미지 URL 및 분석 결과
     """
     try:
-        service = get_samsung_service()
-        
-        # 텍스트 전처리 및 빈도 분석
-        freq_txt = service.find_freq()
-        
-        # 워드클라우드 생성
-        texts = service.remove_stopword()
-        
-        # 빈도 분석
-        from nltk import FreqDist
-        freq_dist = FreqDist(texts)
-        freq_dict = dict(freq_dist)
-        
-        # "삼성전자"를 가장 크게 표시하기 위해 빈도를 최대값으로 설정
-        if '삼성전자' in freq_dict:
-            max_freq = max(freq_dict.values()) if freq_dict.values() else 100
-            # "삼성전자"의 빈도를 최대값의 2배로 설정하여 가장 크게 표시
-            freq_dict['삼성전자'] = max_freq * 2
-        else:
-            # "삼성전자"가 없으면 추가하고 높은 빈도 부여
-            max_freq = max(freq_dict.values()) if freq_dict.values() else 100
-            freq_dict['삼성전자'] = max_freq * 2
+        cache = get_nlp_result_cache()
         
         # 폰트 경로 설정
-        font_path = Path(__file__).parent.parent / "data" / "D2Coding.ttf"
+        font_path = DATA_DIR / "D2Coding.ttf"
         if not font_path.exists():
             # 폰트가 없으면 기본 폰트 사용
             font_path = None
         
-        from wordcloud import WordCloud
-        
-        # 빈도 기반으로 워드클라우드 생성
-        wcloud = WordCloud(
-            font_path=str(font_path) if font_path and font_path.exists() else None,
-            relative_scaling=0.2,
-            width=width,
-            height=height,
-            background_color=background_color
-        ).generate_from_frequencies(freq_dict)
-        
-        # save 폴더에 워드클라우드 이미지 저장
-        save_dir = Path(__file__).parent.parent / "save"
-        save_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일명 생성
-        params_str = f"{width}_{height}_{background_color}"
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
-        filename = f"samsung_wordcloud_{params_hash}.png"
-        filepath = save_dir / filename
+        params = {"width": width, "height": height, "background_color": background_color}
+        corpus_version = file_version(
+            DATA_DIR / "kr-Report_2018.txt",
+            DATA_DIR / "samsung_report_2018.txt",
+            DATA_DIR / "stopwords.txt",
+            DATA_DIR / "D2Coding.ttf"
+        )
+        key = cache_key("samsung", params, corpus_version)
         
-        # 이미 파일이 존재하면 재사용
-        if filepath.exists():
-            with open(filepath, 'rb') as f:
-                img_data = f.read()
-            img_base64 = base64.b64encode(img_data).decode('utf-8')
-        else:
-            # 새로 생성
-            plt.figure(figsize=(width/100, height/100))
-            plt.imshow(wcloud, interpolation='bilinear')
-            plt.axis('off')
-            plt.tight_layout(pad=0)
+        def compute():
+            service = get_samsung_service()
+            
+            # 텍스트 전처리 및 빈도 분석
+            freq_txt = service.find_freq()
+            
+            # 워드클라우드 생성
+            texts = service.remove_stopword()
+            
+            # 빈도 분석
+            from nltk import FreqDist
+            freq_dist = FreqDist(texts)
+            freq_dict = dict(freq_dist)
+            
+            # "삼성전자"를 가장 크게 표시하기 위해 빈도를 최대값의 2배로 설정 (없으면 추가)
+            max_freq = max(freq_dict.values()) if freq_dict.values() else 100
+            freq_dict['삼성전자'] = max_freq * 2
             
-            # 파일로 저장
-            plt.savefig(filepath, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
+            from wordcloud import WordCloud
             
-            # base64 인코딩을 위한 버퍼
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
-            plt.close()
+            # 빈도 기반으로 워드클라우드 생성
+            wcloud = WordCloud(
+                font_path=str(font_path) if font_path else None,
+                relative_scaling=0.2,
+                width=width,
+                height=height,
+                background_color=background_color
+            ).generate_from_frequencies(freq_dict)
             
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
-            img_buffer.close()
+            # 빈도 데이터를 딕셔너리로 변환 (상위 30개)
+            top_words = freq_txt.head(30).to_dict()
+            stats = {
+                "top_words": {str(k): int(v) for k, v in top_words.items()},
+                "total_words": len(freq_txt)
+            }
+            return stats, render_wordcloud_png(wcloud), f"samsung_wordcloud_{key}.png"
         
-        # 빈도 데이터를 딕셔너리로 변환 (상위 30개)
-        freq_dict = freq_txt.head(30).to_dict()
+        cached, cache_hit = cache.get_or_compute("samsung", key, compute)
+        filepath = cache.image_path(cached["image_file"])
         
-        return {
+        result = {
             "status": "success",
-            "wordcloud_image": f"data:image/png;base64,{img_base64}",
+            "wordcloud_url": image_url("samsung", key),
             "wordcloud_file": str(filepath),
-            "wordcloud_filename": filename,
+            "wordcloud_filename": cached["image_file"],
             "wordcloud_width": width,
             "wordcloud_height": height,
-            "top_words": {str(k): int(v) for k, v in freq_dict.items()},
-            "total_words": len(freq_txt)
+            "top_words": cached["stats"]["top_words"],
+            "total_words": cached["stats"]["total_words"],
+            "cache_key": key,
+            "cache_hit": cache_hit
         }
         
+        if embed_image:
+            with open(filepath, 'rb') as f:
+                img_base64 = base64.b64encode(f.read()).decode('utf-8')
+            result["wordcloud_image"] = f"data:image/png;base64,{img_base64}"
+        
+        return result
+        
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -6,7 +6,6 @@ https://datascienceschool.net/view-notebook/118731eec74b4ad3bdd2f89bab077e1b/
 """
 import re
 import nltk
-import matplotlib.pyplot as plt
 import pandas as pd
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional
@@ -18,6 +17,8 @@ from nltk.corpus import gutenberg
 from wordcloud import WordCloud
 import logging
 from konlpy.tag import Okt
+from app.nlp.nltk_resources import get_nltk_resources
+from app.nlp.wordcloud_renderer import render_wordcloud_png
 
 
 logger = logging.getLogger(__name__)
@@ -25,17 +26,13 @@ logger = logging.getLogger(__name__)
 class SamsungWordcloud:
     """NLTK 자연어 처리 서비스 클래스"""
     
-    def __init__(self, download_resources: bool = True):
+    def __init__(self, check_resources: bool = True):
         self.okt = Okt()
+        self.resources = get_nltk_resources()
         
-        # NLTK 리소스 다운로드
-        if download_resources:
-            try:
-                nltk.download('punkt', quiet=True)
-                nltk.download('wordnet', quiet=True)
-                nltk.download('omw-1.4', quiet=True)
-            except Exception as e:
-                logger.warning(f"NLTK 리소스 다운로드 실패 (이미 설치되어 있을 수 있음): {e}")
+        # NLTK 리소스는 내려받지 않고 로컬에 있는지만 확인 (app/nlp/nltk_resources.py)
+        if check_resources:
+            self.resources.log_missing(["tokenize"])
 
     def text_process(self):
         try:
@@ -116,6 +113,7 @@ class SamsungWordcloud:
         return tokenizer.sub('', temp)
 
     def change_token(self, texts):
+        self.resources.require("tokenize")
         return word_tokenize(texts)
 
     def extract_noun(self):
@@ -231,7 +229,8 @@ class SamsungWordcloud:
             width=1200,
             height=1200,
             max_words=500,
-            prefer_horizontal=0.5  # 가로/세로 비율 조정
+            prefer_horizontal=0.5,  # 가로/세로 비율 조정
+            scale=3  # 1200 x 3 = 3600px (기존 12인치 × 300dpi 출력 해상도)
         ).generate_from_frequencies(wordcloud_freq_dict)
         
         # "삼성전자"가 실제로 워드클라우드에 포함되었는지 확인
@@ -240,19 +239,12 @@ class SamsungWordcloud:
         else:
             logger.warning("[경고] '삼성전자'가 워드클라우드에 포함되지 않았습니다.")
         
-        plt.figure(figsize=(12, 12))
-        plt.imshow(wcloud, interpolation='bilinear')
-        plt.axis('off')
-        
-        # save 폴더에 저장
+        # save 폴더에 저장 (PNG 직접 인코딩)
         save_dir = Path(__file__).parent.parent / "save"
-        save_dir.mkdir(parents=True, exist_ok=True)
         output_file = save_dir / "samsung_wordcloud.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        render_wordcloud_png(wcloud, output_file)
         logger.info(f"워드클라우드 저장 완료: {output_file}")
         
-        plt.close()
-        
         return {
             'file_path': str(output_file),
             'filename': output_file.name,
@@ -275,20 +267,15 @@ class SamsungWordcloud:
             width=1200,
             height=1200,
             max_words=500,
-            prefer_horizontal=0.5  # 가로/세로 비율 조정
+            prefer_horizontal=0.5,  # 가로/세로 비율 조정
+            scale=3  # 1200 x 3 = 3600px (기존 12인치 × 300dpi 출력 해상도)
         ).generate_from_frequencies(freq_dict)
         
-        plt.figure(figsize=(12, 12))
-        plt.imshow(wcloud, interpolation='bilinear')
-        plt.axis('off')
-        
-        # save 폴더에 저장
+        # save 폴더에 저장 (PNG 직접 인코딩)
         save_dir = Path(__file__).parent.parent / "save"
-        save_dir.mkdir(parents=True, exist_ok=True)
         output_file = save_dir / "samsung_wordcloud.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        render_wordcloud_png(wcloud, output_file)
         logger.info(f"워드클라우드 저장 완료: {output_file}")
-        plt.close()
         
         return {
             'file_path': str(output_file),
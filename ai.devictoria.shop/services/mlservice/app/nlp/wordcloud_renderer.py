@@ -0,0 +1,36 @@
+"""
+워드클라우드 PNG 렌더러
+matplotlib figure를 거치지 않고 WordCloud 이미지를 PIL로 한 번만 PNG 인코딩
+"""
+import io
+from pathlib import Path
+from typing import Optional, Union
+from wordcloud import WordCloud
+
+from app.nlp.nlp_cache import write_atomic
+
+
+def render_wordcloud_png(wc: WordCloud, path: Optional[Union[str, Path]] = None) -> bytes:
+    """
+    워드클라우드를 PNG 바이트로 인코딩 (path가 있으면 같은 바이트를 파일로도 저장)
+
+    WordCloud.to_image()는 인스턴스별 PIL 이미지를 만들고 pyplot 전역 상태를 쓰지 않으므로
+    여러 스레드에서 동시에 호출해도 안전합니다. 파일은 임시 파일에 쓴 뒤 교체하므로
+    같은 경로에 동시에 저장해도 읽는 쪽은 완성된 파일만 봅니다.
+    이미지 크기는 WordCloud의 width × height × scale 입니다.
+
+    Args:
+        wc: generate/generate_from_frequencies가 끝난 WordCloud
+        path: 저장할 파일 경로 (None이면 저장하지 않음)
+
+    Returns:
+        PNG 바이트
+    """
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format="PNG")
+    data = buffer.getvalue()
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+    return data
@@ -0,0 +1,192 @@
+"""
+타이타닉 모델 산출물 저장소
+sklearn 모델을 joblib(비압축)으로 저장해 모델 속성인 numpy 배열(서포트 벡터, KNN 학습 데이터 등)을
+로드 시 memory-map으로 공유하고, 다운로드용 gzip 사본과 해시/크기 manifest를 함께 관리
+(트리 모델은 로드 시 노드 배열이 복사되므로 공유되지 않음)
+"""
+import sys
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+import joblib
+import sklearn
+
+# 공통 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+try:
+    from common.utils import setup_logging
+    logger = setup_logging("titanic_artifacts")
+except ImportError:
+    import logging
+    logger = logging.getLogger("titanic_artifacts")
+
+
+MODELS_DIR = Path(__file__).parent / 'models'
+MANIFEST_PATH = MODELS_DIR / 'manifest.json'
+
+ARTIFACT_SUFFIX = '.joblib'
+COMPRESSED_SUFFIX = '.joblib.gz'
+
+_manifest_lock = threading.Lock()
+
+# 프로세스 내 로드 캐시: 산출물 이름 -> (파일 mtime_ns, 모델)
+_loaded: Dict[str, Tuple[int, Any]] = {}
+_loaded_lock = threading.Lock()
+
+
+def artifact_path(name: str) -> Path:
+    """산출물 파일 경로 (예: RandomForest_kaggle_model -> models/RandomForest_kaggle_model.joblib)"""
+    return MODELS_DIR / f'{name}{ARTIFACT_SUFFIX}'
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest() -> Dict[str, Any]:
+    """manifest.json 로드 (없으면 빈 manifest)"""
+    if not MANIFEST_PATH.exists():
+        return {'artifacts': {}}
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"manifest.json 로드 실패, 새로 작성합니다: {e}")
+        return {'artifacts': {}}
+
+
+def _update_manifest(name: str, entry: Optional[Dict[str, Any]] = None, **fields):
+    """manifest 항목 갱신 (임시 파일에 기록 후 교체)"""
+    with _manifest_lock:
+        manifest = load_manifest()
+        artifacts = manifest.setdefault('artifacts', {})
+        if entry is not None:
+            artifacts[name] = entry
+        else:
+            artifacts.setdefault(name, {}).update(fields)
+        manifest['updated_at'] = datetime.now().isoformat()
+
+        tmp_path = MANIFEST_PATH.with_name(f'.manifest-{uuid.uuid4().hex[:8]}.json')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+
+def save_model(model: Any, name: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    모델 저장
+
+    비압축 joblib으로 저장해야 load_model()에서 numpy 배열을 memory-map 할 수 있습니다.
+    임시 파일에 기록한 뒤 교체하므로 읽는 쪽에서 반쯤 기록된 파일을 보지 않습니다.
+
+    Args:
+        model: 학습된 sklearn 모델
+        name: 산출물 이름 (예: RandomForest_kaggle_model)
+        metadata: manifest 항목에 함께 기록할 값 (예: 학습 입력 해시, 하이퍼파라미터)
+
+    Returns:
+        manifest 항목 (path, sha256, size 등)
+    """
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    path = artifact_path(name)
+    tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex[:8]}.tmp')
+    try:
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # 이전 다운로드용 압축 사본은 더 이상 맞지 않으므로 삭제
+    path.with_name(f'{name}{COMPRESSED_SUFFIX}').unlink(missing_ok=True)
+
+    entry = {
+        'file': path.name,
+        'path': str(path),
+        'size': path.stat().st_size,
+        'sha256': _sha256(path),
+        'model_class': type(model).__name__,
+        'n_features_in': getattr(model, 'n_features_in_', None),
+        'sklearn_version': sklearn.__version__,
+        'created_at': datetime.now().isoformat(),
+        **(metadata or {}),
+    }
+    _update_manifest(name, entry)
+    logger.info(f"모델 저장 완료: {path} ({entry['size'] / (1024 * 1024):.2f} MB)")
+    return entry
+
+
+def load_model(name: str, mmap: bool = True) -> Any:
+    """
+    모델 로드
+
+    mmap=True이면 모델 속성 중 일반 numpy 배열(SVM 서포트 벡터, KNN 학습 데이터, NaiveBayes 통계 등)을
+    읽기 전용 memory-map으로 열어 여러 워커 프로세스가 OS 페이지 캐시를 공유합니다.
+    모델 전체가 복사 없이 공유되는 것은 아닙니다. sklearn Tree.__setstate__는 노드 배열을 복사하므로
+    DecisionTree/RandomForest의 트리는 프로세스마다 별도 메모리에 올라갑니다.
+    같은 프로세스 안에서는 파일이 바뀌기 전까지 로드한 모델을 재사용합니다.
+
+    Raises:
+        FileNotFoundError: 산출물 파일이 없을 때
+    """
+    path = artifact_path(name)
+    if not path.exists():
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {path}")
+
+    mtime_ns = path.stat().st_mtime_ns
+    with _loaded_lock:
+        cached = _loaded.get(name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    model = joblib.load(path, mmap_mode='r' if mmap else None)
+    with _loaded_lock:
+        _loaded[name] = (mtime_ns, model)
+    logger.info(f"모델 로드 완료: {path} (mmap={mmap})")
+    return model
+
+
+def compressed_artifact(name: str) -> Path:
+    """
+    다운로드용 gzip 압축 사본 경로 반환 (없으면 생성)
+
+    joblib.load()는 gzip 파일을 자동으로 인식하므로 받은 파일을 그대로 로드할 수 있습니다.
+    압축 사본은 memory-map 할 수 없어 서비스 내부 로드에는 사용하지 않습니다.
+    """
+    path = artifact_path(name)
+    if not path.exists():
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {path}")
+
+    gz_path = path.with_name(f'{name}{COMPRESSED_SUFFIX}')
+    if gz_path.exists() and gz_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+        return gz_path
+
+    tmp_path = gz_path.with_name(f'.{gz_path.name}.{uuid.uuid4().hex[:8]}.tmp')
+    try:
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_path, gz_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    _update_manifest(
+        name,
+        compressed_file=gz_path.name,
+        compressed_size=gz_path.stat().st_size,
+        compressed_sha256=_sha256(gz_path),
+    )
+    logger.info(f"다운로드용 압축 사본 생성: {gz_path}")
+    return gz_path
@@ -0,0 +1,215 @@
+"""
+타이타닉 피처 스토어
+전처리된 train/test 데이터를 Arrow IPC(Feather) 컬럼 포맷으로 저장하고
+입력 CSV 해시를 키로 재사용하여 매 요청마다 CSV 파싱과 피처 엔지니어링을 반복하지 않도록 함
+모델 입력 float32 행렬은 .npy로 함께 저장해 memory-map으로 읽음 (프로세스 간 페이지 캐시 공유)
+"""
+import sys
+import json
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from app.titanic.titanic_dataset import TitanicDataSet
+
+# 공통 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+try:
+    from common.utils import setup_logging
+    logger = setup_logging("titanic_feature_store")
+except ImportError:
+    import logging
+    logger = logging.getLogger("titanic_feature_store")
+
+
+# 전처리 로직이 바뀌면 올려서 기존 캐시를 무효화
+FEATURE_PIPELINE_VERSION = "2"
+
+LABEL_COLUMN = 'Survived'
+
+
+class TitanicFeatureStore:
+    """
+    전처리 결과 캐시
+
+    feature_store/<input_hash>/ 디렉토리 구조:
+        train.arrow   - 전처리된 train 피처 (비압축 Arrow IPC)
+        test.arrow    - 전처리된 test 피처
+        labels.arrow  - Survived 라벨 (없으면 생략)
+        meta.json     - /preprocess 응답용 요약 정보 (JSON 직렬화 완료 상태)
+        X_train.npy   - 모델 입력 train 행렬 (float32, 처음 get_training_data() 때 추가)
+        X_test.npy    - 모델 입력 test 행렬 (같은 컬럼 순서)
+        matrix.json   - 행렬 피처 컬럼 목록
+
+    Arrow 테이블은 DataFrame으로 변환할 때 복사되므로 프로세스 간에 공유되지 않습니다.
+    학습/예측에 쓰는 float32 행렬은 .npy를 np.load(mmap_mode='r')로 열어 복사 없이 사용합니다.
+    """
+
+    def __init__(self, store_dir: Optional[Path] = None):
+        self.store_dir = store_dir or Path(__file__).parent / 'feature_store'
+
+    def input_hash(self, *paths: Path) -> str:
+        """
+        입력 CSV 내용과 파이프라인 버전으로 캐시 키 생성
+
+        Args:
+            paths: 입력 파일 경로들 (train.csv, test.csv)
+
+        Returns:
+            sha256 hex 문자열
+        """
+        h = hashlib.sha256()
+        h.update(f"pipeline:{FEATURE_PIPELINE_VERSION}".encode())
+        for path in paths:
+            h.update(f"|{Path(path).name}|".encode())
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+        return h.hexdigest()
+
+    def _entry_dir(self, input_hash: str) -> Path:
+        return self.store_dir / input_hash
+
+    def exists(self, input_hash: str) -> bool:
+        return (self._entry_dir(input_hash) / 'meta.json').exists()
+
+    def load_summary(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """저장된 요약 정보만 로드 (피처 테이블은 읽지 않음)"""
+        meta_path = self._entry_dir(input_hash) / 'meta.json'
+        if not meta_path.exists():
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, input_hash: str) -> Optional[Tuple[TitanicDataSet, Optional[pd.Series], Dict[str, Any]]]:
+        """
+        캐시된 전처리 결과 로드
+
+        Returns:
+            (TitanicDataSet, Survived 라벨, 요약 정보) 튜플. 캐시가 없으면 None
+        """
+        summary = self.load_summary(input_hash)
+        if summary is None:
+            return None
+
+        entry_dir = self._entry_dir(input_hash)
+        try:
+            this = TitanicDataSet()
+            this.train = self._read_table(entry_dir / 'train.arrow')
+            this.test = self._read_table(entry_dir / 'test.arrow')
+
+            labels = None
+            labels_path = entry_dir / 'labels.arrow'
+            if labels_path.exists():
+                labels = self._read_table(labels_path)[LABEL_COLUMN]
+        except Exception as e:
+            logger.warning(f"피처 캐시 로드 실패, 다시 전처리합니다 ({input_hash[:12]}): {e}")
+            return None
+
+        logger.info(f"피처 캐시 적중: {input_hash[:12]} (train={this.train.shape}, test={this.test.shape})")
+        return this, labels, summary
+
+    def save(
+        self,
+        input_hash: str,
+        this: TitanicDataSet,
+        labels: Optional[pd.Series],
+        summary: Dict[str, Any]
+    ) -> Path:
+        """
+        전처리 결과 저장
+
+        임시 디렉토리에 모두 기록한 뒤 rename하므로, 동시에 저장하더라도
+        반쯤 기록된 캐시 항목이 읽히지 않습니다.
+        """
+        entry_dir = self._entry_dir(input_hash)
+        if self.exists(input_hash):
+            return entry_dir
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.store_dir / f".tmp-{input_hash[:12]}-{uuid.uuid4().hex[:8]}"
+        tmp_dir.mkdir()
+        try:
+            self._write_table(this.train, tmp_dir / 'train.arrow')
+            self._write_table(this.test, tmp_dir / 'test.arrow')
+            if labels is not None:
+                self._write_table(labels.to_frame(name=LABEL_COLUMN), tmp_dir / 'labels.arrow')
+            with open(tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False)
+
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # 다른 요청이 먼저 같은 항목을 저장한 경우
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"피처 캐시 저장 완료: {entry_dir}")
+        return entry_dir
+
+    def load_matrix(self, input_hash: str) -> Optional[Tuple[np.ndarray, np.ndarray, List[str]]]:
+        """
+        저장된 모델 입력 행렬 로드 (읽기 전용 memory-map)
+
+        Returns:
+            (train 행렬, test 행렬, 피처 컬럼 목록) 튜플. 저장된 행렬이 없으면 None
+        """
+        entry_dir = self._entry_dir(input_hash)
+        columns_path = entry_dir / 'matrix.json'
+        if not columns_path.exists():
+            return None
+        try:
+            with open(columns_path, 'r', encoding='utf-8') as f:
+                feature_columns = json.load(f)['feature_columns']
+            X = np.load(entry_dir / 'X_train.npy', mmap_mode='r')
+            X_test = np.load(entry_dir / 'X_test.npy', mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"모델 입력 행렬 로드 실패, 다시 생성합니다 ({input_hash[:12]}): {e}")
+            return None
+        return X, X_test, feature_columns
+
+    def save_matrix(self, input_hash: str, X: np.ndarray, X_test: np.ndarray, feature_columns: List[str]):
+        """
+        모델 입력 행렬을 기존 캐시 항목에 추가 저장 (항목이 없으면 저장하지 않음)
+
+        각 파일을 임시 파일에 기록한 뒤 교체하고, matrix.json을 마지막에 기록하므로
+        load_matrix()는 행렬 파일이 모두 준비된 경우에만 읽습니다.
+        """
+        entry_dir = self._entry_dir(input_hash)
+        if not self.exists(input_hash):
+            return
+        suffix = uuid.uuid4().hex[:8]
+        for name, array in (('X_train.npy', X), ('X_test.npy', X_test)):
+            tmp_path = entry_dir / f'.{name}.{suffix}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+                os.replace(tmp_path, entry_dir / name)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+        tmp_path = entry_dir / f'.matrix.json.{suffix}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'feature_columns': list(feature_columns)}, f, ensure_ascii=False)
+        os.replace(tmp_path, entry_dir / 'matrix.json')
+        logger.info(f"모델 입력 행렬 저장 완료: {entry_dir} (train={X.shape}, test={X_test.shape})")
+
+    def _write_table(self, df: pd.DataFrame, path: Path):
+        """비압축 Arrow IPC로 저장"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, str(path), compression='uncompressed')
+
+    def _read_table(self, path: Path) -> pd.DataFrame:
+        """Arrow IPC 파일을 읽어 DataFrame으로 변환 (pandas 변환 시 복사되므로 결과는 공유되지 않음)"""
+        table = feather.read_table(str(path), memory_map=True)
+        return table.to_pandas(split_blocks=True)
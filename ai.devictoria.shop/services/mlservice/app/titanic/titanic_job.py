@@ -0,0 +1,296 @@
+"""
+타이타닉 백그라운드 작업(Job) 관리
+전처리 -> 모델링 -> 학습 -> 평가 파이프라인을 워커 풀에서 실행하고
+진행 단계, 결과, 산출물(artifact)을 작업 ID 단위로 보관
+"""
+import sys
+import json
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+# 공통 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+try:
+    from common.utils import setup_logging
+    logger = setup_logging("titanic_job")
+except ImportError:
+    import logging
+    logger = logging.getLogger("titanic_job")
+
+from app.titanic.titanic_service import TitanicService
+from app.titanic.titanic_search import run_search, promote_best, LEADERBOARD_PATH
+
+
+# 작업 종류별 실행 단계
+JOB_STAGES: Dict[str, List[str]] = {
+    "evaluate": ["preprocess", "modeling", "learning", "evaluate"],
+    "submit": ["preprocess", "modeling", "submit"],
+    "search": ["preprocess", "search", "promote"],
+}
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+# 작업 산출물 저장 디렉토리
+JOBS_DIR = Path(__file__).parent / 'jobs'
+
+
+class TitanicJob:
+    """타이타닉 파이프라인 작업 1건의 상태"""
+
+    def __init__(self, kind: str, dedup_key: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.dedup_key = dedup_key
+        self.status = STATUS_QUEUED
+        self.stages = JOB_STAGES[kind]
+        self.stage: Optional[str] = None
+        self.completed_stages: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.artifacts: Dict[str, str] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (STATUS_QUEUED, STATUS_RUNNING)
+
+    @property
+    def artifact_dir(self) -> Path:
+        return JOBS_DIR / self.id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리 변환"""
+        total = len(self.stages)
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "completed_stages": list(self.completed_stages),
+            "progress": round(len(self.completed_stages) / total * 100, 1) if total else 0.0,
+            "result": self.result,
+            "artifacts": {
+                name: f"/api/titanic/jobs/{self.id}/artifacts/{name}"
+                for name in self.artifacts
+            },
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class TitanicJobManager:
+    """
+    타이타닉 파이프라인 작업 관리자
+
+    - submit()은 작업을 워커 풀에 등록하고 즉시 반환합니다.
+    - 같은 종류 + 같은 입력 데이터의 작업이 대기/실행 중이면 새 작업을 만들지 않고 기존 작업을 반환합니다.
+    - 종료된 작업은 최근 max_history개만 메모리에 보관합니다.
+    - 모든 작업이 공용 산출물(models/, submission*.csv, search/best_params.json)을 덮어쓰므로
+      워커는 1개로 두어 작업을 순서대로 실행합니다.
+    """
+
+    def __init__(self, max_workers: int = 1, max_history: int = 100):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="titanic-job")
+        self._jobs: Dict[str, TitanicJob] = {}
+        self._active: Dict[str, str] = {}  # dedup_key -> job_id
+        self._lock = threading.Lock()
+        self._max_history = max_history
+
+    def _dedup_key(self, kind: str, params: Dict[str, Any]) -> str:
+        """작업 종류, 파라미터, 입력 CSV(크기, 수정 시각)로 중복 판별 키 생성"""
+        base_path = Path(__file__).parent
+        parts = [kind, json.dumps(params, sort_keys=True)]
+        for fname in ('train.csv', 'test.csv'):
+            path = base_path / fname
+            if path.exists():
+                stat = path.stat()
+                parts.append(f"{fname}:{stat.st_size}:{stat.st_mtime_ns}")
+            else:
+                parts.append(f"{fname}:missing")
+        return "|".join(parts)
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Tuple[TitanicJob, bool]:
+        """
+        작업 등록
+
+        Args:
+            kind: 작업 종류 ("evaluate", "submit", "search")
+            params: 작업 파라미터 (search: budget_seconds, eta, models 등)
+
+        Returns:
+            (작업, 새로 생성되었는지 여부) 튜플
+        """
+        if kind not in JOB_STAGES:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {kind}")
+
+        params = params or {}
+        dedup_key = self._dedup_key(kind, params)
+        with self._lock:
+            active_id = self._active.get(dedup_key)
+            if active_id is not None:
+                logger.info(f"동일한 {kind} 작업이 진행 중입니다. 기존 작업 재사용: {active_id}")
+                return self._jobs[active_id], False
+
+            job = TitanicJob(kind, dedup_key, params)
+            self._jobs[job.id] = job
+            self._active[dedup_key] = job.id
+            self._prune()
+
+        self._executor.submit(self._run, job)
+        logger.info(f"{kind} 작업 등록: {job.id}")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[TitanicJob]:
+        """작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[TitanicJob]:
+        """전체 작업 목록 (최신순)"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def get_artifact_path(self, job_id: str, name: str) -> Optional[Path]:
+        """작업 산출물 파일 경로 조회"""
+        job = self.get(job_id)
+        if job is None or name not in job.artifacts:
+            return None
+        path = Path(job.artifacts[name])
+        return path if path.exists() else None
+
+    def shutdown(self):
+        """워커 풀 종료 (대기 중인 작업은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prune(self):
+        """오래된 종료 작업 정리 (lock 안에서 호출)"""
+        finished = [j for j in self._jobs.values() if not j.is_active]
+        overflow = len(self._jobs) - self._max_history
+        if overflow <= 0:
+            return
+        for job in sorted(finished, key=lambda j: j.created_at)[:overflow]:
+            del self._jobs[job.id]
+            shutil.rmtree(job.artifact_dir, ignore_errors=True)
+
+    def _set_stage(self, job: TitanicJob, stage: str):
+        with self._lock:
+            if job.stage is not None:
+                job.completed_stages.append(job.stage)
+            job.stage = stage
+        logger.info(f"[{job.id}] {stage} 단계 시작")
+
+    def _run(self, job: TitanicJob):
+        """워커 스레드에서 파이프라인 실행"""
+        with self._lock:
+            job.status = STATUS_RUNNING
+            job.started_at = datetime.now()
+
+        try:
+            service = TitanicService()
+            self._set_stage(job, "preprocess")
+            service.preprocess()
+
+            if job.kind == "search":
+                self._set_stage(job, "search")
+                X, y = service.get_training_data()
+                search_result = run_search(X, y, **job.params)
+                self._set_stage(job, "promote")
+                result = promote_best(X, y, search_result)
+            elif job.kind == "evaluate":
+                self._set_stage(job, "modeling")
+                service.modeling()
+                self._set_stage(job, "learning")
+                service.learning()
+                self._set_stage(job, "evaluate")
+                results = service.evaluate()
+                result = {"results": {k: v * 100 for k, v in results.items()}}
+            else:
+                self._set_stage(job, "modeling")
+                service.modeling()
+                self._set_stage(job, "submit")
+                result = service.submit()
+
+            artifacts = self._store_artifacts(job, result)
+            with self._lock:
+                job.completed_stages.append(job.stage)
+                job.stage = None
+                job.result = result
+                job.artifacts = artifacts
+                job.status = STATUS_SUCCEEDED
+            logger.info(f"[{job.id}] {job.kind} 작업 완료")
+        except Exception as e:
+            import traceback
+            logger.error(f"[{job.id}] {job.kind} 작업 실패: {type(e).__name__}: {str(e)}")
+            logger.error(traceback.format_exc())
+            with self._lock:
+                job.error = f"{type(e).__name__}: {str(e)}"
+                job.status = STATUS_FAILED
+        finally:
+            with self._lock:
+                job.finished_at = datetime.now()
+                if self._active.get(job.dedup_key) == job.id:
+                    del self._active[job.dedup_key]
+
+    def _store_artifacts(self, job: TitanicJob, result: Dict[str, Any]) -> Dict[str, str]:
+        """
+        작업 결과와 산출물을 jobs/<job_id>/ 아래에 복사
+
+        submit()은 공용 경로(models/, submission*.csv)에 파일을 덮어쓰므로,
+        작업별로 사본을 남겨 이후 작업이 결과를 덮어쓰지 않게 합니다.
+        """
+        job_dir = job.artifact_dir
+        job_dir.mkdir(parents=True, exist_ok=True)
+        artifacts: Dict[str, str] = {}
+
+        result_path = job_dir / 'result.json'
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        artifacts[result_path.name] = str(result_path)
+
+        if job.kind == "search":
+            for src in (LEADERBOARD_PATH, Path(result["model_path"])):
+                if src.exists():
+                    dst = job_dir / src.name
+                    shutil.copy(src, dst)
+                    artifacts[dst.name] = str(dst)
+        elif job.kind == "submit":
+            sources = [Path(__file__).parent / 'submission.csv']
+            for model_result in result.get("models", {}).values():
+                sources.append(Path(model_result["submission_path"]))
+                sources.append(Path(model_result["model_path"]))
+            for src in sources:
+                if src.exists():
+                    dst = job_dir / src.name
+                    shutil.copy(src, dst)
+                    artifacts[dst.name] = str(dst)
+
+        return artifacts
+
+
+# 작업 관리자 싱글톤
+_job_manager: Optional[TitanicJobManager] = None
+
+
+def get_titanic_job_manager() -> TitanicJobManager:
+    """작업 관리자 인스턴스 싱글톤 패턴"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = TitanicJobManager()
+    return _job_manager
@@ -1,7 +1,7 @@
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import Tuple, List
 import sys
 from sklearn.model_selection import KFold, cross_val_score
 from sklearn.tree import DecisionTreeClassifier
@@ -20,13 +20,25 @@ except ImportError:
     import logging
     logger = logging.getLogger("titanic_method")
 
+# 원본 CSV 숫자 컬럼의 compact dtype (int64/float64 대신 작은 타입으로 바로 파싱)
+CSV_DTYPES = {
+    'PassengerId': np.int32,
+    'Survived': np.int8,
+    'Pclass': np.int8,
+    'Age': np.float32,
+    'SibSp': np.int8,
+    'Parch': np.int8,
+    'Fare': np.float32,
+}
+
+
 class TitanicMethod(object):
     
     def __init__(self):
         pass
 
     def read_csv(self, fname: str) -> pd.DataFrame:
-        return pd.read_csv(fname)
+        return pd.read_csv(fname, dtype=CSV_DTYPES)
 
     def create_df(self, df:pd.DataFrame, label:str) -> pd.DataFrame:
         """Survived 컬럼을 제거한 학습 데이터(특성) DataFrame 반환"""
@@ -37,11 +49,9 @@ class TitanicMethod(object):
     
     def drop_features(self, this, *feature: str) -> object:
         """피처를 삭제하는 메서드"""
-        [i.drop(j, axis=1, inplace=True) for j in feature for i in [this.train,this.test ] ]
-
-        # for i in [this.train, this.test]:
-        #     for j in feature:
-        #         i.drop(j, axis=1, inplace=True)
+        # 피처마다 drop하면 매번 DataFrame 전체가 복사되므로 한 번에 삭제
+        for i in [this.train, this.test]:
+            i.drop(columns=[j for j in feature if j in i.columns], inplace=True)
  
         return this
         
@@ -78,8 +88,8 @@ class TitanicMethod(object):
         - 서열형 척도(ordinal)로 처리합니다.
         - 1등석 > 2등석 > 3등석이므로, 생존률 관점에서 1이 가장 좋고 3이 가장 안 좋습니다.
         """
-        this.train['Pclass'] = this.train['Pclass'].astype(int)
-        this.test['Pclass'] = this.test['Pclass'].astype(int)
+        this.train['Pclass'] = this.train['Pclass'].astype(np.int8)
+        this.test['Pclass'] = this.test['Pclass'].astype(np.int8)
         return this
 
     def title_nominal(self, this) -> object:
@@ -88,7 +98,7 @@ class TitanicMethod(object):
         - Name 컬럼에서 추출한 타이틀입니다.
         - nominal 척도입니다.
         """
-        for idx, df in enumerate([this.train, this.test]):
+        for df in [this.train, this.test]:
             if 'Name' not in df.columns:
                 continue
             
@@ -104,20 +114,9 @@ class TitanicMethod(object):
             # 결측치 처리 (Title이 없는 경우 "Unknown"으로)
             df['Title'] = df['Title'].fillna('Unknown')
             
-            # One-hot encoding
-            title_dummies = pd.get_dummies(df['Title'], prefix='Title', dtype=int)
-            df = pd.concat([df, title_dummies], axis=1)
-            logger.info(f"Title one-hot encoding: {list(title_dummies.columns)}")
-            
-            # 원본 Title 컬럼 제거
-            if 'Title' in df.columns:
-                df = df.drop(columns=['Title'])
-            
-            # 원본 DataFrame에 반영
-            if idx == 0:
-                this.train = df
-            else:
-                this.test = df
+            # One-hot encoding (원본 Title 컬럼은 제거)
+            title_dummies = self._add_one_hot(df, 'Title', prefix='Title')
+            logger.info(f"Title one-hot encoding: {title_dummies}")
         
         return this
 
@@ -126,34 +125,21 @@ class TitanicMethod(object):
         gender: 성별 (male, female)
         - nominal 척도입니다.
         """
-        for idx, df in enumerate([this.train, this.test]):
+        for df in [this.train, this.test]:
             # 'Sex' 컬럼이 있으면 'gender'로 rename
             if 'Sex' in df.columns and 'gender' not in df.columns:
-                df['gender'] = df['Sex']
+                df.rename(columns={'Sex': 'gender'}, inplace=True)
             
             if 'gender' not in df.columns:
                 continue
             
-            # One-hot encoding
-            gender_dummies = pd.get_dummies(df['gender'], prefix='gender', dtype=int)
-            df = pd.concat([df, gender_dummies], axis=1)
-            logger.info(f"Gender one-hot encoding: {list(gender_dummies.columns)}")
+            # One-hot encoding (원본 gender 컬럼은 제거)
+            gender_dummies = self._add_one_hot(df, 'gender', prefix='gender')
+            logger.info(f"Gender one-hot encoding: {gender_dummies}")
             
-            # 원본 문자열 컬럼 제거 (Sex와 gender 모두)
-            cols_to_drop = []
+            # 원본 Sex 컬럼이 남아 있으면 제거
             if 'Sex' in df.columns:
-                cols_to_drop.append('Sex')
-            if 'gender' in df.columns:
-                cols_to_drop.append('gender')
-            
-            if cols_to_drop:
-                df = df.drop(columns=cols_to_drop)
-            
-            # 원본 DataFrame에 반영
-            if idx == 0:
-                this.train = df
-            else:
-                this.test = df
+                del df['Sex']
         
         return this
 
@@ -173,14 +159,15 @@ class TitanicMethod(object):
                 median_age = df['Age'].median()
                 df['Age'] = df['Age'].fillna(median_age)
                 logger.info(f"Age 결측치를 중앙값 {median_age}으로 채웠습니다.")
+            df['Age'] = df['Age'].astype(np.float32)
             
             # 나이 구간화
             bins = [-1, 0, 5, 12, 18, 24, 35, 60, np.inf]
             labels = ['Unknown', 'Baby', 'Child', 'Teenager', 'Young Adult', 'Adult', 'Senior', 'Elderly']
-            df['Age_band'] = pd.cut(df['Age'], bins=bins, labels=labels, include_lowest=True)
+            age_band = pd.cut(df['Age'], bins=bins, labels=labels, include_lowest=True)
             
-            # Age_band를 ordinal로 변환 (숫자 인코딩)
-            df['Age_band_ordinal'] = df['Age_band'].cat.codes
+            # Age_band를 ordinal로 변환 (숫자 인코딩, 문자열 구간 컬럼은 저장하지 않음)
+            df['Age_band_ordinal'] = age_band.cat.codes.astype(np.uint8)
         
         return this
 
@@ -225,20 +212,15 @@ class TitanicMethod(object):
                 df['Fare'] = df['Fare'].fillna(median_fare)
                 logger.info(f"Fare 결측치를 중앙값 {median_fare}으로 채웠습니다.")
             
-            # Fare를 사분위수로 구간화하여 ordinal 피처 생성
+            df['Fare'] = df['Fare'].astype(np.float32)
+            
+            # Fare를 사분위수로 구간화하여 ordinal 피처 생성 (qcut/cut 결과는 항상 categorical)
             try:
-                df['Fare_band'] = pd.qcut(df['Fare'], q=4, labels=[0, 1, 2, 3], duplicates='drop')
-                if pd.api.types.is_categorical_dtype(df['Fare_band']):
-                    df['Fare_band'] = df['Fare_band'].cat.codes
-                else:
-                    df['Fare_band'] = df['Fare_band'].astype(int)
+                fare_band = pd.qcut(df['Fare'], q=4, labels=[0, 1, 2, 3], duplicates='drop')
             except ValueError as e:
                 logger.warning(f"qcut 실패, quantile 사용: {e}")
-                df['Fare_band'] = pd.cut(df['Fare'], bins=4, labels=[0, 1, 2, 3], duplicates='drop')
-                if pd.api.types.is_categorical_dtype(df['Fare_band']):
-                    df['Fare_band'] = df['Fare_band'].cat.codes
-                else:
-                    df['Fare_band'] = df['Fare_band'].astype(int)
+                fare_band = pd.cut(df['Fare'], bins=4, labels=[0, 1, 2, 3], duplicates='drop')
+            df['Fare_band'] = fare_band.cat.codes.astype(np.uint8)
         
         return this
 
@@ -248,7 +230,7 @@ class TitanicMethod(object):
         - 본질적으로는 nominal(명목) 척도입니다.
         - one-hot encoding을 사용합니다.
         """
-        for idx, df in enumerate([this.train, this.test]):
+        for df in [this.train, this.test]:
             if 'Embarked' not in df.columns:
                 continue
             
@@ -258,23 +240,71 @@ class TitanicMethod(object):
                 df['Embarked'] = df['Embarked'].fillna(mode_embarked)
                 logger.info(f"Embarked 결측치를 최빈값 {mode_embarked}으로 채웠습니다.")
             
-            # One-hot encoding
-            embarked_dummies = pd.get_dummies(df['Embarked'], prefix='Embarked', dtype=int)
-            df = pd.concat([df, embarked_dummies], axis=1)
-            logger.info(f"Embarked one-hot encoding: {list(embarked_dummies.columns)}")
-            
-            # 원본 Embarked 컬럼 제거
-            if 'Embarked' in df.columns:
-                df = df.drop(columns=['Embarked'])
-            
-            # 원본 DataFrame에 반영
-            if idx == 0:
-                this.train = df
-            else:
-                this.test = df
+            # One-hot encoding (원본 Embarked 컬럼은 제거)
+            embarked_dummies = self._add_one_hot(df, 'Embarked', prefix='Embarked')
+            logger.info(f"Embarked one-hot encoding: {embarked_dummies}")
         
         return this
     
+    def _add_one_hot(self, df: pd.DataFrame, column: str, prefix: str) -> List[str]:
+        """
+        One-hot 컬럼을 uint8로 df에 직접 추가하고 원본 컬럼 제거
+        (pd.concat/drop으로 DataFrame 전체를 다시 만드는 복사를 피함)
+        
+        Returns:
+            추가된 one-hot 컬럼 목록
+        """
+        dummies = pd.get_dummies(df[column], prefix=prefix, dtype=np.uint8)
+        for col in dummies.columns:
+            df[col] = dummies[col].to_numpy()
+        del df[column]
+        return list(dummies.columns)
+
+    def convert_to_int(self, df: pd.DataFrame) -> pd.DataFrame:
+        """boolean 컬럼을 uint8로 변환하고 남은 문자열/범주형 컬럼 제거 (변경할 컬럼이 없으면 복사하지 않음)"""
+        bool_cols = []
+        cols_to_drop = []
+        
+        for col, dtype in df.dtypes.items():
+            if pd.api.types.is_bool_dtype(dtype):
+                bool_cols.append(col)
+            elif dtype == object or isinstance(dtype, pd.CategoricalDtype):
+                # 문자열 컬럼 처리 (object 타입 또는 categorical 타입)
+                if col not in ['PassengerId', 'Pclass', 'Age', 'Fare']:  # 기본 숫자 컬럼 제외
+                    cols_to_drop.append(col)
+        
+        if not bool_cols and not cols_to_drop:
+            return df
+        
+        # 원본 문자열 컬럼 제거
+        df = df.drop(columns=cols_to_drop)
+        for col in bool_cols:
+            df[col] = df[col].astype(np.uint8)
+        
+        return df
+
+    def create_model_matrix(self, train: pd.DataFrame, test: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        모델 입력 행렬 생성 (learning/evaluate/submit 공용)
+        
+        - train의 숫자 컬럼을 피처로 사용하고, test는 같은 컬럼 순서로 맞춤
+          (test에 없는 one-hot 컬럼은 0으로 채움)
+        - 연속된(C-contiguous) float32 배열로 한 번만 변환
+        
+        Returns:
+            (train 행렬, test 행렬, 피처 컬럼 목록) 튜플
+        """
+        feature_columns = [col for col, dtype in train.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+        if len(feature_columns) != train.shape[1]:
+            dropped = [col for col in train.columns if col not in feature_columns]
+            logger.warning(f"숫자형이 아닌 컬럼 제외: {dropped}")
+            train = train[feature_columns]
+        test = test.reindex(columns=feature_columns, fill_value=0)
+        
+        X = np.ascontiguousarray(train.to_numpy(dtype=np.float32))
+        X_test = np.ascontiguousarray(test.to_numpy(dtype=np.float32))
+        return X, X_test, feature_columns
+
     def create_k_fold(self):
         """K-Fold 교차 검증 생성"""
         k_fold = KFold(n_splits=10, shuffle=True, random_state=0)
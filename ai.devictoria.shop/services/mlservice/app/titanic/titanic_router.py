@@ -4,13 +4,18 @@ Titanic Router - FastAPI 라우터
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pathlib import Path
 import csv
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pydantic import BaseModel
 import json
 from app.titanic.titanic_model import Passenger
+from app.titanic.titanic_job import get_titanic_job_manager
+from app.titanic.titanic_search import LEADERBOARD_PATH, MODEL_SPECS, PARAM_GRIDS, load_best_params
+from app.titanic.titanic_submission import get_submission_streamer, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE
+from app.titanic.titanic_artifacts import ARTIFACT_SUFFIX, artifact_path, compressed_artifact, load_manifest
 
 # 라우터 생성
 router = APIRouter(
@@ -185,81 +190,131 @@ async def preprocess_data():
         print(error_detail)  # 서버 로그에 출력
         raise HTTPException(status_code=500, detail=f"전처리 중 오류 발생: {str(e)}")
 
-@router.post("/evaluate")
+@router.post("/evaluate", status_code=202)
 async def evaluate_model():
     """
-    모델링 평가 실행
-    후 모델 평가 결과 반환
+    모델링 평가 작업 등록
+    전처리 -> 모델링 -> 학습 -> 평가를 백그라운드 작업으로 실행하고 작업 ID를 즉시 반환
+    진행 상황과 결과는 /api/titanic/jobs/{job_id} 에서 조회
     """
     try:
-        from app.titanic.titanic_service import TitanicService
-        service = TitanicService()
-        
-        # 전처리 -> 모델링 -> 학습 -> 평가 순서로 실행
-        print("전처리 시작...")
-        service.preprocess()
-        print("전처리 완료")
-        
-        print("모델링 시작...")
-        service.modeling()
-        if not hasattr(service, 'models') or not service.models:
-            raise ValueError("모델 생성에 실패했습니다. models 속성이 없습니다.")
-        print(f"모델 생성 완료: {list(service.models.keys())}")
-        
-        print("학습 시작...")
-        service.learning()
-        print("학습 완료")
-        
-        print("평가 시작...")
-        results = service.evaluate()
-        print(f"평가 완료: {results}")
-        
-        # 결과를 퍼센티지로 변환
-        results_percent = {k: v * 100 for k, v in results.items()}
-        
+        job, created = get_titanic_job_manager().submit("evaluate")
         return {
-            "message": "모델 평가 완료",
-            "results": results_percent
+            "message": "모델 평가 작업이 등록되었습니다." if created else "동일한 평가 작업이 이미 진행 중입니다.",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/titanic/jobs/{job.id}"
         }
     except Exception as e:
-        import traceback
-        error_detail = f"평가 중 오류 발생: {str(e)}\n{traceback.format_exc()}"
-        print(error_detail)  # 서버 로그에 출력
-        raise HTTPException(status_code=500, detail=f"평가 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"평가 작업 등록 중 오류 발생: {str(e)}")
 
 
-@router.post("/submit")
+@router.post("/submit", status_code=202)
 async def submit_model():
     """
-    Kaggle 제출용 모델 생성 및 저장
+    Kaggle 제출용 모델 생성 작업 등록
+    전처리 -> 모델링 -> 제출을 백그라운드 작업으로 실행하고 작업 ID를 즉시 반환
     """
     try:
-        from app.titanic.titanic_service import TitanicService
-        service = TitanicService()
-        
-        # 전처리 -> 모델링 -> 제출 순서로 실행
-        print("전처리 시작...")
-        service.preprocess()
-        print("전처리 완료")
-        
-        print("모델링 시작...")
-        service.modeling()
-        print("모델링 완료")
-        
-        print("제출용 모델 생성 시작...")
-        result = service.submit()
-        print(f"제출용 모델 생성 완료: {result}")
-        
+        job, created = get_titanic_job_manager().submit("submit")
         return {
-            "message": "Kaggle 제출용 모델 생성 완료",
-            "result": result,
+            "message": "Kaggle 제출용 모델 생성 작업이 등록되었습니다." if created else "동일한 제출 작업이 이미 진행 중입니다.",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/titanic/jobs/{job.id}",
             "download_url": "/api/titanic/download/submission"
         }
     except Exception as e:
-        import traceback
-        error_detail = f"제출용 모델 생성 중 오류 발생: {str(e)}\n{traceback.format_exc()}"
-        print(error_detail)  # 서버 로그에 출력
-        raise HTTPException(status_code=500, detail=f"제출용 모델 생성 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"제출 작업 등록 중 오류 발생: {str(e)}")
+
+
+class SearchRequest(BaseModel):
+    """하이퍼파라미터 탐색 요청 모델"""
+    models: Optional[List[str]] = None  # None이면 5개 분류기 전체
+    eta: int = 3
+    cv: int = 5
+    budget_seconds: float = 120.0
+
+
+@router.post("/search", status_code=202)
+async def search_hyperparameters(request: SearchRequest = SearchRequest()):
+    """
+    하이퍼파라미터 탐색 작업 등록
+    5개 분류기의 파라미터 그리드를 successive halving으로 탐색하고,
+    최고 파라미터를 이후 modeling()/submit()에 반영
+    """
+    unknown = [m for m in (request.models or []) if m not in PARAM_GRIDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 분류기입니다: {unknown} (가능: {', '.join(PARAM_GRIDS)})"
+        )
+    if request.eta < 2:
+        raise HTTPException(status_code=400, detail="eta는 2 이상이어야 합니다.")
+    try:
+        job, created = get_titanic_job_manager().submit("search", request.model_dump())
+        return {
+            "message": "하이퍼파라미터 탐색 작업이 등록되었습니다." if created else "동일한 탐색 작업이 이미 진행 중입니다.",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/titanic/jobs/{job.id}"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"탐색 작업 등록 중 오류 발생: {str(e)}")
+
+
+@router.get("/search/leaderboard")
+async def get_search_leaderboard(limit: int = 20):
+    """마지막 하이퍼파라미터 탐색 결과(leaderboard) 조회"""
+    if not LEADERBOARD_PATH.exists():
+        raise HTTPException(
+            status_code=404,
+            detail="탐색 결과가 없습니다. 먼저 /api/titanic/search 엔드포인트를 실행하세요."
+        )
+    with open(LEADERBOARD_PATH, 'r', encoding='utf-8') as f:
+        search_result = json.load(f)
+    search_result["leaderboard"] = search_result["leaderboard"][:limit]
+    search_result["best_params"] = load_best_params()
+    return search_result
+
+
+@router.get("/jobs")
+async def list_jobs():
+    """등록된 작업 목록 조회 (최신순)"""
+    jobs = get_titanic_job_manager().list_jobs()
+    return {
+        "count": len(jobs),
+        "jobs": [job.to_dict() for job in jobs]
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    작업 상태 조회
+    진행 단계(preprocess/modeling/learning/evaluate/submit), 결과, 산출물 다운로드 경로 반환
+    """
+    job = get_titanic_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업 {job_id}를 찾을 수 없습니다.")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/artifacts/{name}")
+async def download_job_artifact(job_id: str, name: str):
+    """작업 산출물 파일 다운로드 (result.json, submission.csv, 모델 파일 등)"""
+    artifact_path = get_titanic_job_manager().get_artifact_path(job_id, name)
+    if artifact_path is None:
+        raise HTTPException(status_code=404, detail=f"작업 {job_id}의 산출물 {name}을 찾을 수 없습니다.")
+
+    media_types = {".csv": "text/csv", ".json": "application/json"}
+    return FileResponse(
+        path=str(artifact_path),
+        filename=name,
+        media_type=media_types.get(artifact_path.suffix, "application/octet-stream")
+    )
 
 
 @router.get("/download/submission")
@@ -282,21 +337,71 @@ async def download_submission():
     )
 
 
+@router.get("/download/submission/stream")
+async def stream_submission(model: str = "RandomForest", chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Kaggle 제출용 CSV 스트리밍 다운로드
+    캐시된 학습 모델로 test 행을 chunk_size 단위로 예측하면서 CSV 행을 바로 응답으로 전송
+    (저장된 모델이 없으면 전체 train 데이터로 한 번 학습 후 재사용)
+    """
+    if chunk_size < 1 or chunk_size > MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail=f"chunk_size는 1 이상 {MAX_CHUNK_SIZE} 이하여야 합니다.")
+
+    streamer = get_submission_streamer()
+    try:
+        fitted_model, X_test, passenger_ids = await run_in_threadpool(streamer.prepare, model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"CSV 파일을 찾을 수 없습니다: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"제출 파일 생성 준비 중 오류 발생: {str(e)}")
+
+    return StreamingResponse(
+        streamer.iter_csv(fitted_model, X_test, passenger_ids, chunk_size),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="submission_{model}.csv"'}
+    )
+
+
 @router.get("/download/model")
-async def download_kaggle_model():
+async def download_kaggle_model(model: str = "RandomForest", compress: bool = False):
     """
-    Kaggle 제출용 랜덤포레스트 모델 파일 다운로드
+    Kaggle 제출용 모델 파일 다운로드 (joblib 포맷, 기본 랜덤포레스트)
+    기본은 비압축 원본(기존 응답과 동일), compress=true이면 gzip 압축 사본을 내려주며 받은 파일은 joblib.load()로 그대로 로드 가능
+    파일 해시와 크기는 /api/titanic/models/manifest 에서 확인
     """
-    model_path = Path(__file__).parent / 'models' / 'RandomForest_kaggle_model.pkl'
-    
-    if not model_path.exists():
+    # 모델 이름이 파일 경로가 되므로 등록된 분류기만 허용 (models/ 밖 경로 차단)
+    if model not in MODEL_SPECS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 모델입니다: {model} (가능: {', '.join(MODEL_SPECS)})"
+        )
+    name = f"{model}_kaggle_model"
+    if not artifact_path(name).exists():
         raise HTTPException(
             status_code=404,
-            detail="RandomForest_kaggle_model.pkl 파일이 없습니다. 먼저 /api/titanic/submit 엔드포인트를 실행하세요."
+            detail=f"{name}{ARTIFACT_SUFFIX} 파일이 없습니다. 먼저 /api/titanic/submit 엔드포인트를 실행하세요."
         )
-    
+
+    if compress:
+        try:
+            model_path = await run_in_threadpool(compressed_artifact, name)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"모델 파일 압축 중 오류 발생: {str(e)}")
+        media_type = "application/gzip"
+    else:
+        model_path = artifact_path(name)
+        media_type = "application/octet-stream"
+
     return FileResponse(
         path=str(model_path),
-        filename="RandomForest_kaggle_model.pkl",
-        media_type="application/octet-stream"
+        filename=model_path.name,
+        media_type=media_type
     )
+
+
+@router.get("/models/manifest")
+async def get_model_manifest():
+    """저장된 모델 산출물 목록 (파일명, 크기, sha256, 압축 사본 정보)"""
+    return load_manifest()
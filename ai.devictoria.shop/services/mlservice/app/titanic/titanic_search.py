@@ -0,0 +1,375 @@
+"""
+타이타닉 하이퍼파라미터 탐색
+5개 분류기의 파라미터 그리드를 successive halving 방식으로 탐색
+- 적은 샘플로 모든 후보를 평가한 뒤 상위 1/eta만 남기고 샘플 수를 eta배로 늘려 반복
+- 각 시도(trial)는 프로세스 풀에서 실행되며 전체 탐색은 wall-clock 예산 안에서 종료
+- 결과(leaderboard)는 파일로 저장되고, 최고 파라미터는 modeling()/submit()에서 자동 사용
+"""
+import sys
+import json
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, cross_val_score, train_test_split
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+
+# 공통 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+try:
+    from common.utils import setup_logging
+    logger = setup_logging("titanic_search")
+except ImportError:
+    import logging
+    logger = logging.getLogger("titanic_search")
+
+from app.titanic.titanic_artifacts import save_model
+
+
+# 분류기별 (클래스, 기본 파라미터) - 탐색 결과가 없을 때 사용하는 기존 고정값
+MODEL_SPECS: Dict[str, Tuple[type, Dict[str, Any]]] = {
+    'DecisionTree': (DecisionTreeClassifier, {'random_state': 42}),
+    'RandomForest': (RandomForestClassifier, {'n_estimators': 13, 'random_state': 42}),
+    'NaiveBayes': (GaussianNB, {}),
+    'KNN': (KNeighborsClassifier, {'n_neighbors': 13}),
+    'SVM': (SVC, {'random_state': 42}),
+}
+
+# 분류기별 탐색 그리드
+PARAM_GRIDS: Dict[str, Dict[str, List[Any]]] = {
+    'DecisionTree': {
+        'max_depth': [3, 5, 7, 10, None],
+        'min_samples_leaf': [1, 2, 4, 8],
+        'criterion': ['gini', 'entropy'],
+    },
+    'RandomForest': {
+        'n_estimators': [13, 50, 100, 200],
+        'max_depth': [5, 8, None],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 0.5],
+    },
+    'NaiveBayes': {
+        'var_smoothing': [1e-9, 1e-8, 1e-7, 1e-6, 1e-5],
+    },
+    'KNN': {
+        'n_neighbors': [3, 5, 7, 9, 13, 17, 21],
+        'weights': ['uniform', 'distance'],
+    },
+    'SVM': {
+        'C': [0.1, 1.0, 10.0],
+        'gamma': ['scale', 0.01, 0.1],
+        'kernel': ['rbf'],
+    },
+}
+
+SEARCH_DIR = Path(__file__).parent / 'search'
+LEADERBOARD_PATH = SEARCH_DIR / 'leaderboard.json'
+BEST_PARAMS_PATH = SEARCH_DIR / 'best_params.json'
+
+
+def load_best_params() -> Dict[str, Dict[str, Any]]:
+    """탐색으로 확정된 분류기별 최고 파라미터 로드 (없으면 빈 딕셔너리)"""
+    if not BEST_PARAMS_PATH.exists():
+        return {}
+    try:
+        with open(BEST_PARAMS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('models', {})
+    except Exception as e:
+        logger.warning(f"best_params.json 로드 실패, 기본 파라미터 사용: {e}")
+        return {}
+
+
+def create_model(name: str, params: Optional[Dict[str, Any]] = None):
+    """
+    분류기 생성
+
+    Args:
+        name: 분류기 이름 (MODEL_SPECS 키)
+        params: 기본 파라미터를 덮어쓸 파라미터
+
+    Returns:
+        sklearn 분류기 인스턴스
+    """
+    model_class, defaults = MODEL_SPECS[name]
+    return model_class(**{**defaults, **(params or {})})
+
+
+def create_models(use_tuned: bool = True) -> Dict[str, Any]:
+    """전체 분류기 생성 (use_tuned이면 탐색 결과 파라미터 적용)"""
+    tuned = load_best_params() if use_tuned else {}
+    if tuned:
+        logger.info(f"탐색된 파라미터 적용: {list(tuned.keys())}")
+    return {name: create_model(name, tuned.get(name, {}).get('params')) for name in MODEL_SPECS}
+
+
+# ***********
+# 프로세스 풀 워커
+# ***********
+
+_worker_X: Optional[np.ndarray] = None
+_worker_y: Optional[np.ndarray] = None
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, worker_pids=None):
+    """워커 프로세스마다 학습 데이터를 한 번만 전달받아 보관하고 PID를 부모 프로세스에 알림"""
+    global _worker_X, _worker_y
+    _worker_X = X
+    _worker_y = y
+    if worker_pids is not None:
+        worker_pids.put(os.getpid())
+
+
+def _run_trial(name: str, params: Dict[str, Any], n_samples: int, cv: int, seed: int) -> Dict[str, Any]:
+    """워커에서 시도 1건 실행: n_samples개 층화 샘플에 대한 K-Fold 정확도"""
+    X, y = _worker_X, _worker_y
+    if n_samples < len(y):
+        X, _, y, _ = train_test_split(X, y, train_size=n_samples, stratify=y, random_state=seed)
+
+    start = time.perf_counter()
+    k_fold = StratifiedKFold(n_splits=cv, shuffle=True, random_state=0)
+    scores = cross_val_score(create_model(name, params), X, y, cv=k_fold, n_jobs=1, scoring='accuracy')
+    return {
+        'model': name,
+        'params': params,
+        'n_samples': int(len(y)),
+        'score': round(float(np.mean(scores)), 4),
+        'score_std': round(float(np.std(scores)), 4),
+        'elapsed': round(time.perf_counter() - start, 3),
+    }
+
+
+# ***********
+# Successive halving
+# ***********
+
+def build_candidates(models: Optional[List[str]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """탐색 후보 (분류기 이름, 파라미터) 목록 생성"""
+    names = models or list(PARAM_GRIDS.keys())
+    return [(name, dict(params)) for name in names for params in ParameterGrid(PARAM_GRIDS[name])]
+
+
+def _terminate_pool(pool: ProcessPoolExecutor, worker_pids, timeout: float = 5.0):
+    """
+    대기 중인 시도를 취소하고 실행 중인 워커 프로세스를 강제 종료 (spawn 워커가 남지 않도록)
+
+    ProcessPoolExecutor는 워커 강제 종료 API가 없으므로 _init_worker가 알려준 PID로 종료하고,
+    종료된 워커 정리(shutdown)는 timeout초까지만 기다립니다.
+    """
+    pool.shutdown(wait=False, cancel_futures=True)
+    while True:
+        try:
+            # 큐의 feeder 스레드가 아직 전달 중인 PID도 받도록 잠시 대기
+            pid = worker_pids.get(timeout=0.1)
+        except queue.Empty:
+            break
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    waiter = threading.Thread(target=pool.shutdown, kwargs={'wait': True}, daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    if waiter.is_alive():
+        logger.warning(f"워커 프로세스 정리가 {timeout}초 안에 끝나지 않았습니다.")
+
+
+def run_search(
+    X: np.ndarray,
+    y: np.ndarray,
+    models: Optional[List[str]] = None,
+    eta: int = 3,
+    cv: int = 5,
+    budget_seconds: float = 120.0,
+    n_workers: Optional[int] = None,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Successive halving 하이퍼파라미터 탐색
+
+    Args:
+        X: 피처 행렬
+        y: 라벨
+        models: 탐색할 분류기 이름 목록 (None이면 전체)
+        eta: 라운드마다 남길 후보 비율의 역수 (3이면 상위 1/3 유지)
+        cv: K-Fold 분할 수
+        budget_seconds: 전체 탐색 시간 예산 (초)
+        n_workers: 프로세스 풀 크기 (None이면 CPU 수)
+        seed: 샘플링 시드
+
+    Returns:
+        leaderboard와 라운드별 요약을 담은 딕셔너리
+    """
+    if eta < 2:
+        raise ValueError("eta는 2 이상이어야 합니다.")
+    unknown = [m for m in (models or []) if m not in PARAM_GRIDS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 분류기입니다: {unknown}")
+
+    X = np.ascontiguousarray(X)
+    y = np.asarray(y)
+    n_total = len(y)
+    candidates = build_candidates(models)
+
+    # 후보가 1개가 될 때까지 필요한 라운드 수로 최소 샘플 수 결정
+    n_rounds = max(1, math.ceil(math.log(len(candidates), eta)))
+    min_samples = max(cv * 10, n_total // (eta ** (n_rounds - 1)))
+    resources = min(min_samples, n_total)
+
+    logger.info(
+        f"하이퍼파라미터 탐색 시작: 후보 {len(candidates)}개, 라운드 {n_rounds}회, "
+        f"시작 샘플 {resources}개, 예산 {budget_seconds}초"
+    )
+
+    deadline = time.monotonic() + budget_seconds
+    trials: List[Dict[str, Any]] = []
+    rounds: List[Dict[str, Any]] = []
+    survivors = candidates
+    budget_exhausted = False
+
+    # 작업 스레드에서 실행되므로 fork 대신 spawn으로 워커 생성
+    context = multiprocessing.get_context('spawn')
+    worker_pids = context.Queue()
+    pool = ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(X, y, worker_pids)
+    )
+    try:
+        for round_idx in range(n_rounds + 1):
+            n_samples = min(resources, n_total)
+            futures = {
+                pool.submit(_run_trial, name, params, n_samples, cv, seed): (name, params)
+                for name, params in survivors
+            }
+            round_results: List[Dict[str, Any]] = []
+            try:
+                for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        name, params = futures[future]
+                        logger.warning(f"시도 실패 {name} {params}: {e}")
+                        continue
+                    result['round'] = round_idx
+                    round_results.append(result)
+            except FuturesTimeoutError:
+                budget_exhausted = True
+                for future in futures:
+                    future.cancel()
+
+            trials.extend(round_results)
+            round_results.sort(key=lambda r: r['score'], reverse=True)
+            rounds.append({
+                'round': round_idx,
+                'n_samples': n_samples,
+                'n_candidates': len(survivors),
+                'n_completed': len(round_results),
+                'best': round_results[0] if round_results else None,
+            })
+            logger.info(
+                f"라운드 {round_idx}: 샘플 {n_samples}개, 후보 {len(survivors)}개 중 {len(round_results)}개 완료"
+                + (f", 최고 {round_results[0]['model']} {round_results[0]['score']}" if round_results else "")
+            )
+
+            if budget_exhausted:
+                logger.warning("시간 예산 초과로 탐색을 중단합니다.")
+                break
+            if len(round_results) <= 1 or n_samples >= n_total:
+                break
+
+            n_keep = max(1, math.ceil(len(round_results) / eta))
+            survivors = [(r['model'], r['params']) for r in round_results[:n_keep]]
+            resources *= eta
+    finally:
+        if budget_exhausted:
+            # 예산 초과 시 실행 중인 시도는 기다리지 않고 워커 프로세스를 종료
+            _terminate_pool(pool, worker_pids)
+        else:
+            pool.shutdown(wait=True, cancel_futures=True)
+        worker_pids.close()
+
+    # 더 많은 샘플로 평가된 결과를 우선하여 정렬
+    leaderboard = sorted(trials, key=lambda r: (r['n_samples'], r['score']), reverse=True)
+    return {
+        'created_at': datetime.now().isoformat(),
+        'n_total_samples': n_total,
+        'n_candidates': len(candidates),
+        'eta': eta,
+        'cv': cv,
+        'budget_seconds': budget_seconds,
+        'budget_exhausted': budget_exhausted,
+        'rounds': rounds,
+        'leaderboard': leaderboard,
+    }
+
+
+def promote_best(X: np.ndarray, y: np.ndarray, search_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    탐색 결과 반영
+
+    - leaderboard 전체를 search/leaderboard.json에 저장
+    - 마지막 리소스 단계(가장 많은 샘플)까지 살아남은 분류기의 최고 파라미터만
+      search/best_params.json에 저장 (이후 modeling()/submit()에서 사용)
+    - 이번 탐색에서 중간에 탈락한 분류기는 기존 저장값도 지우고 기본 파라미터를 사용
+    - 전체 최고 모델을 전체 데이터로 학습하여 models/<이름>_best_model.joblib으로 저장
+    """
+    leaderboard = search_result['leaderboard']
+    if not leaderboard:
+        raise ValueError("완료된 탐색 시도가 없습니다. 시간 예산을 늘려 다시 실행하세요.")
+
+    SEARCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LEADERBOARD_PATH, 'w', encoding='utf-8') as f:
+        json.dump(search_result, f, ensure_ascii=False, indent=2)
+
+    # leaderboard가 (샘플 수, 점수) 내림차순이므로 분류기별 첫 항목이 최고
+    # 적은 샘플로만 평가되고 탈락한 분류기는 승격하지 않음
+    final_samples = leaderboard[0]['n_samples']
+    best_by_model: Dict[str, Dict[str, Any]] = {}
+    for entry in leaderboard:
+        if entry['n_samples'] == final_samples:
+            best_by_model.setdefault(entry['model'], entry)
+
+    # 이번에 탐색하지 않은 분류기의 기존 결과는 유지, 탐색했지만 탈락한 분류기는 기본값으로 복귀
+    searched = {entry['model'] for entry in leaderboard}
+    merged = {
+        name: value for name, value in load_best_params().items()
+        if name not in searched or name in best_by_model
+    }
+    merged.update({
+        name: {'params': entry['params'], 'score': entry['score'], 'n_samples': entry['n_samples']}
+        for name, entry in best_by_model.items()
+    })
+    with open(BEST_PARAMS_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'updated_at': datetime.now().isoformat(), 'models': merged}, f, ensure_ascii=False, indent=2)
+
+    best = leaderboard[0]
+    model = create_model(best['model'], best['params'])
+    model.fit(X, y)
+    model_path = save_model(model, f"{best['model']}_best_model")['path']
+    logger.info(f"최고 모델 저장 완료: {best['model']} {best['params']} (정확도 {best['score']}) -> {model_path}")
+
+    return {
+        'best': best,
+        'best_by_model': best_by_model,
+        'model_path': model_path,
+        'leaderboard_path': str(LEADERBOARD_PATH),
+        'best_params_path': str(BEST_PARAMS_PATH),
+        'budget_exhausted': search_result['budget_exhausted'],
+        'rounds': search_result['rounds'],
+        'n_trials': len(leaderboard),
+    }
@@ -4,20 +4,12 @@
 """
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Any, ParamSpecArgs
+from typing import Dict, Any
 import pandas as pd
 import numpy as np
-import pickle
-import os
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.linear_model import LogisticRegression
-from sklearn.naive_bayes import GaussianNB
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
 from app.titanic.titanic_dataset import TitanicDataSet
 
 # 공통 모듈 경로 추가
@@ -31,6 +23,9 @@ except ImportError:
     logger = logging.getLogger("titanic_service")
 
 from app.titanic.titanic_method import TitanicMethod
+from app.titanic.titanic_feature_store import TitanicFeatureStore
+from app.titanic.titanic_search import create_models, load_best_params
+from app.titanic.titanic_artifacts import save_model
 
 
 class TitanicService:
@@ -43,12 +38,22 @@ class TitanicService:
         self.y_train = None
         self.y_test = None
         self.y_train_full = None  # Survived 라벨 저장
+        self.input_hash = None  # 전처리 입력 CSV 해시 (피처 캐시 키)
+        # 모델 입력 행렬 (learning/evaluate/submit 공용, float32 C-contiguous)
+        self.X_matrix = None
+        self.X_test_matrix = None
+        self.feature_columns = None
         self.models = {}
         self.evaluation_results = {}
 
 
-    def preprocess(self) -> Dict[str, Any]:
-        """데이터 전처리 및 정보 반환"""
+    def preprocess(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        데이터 전처리 및 정보 반환
+
+        Args:
+            use_cache: True이면 입력 CSV 해시가 같은 피처 캐시를 재사용
+        """
         def clean_for_json(obj):
             """DataFrame의 NaN, inf 값을 None으로 변환하고 boolean을 int로 변환하여 JSON 직렬화 가능하게 함"""
             if isinstance(obj, bool):
@@ -56,6 +61,9 @@ class TitanicService:
             elif isinstance(obj, (np.integer, np.floating)):
                 if np.isnan(obj) or np.isinf(obj):
                     return None
+                if isinstance(obj, np.float32):
+                    # float32 -> float 변환 시 생기는 자릿수 노이즈 제거 (7.925 -> 7.925000190734863)
+                    return float(np.format_float_positional(obj))
                 return float(obj) if isinstance(obj, np.floating) else int(obj)
             elif isinstance(obj, dict):
                 return {k: clean_for_json(v) for k, v in obj.items()}
@@ -67,6 +75,10 @@ class TitanicService:
                 return clean_for_json(obj.to_dict('records'))
             return obj
         
+        self.X_matrix = None
+        self.X_test_matrix = None
+        self.feature_columns = None
+        
         try:
             logger.info("\n" + "="*80)
             logger.info("전처리 시작")
@@ -84,6 +96,17 @@ class TitanicService:
             if not test_csv_path.exists():
                 raise FileNotFoundError(f"Test CSV 파일을 찾을 수 없습니다: {test_csv_path}")
             
+            # 피처 캐시 확인 (입력 CSV가 같으면 파싱/피처 엔지니어링 생략)
+            feature_store = TitanicFeatureStore()
+            input_hash = feature_store.input_hash(train_csv_path, test_csv_path)
+            self.input_hash = input_hash
+            if use_cache:
+                cached = feature_store.load(input_hash)
+                if cached is not None:
+                    self.processed_data, self.y_train_full, result = cached
+                    logger.info("전처리 캐시 사용 - 전처리 완료")
+                    return result
+            
             # Train 데이터 로드
             df_train = the_method.read_csv(str(train_csv_path))
             
@@ -131,43 +154,9 @@ class TitanicService:
             drop_name = ['Name']
             this = the_method.drop_features(this, *drop_name)
             
-            # boolean과 문자열 컬럼을 int로 변환하고 원본 문자열 컬럼 제거
-            def convert_to_int(df: pd.DataFrame) -> pd.DataFrame:
-                """boolean과 문자열 컬럼을 int로 변환하고 원본 문자열 컬럼 제거"""
-                df = df.copy()
-                
-                # 제거할 원본 문자열 컬럼 목록
-                cols_to_drop = []
-                converted_cols = []
-                
-                # boolean 컬럼들을 int로 변환
-                for col in df.columns:
-                    if df[col].dtype == bool or df[col].dtype == 'bool':
-                        df[col] = df[col].astype(int)
-                        converted_cols.append(f"{col} (bool->int)")
-                    elif df[col].dtype == object or pd.api.types.is_categorical_dtype(df[col]):
-                        # 문자열 컬럼 처리 (object 타입 또는 categorical 타입)
-                        if col == 'gender' or col == 'Sex':
-                            cols_to_drop.append(col)
-                        elif col == 'Age_band':
-                            cols_to_drop.append(col)
-                        elif col == 'Embarked':
-                            cols_to_drop.append(col)
-                        elif col == 'Title':
-                            cols_to_drop.append(col)
-                        elif col not in ['PassengerId', 'Pclass', 'Age', 'Fare']:  # 기본 숫자 컬럼 제외
-                            # 기타 문자열 컬럼도 제거
-                            cols_to_drop.append(col)
-                
-                # 원본 문자열 컬럼 제거
-                if cols_to_drop:
-                    df = df.drop(columns=[col for col in cols_to_drop if col in df.columns])
-                
-                return df
-            
             # Train과 Test 데이터를 int로 변환
-            this.train = convert_to_int(this.train)
-            this.test = convert_to_int(this.test)
+            this.train = the_method.convert_to_int(this.train)
+            this.test = the_method.convert_to_int(this.test)
             
             # 최종 null 개수 계산
             train_null_count = int(this.train.isnull().sum().sum())
@@ -212,6 +201,12 @@ class TitanicService:
             if 'Survived' in df_train.columns:
                 self.y_train_full = df_train['Survived']
             
+            # 피처 캐시 저장 (실패해도 전처리 결과는 반환)
+            try:
+                feature_store.save(input_hash, this, self.y_train_full, result)
+            except Exception as e:
+                logger.warning(f"피처 캐시 저장 실패: {e}")
+            
             return result
             
         except FileNotFoundError as e:
@@ -230,14 +225,8 @@ class TitanicService:
             raise ValueError("전처리된 데이터가 없습니다. preprocess()를 먼저 실행하세요.")
         
         try:
-            # 모델 생성 (모든 모델)
-            self.models = {
-                'DecisionTree': DecisionTreeClassifier(random_state=42),
-                'RandomForest': RandomForestClassifier(n_estimators=13, random_state=42),
-                'NaiveBayes': GaussianNB(),
-                'KNN': KNeighborsClassifier(n_neighbors=13),
-                'SVM': SVC(random_state=42)
-            }
+            # 모델 생성 (모든 모델, 하이퍼파라미터 탐색 결과가 있으면 적용)
+            self.models = create_models()
             logger.info(f"모델 생성 완료: {list(self.models.keys())}")
             logger.info("😎😎 모델링 완료")
         except Exception as e:
@@ -246,6 +235,43 @@ class TitanicService:
             logger.error(traceback.format_exc())
             raise
 
+    def get_training_data(self):
+        """
+        모델 입력 행렬과 라벨 반환
+        전처리 결과에서 float32 행렬을 한 번만 만들고 learning/evaluate/submit/탐색이 같은 배열을 공유
+        행렬은 피처 캐시 항목에 .npy로 저장해 두고 이후에는 읽기 전용 memory-map으로 엽니다.
+        
+        Returns:
+            (피처 행렬, Survived 라벨 배열) 튜플
+        """
+        if self.processed_data is None:
+            raise ValueError("전처리된 데이터가 없습니다. preprocess()를 먼저 실행하세요.")
+        if self.y_train_full is None:
+            raise ValueError("Survived 라벨이 없습니다. preprocess()를 먼저 실행하세요.")
+        
+        if self.X_matrix is None:
+            # 피처 캐시에 저장된 행렬이 있으면 memory-map으로 열고, 없으면 만들어서 저장
+            feature_store = TitanicFeatureStore()
+            stored = feature_store.load_matrix(self.input_hash) if self.input_hash else None
+            if stored is not None:
+                self.X_matrix, self.X_test_matrix, self.feature_columns = stored
+                logger.info(f"모델 입력 행렬 memory-map 로드: train={self.X_matrix.shape}, test={self.X_test_matrix.shape}")
+            else:
+                the_method = TitanicMethod()
+                self.X_matrix, self.X_test_matrix, self.feature_columns = the_method.create_model_matrix(
+                    self.processed_data.train, self.processed_data.test
+                )
+                logger.info(f"모델 입력 행렬 생성: train={self.X_matrix.shape}, test={self.X_test_matrix.shape}, "
+                            f"{(self.X_matrix.nbytes + self.X_test_matrix.nbytes) / (1024 * 1024):.1f} MB")
+                if self.input_hash:
+                    try:
+                        feature_store.save_matrix(
+                            self.input_hash, self.X_matrix, self.X_test_matrix, self.feature_columns
+                        )
+                    except Exception as e:
+                        logger.warning(f"모델 입력 행렬 저장 실패: {e}")
+        return self.X_matrix, self.y_train_full.to_numpy()
+
     def learning(self):
         logger.info("😎😎 학습 시작")
         
@@ -255,25 +281,13 @@ class TitanicService:
         if not self.models:
             raise ValueError("모델이 없습니다. modeling()을 먼저 실행하세요.")
         
-        # 전처리된 데이터 준비
-        X = self.processed_data.train.copy()
-        
-        # Survived 라벨 확인
-        if self.y_train_full is None:
-            raise ValueError("Survived 라벨이 없습니다. preprocess()를 먼저 실행하세요.")
-        
-        y = self.y_train_full.copy()
-        
-        # 문자열 컬럼 확인 및 제거 (모델 학습을 위해)
-        object_cols = [col for col in X.columns if X[col].dtype == object]
-        if object_cols:
-            logger.warning(f"문자열 컬럼 발견 및 제거: {object_cols}")
-            X = X.drop(columns=object_cols)
+        # 전처리된 데이터 준비 (공용 모델 입력 행렬, 복사 없음)
+        X, y = self.get_training_data()
         
         # 데이터 크기 확인
         logger.info(f"전체 데이터 크기: X={X.shape}, y={y.shape}")
         logger.info(f"Survived 라벨 분포: 생존={int(y.sum())}명, 사망={int((y == 0).sum())}명")
-        logger.info(f"피처 컬럼: {list(X.columns)}")
+        logger.info(f"피처 컬럼: {self.feature_columns}")
         
         # Train/Validation 분할
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
@@ -283,10 +297,6 @@ class TitanicService:
         logger.info(f"훈련 데이터 크기: {self.X_train.shape}, 라벨 크기: {self.y_train.shape}")
         logger.info(f"검증 데이터 크기: {self.X_test.shape}, 라벨 크기: {self.y_test.shape}")
         
-        # 모델 저장 디렉토리 생성
-        models_dir = Path(__file__).parent / 'models'
-        models_dir.mkdir(exist_ok=True)
-        
         # 각 모델 학습 및 저장
         for name, model in self.models.items():
             logger.info(f"{name} 모델 학습 중...")
@@ -295,10 +305,8 @@ class TitanicService:
                 logger.info(f"{name} 모델 학습 완료")
                 
                 # 모델 저장
-                model_path = models_dir / f'{name}_model.pkl'
-                with open(model_path, 'wb') as f:
-                    pickle.dump(model, f)
-                logger.info(f"{name} 모델 저장 완료: {model_path}")
+                saved = save_model(model, f'{name}_model')
+                logger.info(f"{name} 모델 저장 완료: {saved['path']}")
             except Exception as e:
                 logger.error(f"{name} 모델 학습 실패: {str(e)}")
                 import traceback
@@ -316,15 +324,8 @@ class TitanicService:
         if self.y_train_full is None:
             raise ValueError("Survived 라벨이 없습니다. preprocess()를 먼저 실행하세요.")
         
-        # 전처리된 데이터 준비
-        X = self.processed_data.train.copy()
-        y = self.y_train_full.copy()
-        
-        # 문자열 컬럼 확인 및 제거 (모델 학습을 위해)
-        object_cols = [col for col in X.columns if X[col].dtype == object or pd.api.types.is_categorical_dtype(X[col])]
-        if object_cols:
-            logger.warning(f"문자열 컬럼 발견 및 제거: {object_cols}")
-            X = X.drop(columns=object_cols)
+        # 전처리된 데이터 준비 (공용 모델 입력 행렬, 복사 없음)
+        X, y = self.get_training_data()
         
         the_method = TitanicMethod()
         self.evaluation_results = {}
@@ -399,43 +400,17 @@ class TitanicService:
         if self.y_train_full is None:
             raise ValueError("Survived 라벨이 없습니다. preprocess()를 먼저 실행하세요.")
         
-        # 전체 train 데이터 준비
-        X_train_full = self.processed_data.train.copy()
-        y_train_full = self.y_train_full.copy()
-        
-        # 문자열 컬럼 확인 및 제거
-        object_cols = [col for col in X_train_full.columns if X_train_full[col].dtype == object or pd.api.types.is_categorical_dtype(X_train_full[col])]
-        if object_cols:
-            logger.warning(f"문자열 컬럼 발견 및 제거: {object_cols}")
-            X_train_full = X_train_full.drop(columns=object_cols)
-        
-        # test 데이터 준비
-        X_test = self.processed_data.test.copy()
-        object_cols_test = [col for col in X_test.columns if X_test[col].dtype == object or pd.api.types.is_categorical_dtype(X_test[col])]
-        if object_cols_test:
-            X_test = X_test.drop(columns=object_cols_test)
-        
-        # train과 test의 컬럼을 동일하게 맞추기
-        common_cols = [col for col in X_train_full.columns if col in X_test.columns]
-        X_train_full = X_train_full[common_cols]
-        X_test = X_test[common_cols]
+        # 전체 train 데이터와 test 데이터 준비 (test는 train과 같은 컬럼 순서로 맞춘 공용 행렬)
+        X_train_full, y_train_full = self.get_training_data()
+        X_test = self.X_test_matrix
         
         logger.info(f"전체 학습 데이터 크기: X={X_train_full.shape}, y={y_train_full.shape}")
         logger.info(f"테스트 데이터 크기: X={X_test.shape}")
-        logger.info(f"피처 컬럼: {list(X_train_full.columns)}")
-        
-        # 모델 저장 디렉토리 생성
-        models_dir = Path(__file__).parent / 'models'
-        models_dir.mkdir(exist_ok=True)
+        logger.info(f"피처 컬럼: {self.feature_columns}")
         
-        # 모든 모델 생성 및 학습
-        kaggle_models = {
-            'DecisionTree': DecisionTreeClassifier(random_state=42),
-            'RandomForest': RandomForestClassifier(n_estimators=13, random_state=42),
-            'NaiveBayes': GaussianNB(),
-            'KNN': KNeighborsClassifier(n_neighbors=13),
-            'SVM': SVC(random_state=42)
-        }
+        # 모든 모델 생성 및 학습 (하이퍼파라미터 탐색 결과가 있으면 적용)
+        kaggle_models = create_models()
+        tuned = load_best_params()
         
         results = {}
         
@@ -447,9 +422,11 @@ class TitanicService:
                 logger.info(f"{model_name} 모델 학습 완료")
                 
                 # 모델 저장
-                kaggle_model_path = models_dir / f'{model_name}_kaggle_model.pkl'
-                with open(kaggle_model_path, 'wb') as f:
-                    pickle.dump(model, f)
+                saved = save_model(model, f'{model_name}_kaggle_model', metadata={
+                    'input_hash': self.input_hash,
+                    'params': tuned.get(model_name, {}).get('params'),
+                })
+                kaggle_model_path = saved['path']
                 logger.info(f"{model_name} Kaggle 제출용 모델 저장 완료: {kaggle_model_path}")
                 
                 # Test 데이터에 대한 예측
@@ -466,7 +443,8 @@ class TitanicService:
                 logger.info(f"{model_name} Submission 파일 생성 완료: {submission_path}")
                 
                 results[model_name] = {
-                    "model_path": str(kaggle_model_path),
+                    "model_path": kaggle_model_path,
+                    "model_sha256": saved['sha256'],
                     "submission_path": str(submission_path),
                     "predictions_count": len(predictions),
                     "survival_count": int(predictions.sum()),
@@ -0,0 +1,148 @@
+"""
+타이타닉 Kaggle 제출 파일 스트리밍
+학습된 모델을 캐시해 두고 test 행을 고정 크기 청크로 예측하면서
+CSV 행을 바로 HTTP 응답으로 흘려보내 메모리 사용량과 첫 바이트 응답 시간을 일정하게 유지
+"""
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Any, Tuple
+import numpy as np
+
+# 공통 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+try:
+    from common.utils import setup_logging
+    logger = setup_logging("titanic_submission")
+except ImportError:
+    import logging
+    logger = logging.getLogger("titanic_submission")
+
+from app.titanic.titanic_service import TitanicService
+from app.titanic.titanic_search import MODEL_SPECS, create_model, load_best_params
+from app.titanic.titanic_artifacts import artifact_path, load_manifest, load_model, save_model
+
+
+# 한 번에 예측하고 응답으로 내보내는 test 행 수
+DEFAULT_CHUNK_SIZE = 10000
+MAX_CHUNK_SIZE = 200000
+
+SUBMISSION_HEADER = "PassengerId,Survived\n"
+
+
+class TitanicSubmissionStreamer:
+    """
+    Kaggle 제출 파일 스트리밍 생성기
+
+    - 전처리 결과(모델 입력 행렬)는 입력 CSV가 바뀌기 전까지 재사용합니다.
+    - 학습된 모델은 models/<name>_kaggle_model.joblib 이 현재 입력 데이터(피처 캐시 해시)와
+      탐색 파라미터로 학습된 것이면(manifest 기준) load_model()로 불러오고 (일반 numpy 배열 속성만 memory-map),
+      아니면 전체 train 데이터로 한 번 학습해 저장합니다.
+    - 불러온 모델은 titanic_artifacts에서 파일 수정 시각 기준으로 캐시합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._service: Optional[TitanicService] = None
+        self._input_key: Optional[Tuple] = None
+
+    def _current_input_key(self) -> Tuple:
+        """입력 CSV(크기, 수정 시각)로 전처리 결과 재사용 여부 판별"""
+        base_path = Path(__file__).parent
+        key = []
+        for fname in ('train.csv', 'test.csv'):
+            path = base_path / fname
+            if not path.exists():
+                raise FileNotFoundError(f"{fname} 파일을 찾을 수 없습니다: {path}")
+            stat = path.stat()
+            key.append((fname, stat.st_size, stat.st_mtime_ns))
+        return tuple(key)
+
+    def _get_service(self) -> TitanicService:
+        """전처리 완료된 서비스 반환 (lock 안에서 호출)"""
+        input_key = self._current_input_key()
+        if self._service is None or self._input_key != input_key:
+            service = TitanicService()
+            service.preprocess()
+            service.get_training_data()
+            self._service = service
+            self._input_key = input_key
+        return self._service
+
+    def _get_model(self, service: TitanicService, model_name: str):
+        """학습된 모델 반환 (lock 안에서 호출)"""
+        artifact_name = f'{model_name}_kaggle_model'
+        n_features = len(service.feature_columns)
+        params = load_best_params().get(model_name, {}).get('params')
+
+        if artifact_path(artifact_name).exists():
+            entry = load_manifest().get('artifacts', {}).get(artifact_name, {})
+            if entry.get('input_hash') == service.input_hash and entry.get('params') == params:
+                model = load_model(artifact_name)
+                if getattr(model, 'n_features_in_', n_features) == n_features:
+                    return model
+            logger.info(f"{model_name} 저장 모델이 현재 입력 데이터/파라미터로 학습된 것이 아니어서 다시 학습합니다.")
+
+        X, y = service.get_training_data()
+        model = create_model(model_name, params)
+        model.fit(X, y)
+        saved = save_model(model, artifact_name, metadata={'input_hash': service.input_hash, 'params': params})
+        logger.info(f"{model_name} 제출용 모델 학습 및 저장 완료: {saved['path']}")
+        return model
+
+    def prepare(self, model_name: str) -> Tuple[Any, np.ndarray, np.ndarray]:
+        """
+        스트리밍 시작 전 준비 (전처리, 모델 로드/학습)
+
+        응답을 시작하기 전에 실행해야 오류를 HTTP 상태 코드로 돌려줄 수 있습니다.
+
+        Returns:
+            (모델, test 피처 행렬, PassengerId 배열) 튜플
+        """
+        if model_name not in MODEL_SPECS:
+            raise ValueError(f"지원하지 않는 모델입니다: {model_name} (가능: {', '.join(MODEL_SPECS)})")
+
+        with self._lock:
+            service = self._get_service()
+            model = self._get_model(service, model_name)
+            passenger_ids = service.processed_data.test['PassengerId'].to_numpy()
+            return model, service.X_test_matrix, passenger_ids
+
+    def iter_csv(
+        self,
+        model: Any,
+        X_test: np.ndarray,
+        passenger_ids: np.ndarray,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        test 행을 chunk_size 단위로 예측하며 CSV 바이트를 생성
+
+        Args:
+            model: 학습된 분류기
+            X_test: test 피처 행렬 (train과 같은 컬럼 순서)
+            passenger_ids: test PassengerId 배열
+            chunk_size: 한 번에 예측할 행 수
+
+        Yields:
+            CSV 조각 (첫 조각은 헤더)
+        """
+        yield SUBMISSION_HEADER.encode()
+        for start in range(0, len(X_test), chunk_size):
+            end = start + chunk_size
+            predictions = model.predict(X_test[start:end]).astype(np.int64)
+            lines = [f"{pid},{pred}\n" for pid, pred in zip(passenger_ids[start:end].tolist(), predictions.tolist())]
+            yield "".join(lines).encode()
+
+
+# 스트리밍 생성기 싱글톤
+_submission_streamer: Optional[TitanicSubmissionStreamer] = None
+
+
+def get_submission_streamer() -> TitanicSubmissionStreamer:
+    """제출 파일 스트리밍 생성기 인스턴스 싱글톤 패턴"""
+    global _submission_streamer
+    if _submission_streamer is None:
+        _submission_streamer = TitanicSubmissionStreamer()
+    return _submission_streamer
@@ -0,0 +1,358 @@
+"""
+타이타닉 전처리/학습 파이프라인 벤치마크
+원본(891행)과 통계적으로 비슷한 합성 승객 데이터를 10k/1M/10M 행 규모로 생성하고
+TitanicService.preprocess()와 같은 순서로 각 전처리 단계와 모델 학습 시간, 최대 메모리를 측정
+
+사용법 (mlservice 디렉토리에서):
+    python benchmarks/titanic_benchmark.py                       # 10k, 1M, 10M
+    python benchmarks/titanic_benchmark.py --rows 10000 100000
+    python benchmarks/titanic_benchmark.py --compare benchmarks/results/이전결과.json
+
+결과는 benchmarks/results/titanic_<커밋>_<시각>.json 에 저장되며,
+--compare로 다른 커밋의 결과와 단계별 시간/메모리 비율을 비교할 수 있음
+"""
+import sys
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+import sklearn
+
+# mlservice 디렉토리를 경로에 추가 (app.titanic 임포트용)
+MLSERVICE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(MLSERVICE_DIR))
+
+from app.titanic.titanic_dataset import TitanicDataSet
+from app.titanic.titanic_method import TitanicMethod
+from app.titanic.titanic_search import create_models
+
+
+DEFAULT_ROWS = [10_000, 1_000_000, 10_000_000]
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# 모델별 학습 행 수 상한 (SVM/KNN은 행 수에 대해 초선형이라 전체 행으로 학습하면 끝나지 않음)
+# 상한은 결과 파일에 함께 기록되어 커밋 간 비교 조건이 같게 유지됨
+DEFAULT_FIT_ROW_CAPS = {
+    'DecisionTree': None,
+    'RandomForest': None,
+    'NaiveBayes': None,
+    'KNN': 200_000,
+    'SVM': 20_000,
+}
+PREDICT_ROWS = 10_000
+
+
+# ***********
+# 합성 데이터 생성
+# ***********
+
+# (타이틀, 성별, 비율) - 원본 train.csv 분포 근사
+_TITLES = [
+    ('Mr', 'male', 0.580), ('Miss', 'female', 0.205), ('Mrs', 'female', 0.140),
+    ('Master', 'male', 0.045), ('Dr', 'male', 0.008), ('Rev', 'male', 0.007),
+    ('Col', 'male', 0.002), ('Major', 'male', 0.002), ('Mlle', 'female', 0.002),
+    ('Mme', 'female', 0.001), ('Ms', 'female', 0.001), ('Capt', 'male', 0.001),
+    ('Lady', 'female', 0.001), ('Sir', 'male', 0.001), ('Countess', 'female', 0.001),
+    ('Don', 'male', 0.001), ('Jonkheer', 'male', 0.002),
+]
+_SURNAMES = np.array([
+    'Andersson', 'Sage', 'Carter', 'Goodwin', 'Johnson', 'Panula', 'Skoog', 'Rice', 'Brown',
+    'Smith', 'Williams', 'Harper', 'Kelly', 'Baclini', 'Ford', 'Fortune', 'Asplund', 'Allison',
+    'Palsson', 'Lefebre', 'Davies', 'Hart', 'Jensen', 'Moran', 'Newell', 'Taussig', 'Graham',
+    'Hocking', 'Dean', 'West', 'Ryerson', 'Hickman', 'Boulos', 'Laroche', 'Thayer', 'Olsen',
+])
+_GIVEN = np.array([
+    'John', 'William', 'Mary', 'Anna', 'Thomas', 'Charles', 'George', 'Elizabeth', 'Margaret',
+    'James', 'Henry', 'Edward', 'Helen', 'Alice', 'Frederick', 'Joseph', 'Arthur', 'Emily',
+    'Owen Harris', 'Florence', 'Laina', 'Jacques Heath', 'Allen', 'Elisabeth', 'Bertha',
+])
+_TICKET_PREFIXES = np.array(['PC', 'A/5', 'C.A.', 'STON/O2.', 'SOTON/O.Q.', 'W./C.', 'CA', 'SC/PARIS', 'PP', 'F.C.C.'])
+_CABIN_DECKS = np.array(list('ABCDEFG'))
+
+
+def generate_passengers(n_rows: int, seed: int = 0, with_label: bool = True, id_offset: int = 0) -> pd.DataFrame:
+    """
+    원본 타이타닉 데이터와 분포가 비슷한 합성 승객 테이블 생성
+
+    Args:
+        n_rows: 생성할 행 수
+        seed: 난수 시드 (같은 시드는 같은 데이터)
+        with_label: Survived 컬럼 포함 여부 (train=True, test=False)
+        id_offset: PassengerId 시작 오프셋
+
+    Returns:
+        train.csv/test.csv와 같은 컬럼 구조의 DataFrame
+    """
+    rng = np.random.default_rng(seed)
+
+    pclass = rng.choice([1, 2, 3], size=n_rows, p=[0.24, 0.21, 0.55])
+
+    title_p = np.array([t[2] for t in _TITLES])
+    title_idx = rng.choice(len(_TITLES), size=n_rows, p=title_p / title_p.sum())
+    titles = np.array([t[0] for t in _TITLES], dtype=object)[title_idx]
+    sex = np.array([t[1] for t in _TITLES], dtype=object)[title_idx]
+
+    surnames = _SURNAMES[rng.integers(0, len(_SURNAMES), n_rows)].astype(object)
+    given = _GIVEN[rng.integers(0, len(_GIVEN), n_rows)].astype(object)
+    names = surnames + ', ' + titles + '. ' + given
+
+    # 나이: 타이틀별 평균이 다름 (Master/Miss는 어림), 약 20% 결측
+    age = rng.normal(32.0, 12.5, n_rows)
+    is_young = (titles == 'Master') | ((titles == 'Miss') & (rng.random(n_rows) < 0.4))
+    age[is_young] = rng.gamma(2.0, 3.0, is_young.sum())
+    age = np.clip(np.round(age, 1), 0.42, 80.0)
+    age[rng.random(n_rows) < 0.199] = np.nan
+
+    sibsp = rng.choice([0, 1, 2, 3, 4, 5, 8], size=n_rows, p=[0.682, 0.235, 0.031, 0.018, 0.020, 0.006, 0.008])
+    parch = rng.choice([0, 1, 2, 3, 4, 5, 6], size=n_rows, p=[0.761, 0.132, 0.090, 0.006, 0.004, 0.006, 0.001])
+
+    # 요금: 등급별 로그정규 분포
+    fare_mu = np.select([pclass == 1, pclass == 2], [np.log(60.0), np.log(14.0)], np.log(8.5))
+    fare = np.round(rng.lognormal(fare_mu, 0.6), 4)
+    fare[rng.random(n_rows) < 0.0151] = 0.0
+
+    # 티켓: 약 25%는 알파벳 접두사
+    ticket_numbers = rng.integers(1000, 3_999_999, n_rows).astype(str).astype(object)
+    has_prefix = rng.random(n_rows) < 0.25
+    prefixes = _TICKET_PREFIXES[rng.integers(0, len(_TICKET_PREFIXES), n_rows)].astype(object)
+    tickets = np.where(has_prefix, prefixes + ' ' + ticket_numbers, ticket_numbers)
+
+    # 객실: 1등석 위주로 약 23%만 존재
+    has_cabin = rng.random(n_rows) < np.select([pclass == 1, pclass == 2], [0.81, 0.09], 0.02)
+    cabins = (_CABIN_DECKS[rng.integers(0, len(_CABIN_DECKS), n_rows)].astype(object)
+              + rng.integers(1, 150, n_rows).astype(str).astype(object))
+    cabins = np.where(has_cabin, cabins, None)
+
+    embarked = rng.choice(np.array(['S', 'C', 'Q'], dtype=object), size=n_rows, p=[0.725, 0.189, 0.086])
+    embarked[rng.random(n_rows) < 0.0022] = None
+
+    df = pd.DataFrame({
+        'PassengerId': np.arange(1, n_rows + 1) + id_offset,
+        'Pclass': pclass,
+        'Name': names,
+        'Sex': sex,
+        'Age': age,
+        'SibSp': sibsp,
+        'Parch': parch,
+        'Ticket': tickets,
+        'Fare': fare,
+        'Cabin': cabins,
+        'Embarked': embarked,
+    })
+
+    if with_label:
+        # 성별/등급/나이에 따른 생존 확률 (원본 생존률 약 38%)
+        p = np.where(sex == 'female', 0.74, 0.19)
+        p = p + np.select([pclass == 1, pclass == 2], [0.17, 0.05], -0.08)
+        p = p + np.where(np.nan_to_num(age, nan=30.0) < 10, 0.2, 0.0)
+        survived = (rng.random(n_rows) < np.clip(p, 0.02, 0.98)).astype(int)
+        df.insert(1, 'Survived', survived)
+
+    return df
+
+
+# ***********
+# 측정 도구
+# ***********
+
+def _measure(step: str, fn: Callable[[], Any], records: List[Dict[str, Any]], **extra) -> Any:
+    """함수 실행 시간과 tracemalloc 최대 메모리 측정"""
+    gc.collect()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    record = {
+        'step': step,
+        'seconds': round(seconds, 4),
+        'peak_mb': round((peak - base) / (1024 * 1024), 2),
+        **extra,
+    }
+    records.append(record)
+    print(f"  {step:<28} {record['seconds']:>10.3f}s {record['peak_mb']:>10.1f} MB")
+    return result
+
+
+def _frame_mb(df: pd.DataFrame) -> float:
+    return round(df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+
+
+def run_preprocess(train_csv: Path, test_csv: Path, records: List[Dict[str, Any]]):
+    """TitanicService.preprocess()와 같은 순서로 단계별 측정"""
+    the_method = TitanicMethod()
+    df_train = _measure('read_csv(train)', lambda: the_method.read_csv(str(train_csv)), records)
+    df_test = _measure('read_csv(test)', lambda: the_method.read_csv(str(test_csv)), records)
+
+    this = TitanicDataSet()
+    this.train = _measure('create_df', lambda: the_method.create_df(df_train, 'Survived'), records)
+    this.test = df_test.copy()
+    labels = df_train['Survived']
+    del df_train, df_test
+
+    steps = [
+        ('drop_features', lambda t: the_method.drop_features(t, 'SibSp', 'Parch', 'Cabin', 'Ticket')),
+        ('pclass_ordinal', the_method.pclass_ordinal),
+        ('fare_ratio', the_method.fare_ratio),
+        ('embarked_nominal', the_method.embarked_nominal),
+        ('gender_nominal', the_method.gender_nominal),
+        ('age_ratio', the_method.age_ratio),
+        ('title_nominal', the_method.title_nominal),
+        ('drop_name', lambda t: the_method.drop_features(t, 'Name')),
+    ]
+    for name, step in steps:
+        this = _measure(name, lambda: step(this), records)
+
+    def convert(t):
+        t.train = the_method.convert_to_int(t.train)
+        t.test = the_method.convert_to_int(t.test)
+        return t
+    this = _measure('convert_to_int', lambda: convert(this), records)
+    records[-1]['train_mb'] = _frame_mb(this.train)
+    records[-1]['test_mb'] = _frame_mb(this.test)
+    return this, labels
+
+
+def build_model_matrix(this: TitanicDataSet):
+    """TitanicService.get_training_data()와 같은 방식으로 모델 입력 행렬(float32) 준비"""
+    X, _, _ = TitanicMethod().create_model_matrix(this.train, this.test)
+    return X
+
+
+def run_models(X, y, fit_row_caps: Dict[str, Optional[int]], seed: int, records: List[Dict[str, Any]]):
+    """모델별 학습/예측 시간 측정"""
+    rng = np.random.default_rng(seed)
+    n_rows = len(y)
+    predict_idx = rng.choice(n_rows, size=min(PREDICT_ROWS, n_rows), replace=False)
+    X_pred = X[predict_idx]
+
+    for name, model in create_models(use_tuned=False).items():
+        cap = fit_row_caps.get(name)
+        if cap is not None and cap < n_rows:
+            idx = rng.choice(n_rows, size=cap, replace=False)
+            X_fit, y_fit = X[idx], y[idx]
+        else:
+            X_fit, y_fit = X, y
+        _measure(f'fit:{name}', lambda: model.fit(X_fit, y_fit), records, model=name, fit_rows=int(len(y_fit)))
+        _measure(f'predict:{name}', lambda: model.predict(X_pred), records, model=name, predict_rows=int(len(X_pred)))
+
+
+def run_benchmark(n_rows: int, seed: int, fit_row_caps: Dict[str, Optional[int]], skip_models: bool) -> Dict[str, Any]:
+    """한 규모(n_rows)에 대한 전체 벤치마크"""
+    print(f"\n=== {n_rows:,} rows ===")
+    records: List[Dict[str, Any]] = []
+    n_test = max(1, int(n_rows * 418 / 891))
+
+    with tempfile.TemporaryDirectory(prefix='titanic_bench_') as tmp:
+        train_csv = Path(tmp) / 'train.csv'
+        test_csv = Path(tmp) / 'test.csv'
+
+        gen_start = time.perf_counter()
+        generate_passengers(n_rows, seed=seed).to_csv(train_csv, index=False)
+        generate_passengers(n_test, seed=seed + 1, with_label=False, id_offset=n_rows).to_csv(test_csv, index=False)
+        print(f"  (데이터 생성 {time.perf_counter() - gen_start:.1f}s, "
+              f"train.csv {train_csv.stat().st_size / 1e6:.1f} MB)")
+
+        tracemalloc.start()
+        try:
+            this, labels = run_preprocess(train_csv, test_csv, records)
+            X = _measure('build_model_matrix', lambda: build_model_matrix(this), records)
+            records[-1]['matrix_mb'] = round(X.nbytes / (1024 * 1024), 2)
+            if not skip_models:
+                run_models(X, labels.to_numpy(), fit_row_caps, seed, records)
+        finally:
+            tracemalloc.stop()
+
+    return {'rows': n_rows, 'test_rows': n_test, 'records': records}
+
+
+# ***********
+# 결과 저장 및 비교
+# ***********
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=MLSERVICE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline_path: Path):
+    """다른 커밋의 결과 파일과 단계별 시간/메모리 비율 출력 (>1이면 현재가 느리거나 큼)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\n=== 비교: {baseline.get('commit')} -> {current.get('commit')} ===")
+    base_runs = {run['rows']: run for run in baseline['runs']}
+    for run in current['runs']:
+        base = base_runs.get(run['rows'])
+        if base is None:
+            continue
+        print(f"\n-- {run['rows']:,} rows --")
+        base_steps = {r['step']: r for r in base['records']}
+        for record in run['records']:
+            b = base_steps.get(record['step'])
+            if b is None:
+                print(f"  {record['step']:<28} (신규)")
+                continue
+            t_ratio = record['seconds'] / b['seconds'] if b['seconds'] else float('inf')
+            m_ratio = record['peak_mb'] / b['peak_mb'] if b['peak_mb'] else float('inf')
+            print(f"  {record['step']:<28} time x{t_ratio:6.2f}   peak x{m_ratio:6.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="타이타닉 파이프라인 합성 데이터 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="측정할 행 수 목록")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-models', action='store_true', help="모델 학습 측정 생략")
+    parser.add_argument('--svm-max-rows', type=int, default=DEFAULT_FIT_ROW_CAPS['SVM'])
+    parser.add_argument('--knn-max-rows', type=int, default=DEFAULT_FIT_ROW_CAPS['KNN'])
+    parser.add_argument('--output', type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument('--compare', type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    fit_row_caps = {**DEFAULT_FIT_ROW_CAPS, 'SVM': args.svm_max_rows, 'KNN': args.knn_max_rows}
+    commit = _git_commit()
+    result = {
+        'benchmark': 'titanic_pipeline',
+        'commit': commit,
+        'created_at': datetime.now().isoformat(),
+        'seed': args.seed,
+        'fit_row_caps': fit_row_caps,
+        'predict_rows': PREDICT_ROWS,
+        'memory_tracking': 'tracemalloc (단계 시작 대비 최대 할당량)',
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+        },
+        'runs': [run_benchmark(n, args.seed, fit_row_caps, args.skip_models) for n in args.rows],
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"titanic_{commit or 'unknown'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()